@@ -11,7 +11,7 @@ import {
 } from './types';
 import { INITIAL_CONFIG, SPORT_DEFAULTS } from './constants';
 import { getAuctionInsights } from './services/geminiService';
-import { loadAppState, saveAppState, loadSportsData, saveSportsData, loadAllSportsFromDB } from './services/storageService';
+import { loadAppState, saveAppState, loadSportsData, saveSportsData, loadSportsSummary, loadMatchDetails } from './services/storageService';
 import { registerAuctioneer, registerTeam, registerPlayer, registerGuest } from './services/apiService';
 import { uploadPlayerPhoto, uploadTeamLogo, uploadDocument } from './services/firebaseStorageService';
 
@@ -133,6 +133,8 @@ const AppContent: React.FC = () => {
   
   // Multi-sport, multi-match state - restore from sessionStorage
   const [allSports, setAllSports] = useState<SportData[]>([]);
+  // Matches whose players/teams/history have been fetched on top of the summary
+  const loadedMatchDetails = useRef<Set<string>>(new Set());
   const [currentSport, setCurrentSport] = useState<string | null>(() => {
     return sessionStorage.getItem('hypehammer_current_sport') || null;
   });
@@ -250,8 +252,9 @@ const AppContent: React.FC = () => {
           }
         }
 
-        // Try API to get fresh data (source of truth)
-        const sportsFromDB = await loadAllSportsFromDB();
+        // Try API to get fresh data (source of truth) - match cards only,
+        // a match's players/teams/history are fetched when it is opened
+        const sportsFromDB = await loadSportsSummary();
         if (sportsFromDB && sportsFromDB.length > 0) {
           console.log('✅ Loaded fresh sports data from Firebase');
           // Only update if data actually changed (deep comparison via JSON)
@@ -259,7 +262,15 @@ const AppContent: React.FC = () => {
           const newData = JSON.stringify(sportsFromDB);
           if (currentData !== newData) {
             console.log('📊 Data changed, updating state');
-            setAllSports(sportsFromDB);
+            // Keep details already fetched for an opened match
+            setAllSports(prev => sportsFromDB.map((sport: SportData) => ({
+              ...sport,
+              matches: sport.matches.map(match => {
+                if (!loadedMatchDetails.current.has(match.id)) return match;
+                const loaded = prev.flatMap(s => s.matches).find(m => m.id === match.id);
+                return loaded ? { ...match, players: loaded.players, teams: loaded.teams, history: loaded.history } : match;
+              })
+            })));
             localStorage.setItem('hypehammer_sports', newData);
           } else {
             console.log('✓ Data unchanged, skipping update');
@@ -566,6 +577,26 @@ const AppContent: React.FC = () => {
     }
   }, [currentMatch]);
 
+  // Fetch the opened match's players, teams and history once (the sports list is summary-only)
+  useEffect(() => {
+    if (!currentMatchId || loadedMatchDetails.current.has(currentMatchId)) return;
+    loadedMatchDetails.current.add(currentMatchId);
+    loadMatchDetails(currentMatchId).then(details => {
+      if (!details) {
+        loadedMatchDetails.current.delete(currentMatchId);
+        return;
+      }
+      setAllSports(prev => prev.map(sport => ({
+        ...sport,
+        matches: sport.matches.map(match =>
+          match.id === currentMatchId
+            ? { ...match, players: details.players || [], teams: details.teams || [], history: details.history || [] }
+            : match
+        )
+      })));
+    });
+  }, [currentMatchId]);
+
   // Auto-load current match data when match changes
   useEffect(() => {
     if (currentMatch && currentMatchId) {
@@ -565,22 +565,25 @@ export const AdminDashboardPage: React.FC<AdminDashboardPageProps> = ({ setStatu
     });
 
     // Listen for team updates
-    socket.on('TEAM_UPDATED', (data: { teamId: string; team: Team }) => {
+    socket.on('TEAM_UPDATED', (data: { teamId: string; team: Partial<Team>; addedPlayerIds?: string[] }) => {
       console.log('Admin: TEAM_UPDATED received:', data);
-      // Calculate squadSize from playerIds array length
-      const updatedTeam = {
-        ...data.team,
-        squadSize: data.team.playerIds?.length || 0
-      };
-      setTeams(prev => prev.map(t => t.id === data.teamId ? updatedTeam : t));
+      // Merge the changed fields and recalculate squadSize from playerIds
+      setTeams(prev => prev.map(t => {
+        if (t.id !== data.teamId) return t;
+        const playerIds = [...(t.playerIds || []), ...(data.addedPlayerIds || [])];
+        return { ...t, ...data.team, playerIds, squadSize: playerIds.length };
+      }));
     });
 
     // Listen for live auction events
-    socket.on('AUCTION_TIMER_UPDATE', (data: any) => {
+    // Countdown runs locally from the server's deadline (sent only when it changes)
+    const stopCountdown = socketService.onTimerUpdate((data) => {
       setCountdown(data.remainingSeconds);
     });
 
-    socket.on('AUCTION_STATE_UPDATE', (data: any) => {
+    // Snapshot on join, then merged patches for every change
+    let shownPlayerId: string | null = null;
+    const stopStateUpdates = socketService.onAuctionStateUpdate((data: any) => {
       console.log('Admin: AUCTION_STATE_UPDATE received:', data);
       console.log('   → Status:', data.status);
       console.log('   → Current Player ID:', data.currentPlayerId);
@@ -594,7 +597,12 @@ export const AdminDashboardPage: React.FC<AdminDashboardPageProps> = ({ setStatu
       if (data.remainingSeconds !== undefined) {
         setCountdown(data.remainingSeconds);
       }
-      if (data.currentPlayerId && data.biddingActive) {
+      if (data.currentPlayerId && data.biddingActive && data.currentPlayerId === shownPlayerId) {
+        // Same lot: only the bid and leader move
+        setCurrentBid(data.currentBid || 0);
+        setLeadingTeamName(data.leadingTeamName || '');
+      } else if (data.currentPlayerId && data.biddingActive) {
+        shownPlayerId = data.currentPlayerId;
         // Fetch player data if we have the ID
         fetch(`http://localhost:5000/api/players/${data.currentPlayerId}?matchId=${currentMatch.id}`)
           .then(res => res.json())
@@ -618,6 +626,7 @@ export const AdminDashboardPage: React.FC<AdminDashboardPageProps> = ({ setStatu
             }
           });
       } else if (!data.biddingActive) {
+        shownPlayerId = null;
         console.log('ℹ️ Bidding not active, clearing current player');
         setCurrentBiddingPlayer(null);
         setCurrentBid(0);
@@ -689,8 +698,8 @@ export const AdminDashboardPage: React.FC<AdminDashboardPageProps> = ({ setStatu
       socket.off('PLAYER_UPDATED');
       socket.off('PLAYER_SOLD');
       socket.off('TEAM_UPDATED');
-      socket.off('AUCTION_TIMER_UPDATE');
-      socket.off('AUCTION_STATE_UPDATE');
+      stopCountdown();
+      stopStateUpdates();
       socket.off('AUCTION_STARTED');
       socket.off('AUCTION_PAUSED');
       socket.off('AUCTION_RESUMED');
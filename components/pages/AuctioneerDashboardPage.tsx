@@ -160,7 +160,7 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
     });
 
     // Listen to timer updates
-    socketService.onTimerUpdate((data) => {
+    const stopCountdown = socketService.onTimerUpdate((data) => {
       setAuctionState(prev => ({ ...prev, remainingSeconds: data.remainingSeconds }));
     });
 
@@ -213,6 +213,12 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
       const [fetchedPlayers] = await Promise.all([fetchPlayers(), fetchTeams()]);
       console.log('Teams refetched after player sold');
       
+      // The server already opened the next lot (LOT_TRANSITION)
+      if (data.nextPlayerId) {
+        setSelectedPlayerId(data.nextPlayerId);
+        return;
+      }
+      
       // Auto-advance to next pending player
       setTimeout(() => {
         setPlayers(prev => {
@@ -243,6 +249,12 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
       // Refresh players list and teams
       await Promise.all([fetchPlayers(), fetchTeams()]);
       
+      // The server already opened the next lot (LOT_TRANSITION)
+      if (data.nextPlayerId) {
+        setSelectedPlayerId(data.nextPlayerId);
+        return;
+      }
+      
       // Auto-advance to next pending player
       setTimeout(() => {
         setPlayers(prev => {
@@ -276,6 +288,7 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
       if (currentMatch) {
         socketService.leaveSeason(currentMatch.id);
       }
+      stopCountdown();
       socketService.removeAllListeners();
     };
   }, [approvalStatus, auctioneerId, currentMatch?.id, currentUser.role]);
@@ -330,7 +343,9 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
         body: JSON.stringify({
           seasonId: currentMatch.id,
           startTime: new Date().toISOString(),
-          endTime: new Date(Date.now() + 4 * 60 * 60 * 1000).toISOString() // 4 hours from now
+          endTime: new Date(Date.now() + 4 * 60 * 60 * 1000).toISOString(), // 4 hours from now
+          // Lot order, so the server can prefetch and open the next player itself
+          playerQueue: players.filter(p => p.status === 'PENDING' || p.status === 'UNSOLD').map(p => p.id)
         })
       });
       
@@ -419,15 +434,8 @@ export const AuctioneerDashboardPage: React.FC<AuctioneerDashboardPageProps> = (
   const closePlayerBidding = async (sold: boolean) => {
     if (!currentMatch) return;
     try {
-      const response = await fetch('http://localhost:5000/api/auction/player/close', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          seasonId: currentMatch.id,
-          sold
-        })
-      });
-      const data = await response.json();
+      // Closes this lot and opens the next queued player in one step
+      const data = await socketService.closeAndStartNext(currentMatch.id, sold);
       if (data.success) {
         alert(sold ? '🔨 Player SOLD!' : 'Player UNSOLD');
       }
@@ -63,12 +63,13 @@ export const GuestDashboardPage: React.FC<GuestDashboardPageProps> = ({ setStatu
     console.log('✅ Guest setting up socket listeners for season:', currentMatch.id);
 
     // Listen for timer updates from backend
-    socket.on('AUCTION_TIMER_UPDATE', (data: any) => {
+    // Countdown runs locally from the server's deadline (sent only when it changes)
+    const stopCountdown = socketService.onTimerUpdate((data) => {
       setCountdown(data.remainingSeconds);
     });
 
-    // Listen for auction state updates
-    socket.on('AUCTION_STATE_UPDATE', (data: any) => {
+    // Listen for auction state updates (snapshot on join, then merged patches)
+    const stopStateUpdates = socketService.onAuctionStateUpdate((data: any) => {
       console.log('📡 AUCTION_STATE_UPDATE received:', data);
       if (data.status) {
         console.log('   → Setting auction status to:', data.status);
@@ -236,8 +237,8 @@ export const GuestDashboardPage: React.FC<GuestDashboardPageProps> = ({ setStatu
         socketService.leaveSeason(currentMatch.id);
       }
       // Clean up all socket listeners
-      socket.off('AUCTION_TIMER_UPDATE');
-      socket.off('AUCTION_STATE_UPDATE');
+      stopCountdown();
+      stopStateUpdates();
       socket.off('AUCTIONEER_MIC_ON');
       socket.off('AUCTIONEER_MIC_OFF');
       socket.off('AUCTION_STARTED');
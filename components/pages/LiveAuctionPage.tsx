@@ -158,7 +158,7 @@ export const LiveAuctionPage: React.FC<LiveAuctionPageProps> = ({
     });
 
     // Timer updates (server-controlled)
-    socketService.onTimerUpdate((data) => {
+    const stopCountdown = socketService.onTimerUpdate((data) => {
       setRemainingSeconds(data.remainingSeconds);
     });
 
@@ -263,6 +263,7 @@ export const LiveAuctionPage: React.FC<LiveAuctionPageProps> = ({
     });
 
     return () => {
+      stopCountdown();
       socketService.removeAllListeners();
     };
   }, []);
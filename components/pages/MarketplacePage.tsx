@@ -80,9 +80,11 @@ const MarketplacePageComponent: React.FC<MarketplacePageProps> = ({
   }, []);
 
   const renderMatchCard = useCallback((match: MatchData & { sportType: string; sportName: string }) => {
-    const budgetPool = ((match.config?.totalBudget || 10000000) * match.teams.length / 10000000).toFixed(1);
-    const playersSold = (match.history?.length || 0);
-    const totalPlayers = match.players.length;
+    // Summary cards carry counters; fall back to the lists for fully loaded matches
+    const teamCount = match.teamCount ?? match.teams.length;
+    const budgetPool = ((match.config?.totalBudget || 10000000) * teamCount / 10000000).toFixed(1);
+    const playersSold = match.soldCount ?? (match.history?.length || 0);
+    const totalPlayers = match.playerCount ?? match.players.length;
     
     return (
     <div
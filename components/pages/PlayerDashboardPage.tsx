@@ -127,10 +127,17 @@ export const PlayerDashboardPage: React.FC<PlayerDashboardPageProps> = ({ setSta
     }
 
     // Listen for auction state updates (includes current player if auction is in progress)
-    socket.on('AUCTION_STATE_UPDATE', (data: any) => {
+    // Snapshot on join, then merged patches for every change
+    let shownPlayerId: string | null = null;
+    const stopStateUpdates = socketService.onAuctionStateUpdate((data: any) => {
       console.log('AUCTION_STATE_UPDATE received:', data);
       // If there's a current player being auctioned, set it
-      if (data.currentPlayerId && data.biddingActive) {
+      if (data.currentPlayerId && data.biddingActive && data.currentPlayerId === shownPlayerId) {
+        // Same lot: only the bid and leader move
+        setCurrentBid(data.currentBid || 0);
+        setLeadingTeam(teams.find(t => t.id === data.leadingTeamId) || null);
+      } else if (data.currentPlayerId && data.biddingActive) {
+        shownPlayerId = data.currentPlayerId;
         // We need to fetch the player data from the backend
         fetch(`http://localhost:5000/api/players/${data.currentPlayerId}`)
           .then(res => res.json())
@@ -144,6 +151,7 @@ export const PlayerDashboardPage: React.FC<PlayerDashboardPageProps> = ({ setSta
           })
           .catch(err => console.error('Failed to fetch current player:', err));
       } else if (!data.biddingActive) {
+        shownPlayerId = null;
         setCurrentBiddingPlayer(null);
         setCurrentBid(0);
         setLeadingTeam(null);
@@ -359,6 +367,7 @@ export const PlayerDashboardPage: React.FC<PlayerDashboardPageProps> = ({ setSta
     });
 
     return () => {
+      stopStateUpdates();
       socket.off('AUCTIONEER_MIC_ON');
       socket.off('AUCTIONEER_MIC_OFF');
       socket.off('PLAYER_BIDDING_STARTED');
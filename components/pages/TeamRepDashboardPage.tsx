@@ -121,7 +121,8 @@ export const TeamRepDashboardPage: React.FC<TeamRepDashboardPageProps> = ({ setS
     }
 
     // Listen for auction state updates (includes current player if auction is in progress)
-    socket.on('AUCTION_STATE_UPDATE', (data: any) => {
+    // Snapshot on join, then merged patches for every change
+    const stopStateUpdates = socketService.onAuctionStateUpdate((data: any) => {
       console.log('AUCTION_STATE_UPDATE received:', data);
       // If there's a current player being auctioned, set it
       if (data.currentPlayerId && data.biddingActive) {
@@ -354,12 +355,17 @@ export const TeamRepDashboardPage: React.FC<TeamRepDashboardPageProps> = ({ setS
     });
 
     // Team data updated (budget/players changed)
-    socket.on('TEAM_UPDATED', (data: { teamId?: string; team: Team }) => {
+    // The server sends the changed fields (budgets) plus any players added to the roster
+    socket.on('TEAM_UPDATED', (data: { teamId?: string; team: Partial<Team>; addedPlayerIds?: string[] }) => {
       console.log('💰 TEAM_UPDATED received:', data);
       // Check if this update is for the current team
       if (data.team.id === teamId || data.teamId === teamId) {
         console.log('   → Updating team data:', data.team);
-        setTeamData(data.team);
+        setTeamData(prev => prev ? {
+          ...prev,
+          ...data.team,
+          playerIds: [...(prev.playerIds || []), ...(data.addedPlayerIds || [])]
+        } : prev);
       }
     });
 
@@ -374,7 +380,7 @@ export const TeamRepDashboardPage: React.FC<TeamRepDashboardPageProps> = ({ setS
       socket.off('AUCTION_PAUSED');
       socket.off('AUCTION_COMPLETED');
       socket.off('TEAM_UPDATED');
-      socket.off('AUCTION_STATE_UPDATE');
+      stopStateUpdates();
       socket.off('AUCTION_RESUMED');
     };
   }, [seasonId, userId, teamId, allPlayers]);
@@ -69,7 +69,7 @@ export const LiveBiddingPanel: React.FC<LiveBiddingPanelProps> = ({
     });
 
     // Listen to timer updates
-    socketService.onTimerUpdate((data) => {
+    const stopCountdown = socketService.onTimerUpdate((data) => {
       setAuctionState(prev => ({ ...prev, remainingSeconds: data.remainingSeconds }));
     });
 
@@ -131,6 +131,7 @@ export const LiveBiddingPanel: React.FC<LiveBiddingPanelProps> = ({
 
     return () => {
       socketService.leaveSeason(seasonId);
+      stopCountdown();
     };
   }, [seasonId, userId, userRole, teamId]);
 
@@ -3,14 +3,18 @@ HypeHammer Firebase Cloud Functions
 Converted from Flask REST API to Firebase Cloud Functions
 """
 
-from firebase_functions import https_fn, options
+from firebase_functions import https_fn, options, scheduler_fn
 from firebase_admin import credentials, firestore, initialize_app
+from google.api_core import exceptions as gcp_exceptions
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 import uuid
 import os
 import json
+import random
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize Firebase Admin (only once)
 try:
@@ -61,8 +65,8 @@ def success_response(data: Any = None, message: str = "Success", status_code: in
     return response
 
 
-def compute_match_status(match_data: Dict, players: List[Dict] = None, history: List[Dict] = None) -> str:
-    """Compute the actual status of a match/auction based on multiple factors"""
+def compute_match_status(match_data: Dict) -> str:
+    """Compute the actual status of a match/auction from its date and counters"""
     
     if match_data.get('status') == 'COMPLETED':
         return 'COMPLETED'
@@ -90,18 +94,15 @@ def compute_match_status(match_data: Dict, players: List[Dict] = None, history:
             except:
                 pass
     
-    has_sold_players = False
-    if players is not None:
-        total_players = len(players)
-        processed_players = sum(1 for p in players if p.get('status') in ['SOLD', 'UNSOLD'])
-        sold_players = sum(1 for p in players if p.get('status') == 'SOLD')
-        has_sold_players = sold_players > 0
-        all_players_processed = total_players > 0 and processed_players == total_players
-        
-        if all_players_processed:
-            return 'COMPLETED'
+    total_players = match_data.get('playerCount', 0)
+    sold_players = match_data.get('soldCount', 0)
+    processed_players = sold_players + match_data.get('unsoldCount', 0)
+    has_sold_players = sold_players > 0
     
-    has_history = history and len(history) > 0
+    if total_players > 0 and processed_players >= total_players:
+        return 'COMPLETED'
+    
+    has_history = match_data.get('bidCount', 0) > 0
     is_ongoing = match_data.get('status') == 'ONGOING'
     has_activity = has_history or has_sold_players
     
@@ -113,6 +114,66 @@ def compute_match_status(match_data: Dict, players: List[Dict] = None, history:
     return 'SETUP'
 
 
+# Per-match counters kept on the match document with Increment, so status needs no scans
+MATCH_COUNTER_FIELDS = ('playerCount', 'soldCount', 'unsoldCount', 'bidCount', 'teamCount')
+
+
+def player_counter_deltas(player: Optional[Dict], sign: int = 1) -> Dict[str, int]:
+    """What one player document contributes to its match's counters (sign=-1 removes it)"""
+    if not player:
+        return {}
+    deltas = {'playerCount': sign}
+    if player.get('status') == 'SOLD':
+        deltas['soldCount'] = sign
+    elif player.get('status') == 'UNSOLD':
+        deltas['unsoldCount'] = sign
+    return deltas
+
+
+def match_exists(match_id: Optional[str]) -> bool:
+    """Whether match_id names a match document; counters are only kept on real matches"""
+    return bool(match_id) and db.collection('matches').document(match_id).get().exists
+
+
+def bump_match_counters(match_id: Optional[str], deltas: Dict[str, int], writer=None):
+    """Apply counter deltas to a match document, inside the caller's batch or transaction when given.
+
+    An update, never a merge, so a bad match id fails the write instead of
+    creating a counters-only match; callers check unknown ids with match_exists.
+    """
+    fields = {name: firestore.Increment(delta) for name, delta in deltas.items() if delta}
+    if not match_id or not fields:
+        return
+    ref = db.collection('matches').document(match_id)
+    if writer is not None:
+        writer.update(ref, fields)
+    else:
+        ref.update(fields)
+
+
+def track_player_change(before: Optional[Dict], after: Optional[Dict], writer=None):
+    """Move a player's counter contribution from its old document to its new one"""
+    by_match = {}
+    for player, sign in ((before, -1), (after, 1)):
+        if player and player.get('matchId'):
+            deltas = by_match.setdefault(player['matchId'], {})
+            for name, delta in player_counter_deltas(player, sign).items():
+                deltas[name] = deltas.get(name, 0) + delta
+    for match_id, deltas in by_match.items():
+        bump_match_counters(match_id, deltas, writer)
+
+
+def tally_match_counters(players: List[Dict], bids: List[Dict], teams: List[Dict] = ()) -> Dict[str, int]:
+    """Counters recomputed from scratch (backfill and repair)"""
+    counters = dict.fromkeys(MATCH_COUNTER_FIELDS, 0)
+    for player in players:
+        for name, delta in player_counter_deltas(player).items():
+            counters[name] += delta
+    counters['bidCount'] = len(bids)
+    counters['teamCount'] = len(teams)
+    return counters
+
+
 def sync_team_player_ids(team_id: str):
     """Synchronize team's playerIds from players marked as SOLD to that team"""
     try:
@@ -456,6 +517,10 @@ def register_team(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Missing required fields: {required_fields}")
             return create_response(result, 400)
         
+        if not match_exists(data['seasonId']):
+            result = error_response(f"Match {data['seasonId']} not found", 404)
+            return create_response(result, 404)
+        
         for collection in ['auctioneers', 'teams', 'players', 'guests', 'matches']:
             existing = db.collection(collection).where('email', '==', data['email']).stream()
             if list(existing):
@@ -484,7 +549,10 @@ def register_team(req: https_fn.Request) -> https_fn.Response:
             'profileComplete': True
         }
         
-        db.collection('teams').document(team_id).set(team_data)
+        batch = db.batch()
+        batch.set(db.collection('teams').document(team_id), team_data)
+        bump_match_counters(team_data.get('matchId'), {'teamCount': 1}, batch)
+        batch.commit()
         
         result = success_response({'teamId': team_id}, "Team registered successfully", 201)
         return create_response(result, 201)
@@ -507,6 +575,10 @@ def register_player(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Missing required fields: {required_fields}")
             return create_response(result, 400)
         
+        if not match_exists(data['seasonId']):
+            result = error_response(f"Match {data['seasonId']} not found", 404)
+            return create_response(result, 404)
+        
         for collection in ['auctioneers', 'teams', 'players', 'guests', 'matches']:
             existing = db.collection(collection).where('email', '==', data['email']).stream()
             if list(existing):
@@ -544,7 +616,10 @@ def register_player(req: https_fn.Request) -> https_fn.Response:
             'profileComplete': True
         }
         
-        db.collection('players').document(player_id).set(player_data)
+        batch = db.batch()
+        batch.set(db.collection('players').document(player_id), player_data)
+        track_player_change(None, player_data, batch)
+        batch.commit()
         
         result = success_response({'playerId': player_id}, "Player registered successfully", 201)
         return create_response(result, 201)
@@ -676,6 +751,10 @@ def create_team(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Missing required fields: {required_fields}")
             return create_response(result, 400)
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            result = error_response(f"Match {data['matchId']} not found", 404)
+            return create_response(result, 404)
+        
         team_id = generate_id('team')
         team_data = {
             **data,
@@ -687,7 +766,10 @@ def create_team(req: https_fn.Request) -> https_fn.Response:
             'updatedAt': datetime.now().isoformat()
         }
         
-        db.collection('teams').document(team_id).set(team_data)
+        batch = db.batch()
+        batch.set(db.collection('teams').document(team_id), team_data)
+        bump_match_counters(team_data.get('matchId'), {'teamCount': 1}, batch)
+        batch.commit()
         
         result = success_response(team_data, "Team created successfully", 201)
         return create_response(result, 201)
@@ -742,7 +824,13 @@ def delete_team(req: https_fn.Request) -> https_fn.Response:
             result = error_response("Team ID is required", 400)
             return create_response(result, 400)
         
-        db.collection('teams').document(team_id).delete()
+        team_ref = db.collection('teams').document(team_id)
+        team_doc = team_ref.get()
+        batch = db.batch()
+        batch.delete(team_ref)
+        if team_doc.exists and match_exists(team_doc.to_dict().get('matchId')):
+            bump_match_counters(team_doc.to_dict().get('matchId'), {'teamCount': -1}, batch)
+        batch.commit()
         result = success_response(None, "Team deleted successfully")
         return create_response(result)
     except Exception as e:
@@ -833,6 +921,10 @@ def create_player(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Missing required fields: {required_fields}")
             return create_response(result, 400)
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            result = error_response(f"Match {data['matchId']} not found", 404)
+            return create_response(result, 404)
+        
         player_id = generate_id('player')
         player_data = {
             **data,
@@ -843,7 +935,10 @@ def create_player(req: https_fn.Request) -> https_fn.Response:
             'updatedAt': datetime.now().isoformat()
         }
         
-        db.collection('players').document(player_id).set(player_data)
+        batch = db.batch()
+        batch.set(db.collection('players').document(player_id), player_data)
+        track_player_change(None, player_data, batch)
+        batch.commit()
         
         result = success_response(player_data, "Player created successfully", 201)
         return create_response(result, 201)
@@ -874,8 +969,23 @@ def update_player(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Player {player_id} not found", 404)
             return create_response(result, 404)
         
+        before = serialize_firestore_doc(player_doc)
+        
+        # Counters move only between matches that exist
+        old_match_id = before.get('matchId')
+        new_match_id = data.get('matchId', old_match_id)
+        if new_match_id != old_match_id and new_match_id and not match_exists(new_match_id):
+            result = error_response(f"Match {new_match_id} not found", 404)
+            return create_response(result, 404)
+        old_counted = match_exists(old_match_id)
+        new_counted = old_counted if new_match_id == old_match_id else bool(new_match_id)
+        
         data['updatedAt'] = datetime.now().isoformat()
-        player_ref.update(data)
+        batch = db.batch()
+        batch.update(player_ref, data)
+        track_player_change(before if old_counted else None,
+                            {**before, **data} if new_counted else None, batch)
+        batch.commit()
         updated_doc = player_ref.get()
         updated_player = serialize_firestore_doc(updated_doc)
         
@@ -900,7 +1010,13 @@ def delete_player(req: https_fn.Request) -> https_fn.Response:
             result = error_response("Player ID is required", 400)
             return create_response(result, 400)
         
-        db.collection('players').document(player_id).delete()
+        player_ref = db.collection('players').document(player_id)
+        player_doc = player_ref.get()
+        batch = db.batch()
+        batch.delete(player_ref)
+        if player_doc.exists and match_exists(player_doc.to_dict().get('matchId')):
+            track_player_change(serialize_firestore_doc(player_doc), None, batch)
+        batch.commit()
         result = success_response(None, "Player deleted successfully")
         return create_response(result)
     except Exception as e:
@@ -984,6 +1100,7 @@ def create_match(req: https_fn.Request) -> https_fn.Response:
         match_id = generate_id('match')
         match_data = {
             **data,
+            **dict.fromkeys(MATCH_COUNTER_FIELDS, 0),
             'id': match_id,
             'status': data.get('status', 'SETUP'),
             'createdAt': datetime.now().isoformat(),
@@ -1020,6 +1137,9 @@ def update_match(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Match {match_id} not found", 404)
             return create_response(result, 404)
         
+        # Counters are maintained by the server, never taken from the client
+        for field in MATCH_COUNTER_FIELDS:
+            data.pop(field, None)
         data['updatedAt'] = datetime.now().isoformat()
         match_ref.update(data)
         updated_doc = match_ref.get()
@@ -1097,61 +1217,132 @@ def health(req: https_fn.Request) -> https_fn.Response:
 # SPORTS DATA FUNCTIONS
 # ========================
 
+# Firestore caps the values of a single 'in' filter
+FIRESTORE_IN_LIMIT = 30
+
+sports_query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='sports-query')
+
+# Everything a match card needs: no players, teams, bids or organizer credentials
+MATCH_SUMMARY_FIELDS = ('name', 'sport', 'status', 'matchDate', 'createdAt', 'place', 'config',
+                        'organizerName', 'organizationName', *MATCH_COUNTER_FIELDS)
+
+# Lazily loaded parts of a match and the collection each one comes from
+MATCH_DETAIL_COLLECTIONS = {'players': 'players', 'teams': 'teams', 'history': 'bids'}
+
+# Kept out of the unauthenticated match reads (full /api/sports and match
+# details): credentials and the contact details of organizers, players and teams
+MATCH_PUBLIC_HIDDEN_FIELDS = ('password', 'email', 'phone')
+
+
+def public_record(data: Dict, hidden=('password',)) -> Dict:
+    """A document without its password (or the given hidden fields)"""
+    return {k: v for k, v in data.items() if k not in hidden}
+
+
+def group_matches_by_sport(matches: List[Dict]) -> List[Dict]:
+    """[{sportType, matches}] in first-seen order of sport"""
+    sports_by_type = {}
+    for match_data in matches:
+        sport_type = match_data.get('sport', 'CUSTOM')
+        sport_entry = sports_by_type.get(sport_type)
+        if not sport_entry:
+            sport_entry = sports_by_type[sport_type] = {
+                'sportType': sport_type,
+                'matches': []
+            }
+        sport_entry['matches'].append(match_data)
+    return list(sports_by_type.values())
+
+
+def fetch_grouped_by_match(collections: List[str], match_ids: List[str]) -> Dict[str, Dict[str, List[Dict]]]:
+    """Fetch child documents for many matches with concurrent 'in' queries, grouped by matchId"""
+    grouped = {name: {} for name in collections}
+    
+    def fetch(name: str, chunk: List[str]) -> List[Dict]:
+        return serialize_firestore_docs(db.collection(name).where('matchId', 'in', chunk).stream())
+    
+    futures = [
+        (name, sports_query_executor.submit(fetch, name, match_ids[i:i + FIRESTORE_IN_LIMIT]))
+        for name in collections
+        for i in range(0, len(match_ids), FIRESTORE_IN_LIMIT)
+    ]
+    for name, future in futures:
+        bucket = grouped[name]
+        for doc in future.result():
+            bucket.setdefault(doc.get('matchId'), []).append(doc)
+    return grouped
+
+
 @https_fn.on_request(cors=options.CorsOptions(
     cors_origins=["http://localhost:3000", "http://localhost:5173"],
     cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
 ))
 def get_sports(req: https_fn.Request) -> https_fn.Response:
-    """Get all sports data aggregated from Firestore"""
+    """Get all sports data aggregated from Firestore (?shape=summary for match cards only)"""
     try:
-        sports_data = []
+        if req.args.get('shape') == 'summary':
+            matches = serialize_firestore_docs(db.collection('matches').select(MATCH_SUMMARY_FIELDS).stream())
+            result = success_response(group_matches_by_sport(matches), "Sports summary retrieved successfully")
+            return create_response(result)
         
-        matches_docs = db.collection('matches').stream()
+        matches = serialize_firestore_docs(db.collection('matches').stream())
+        children = fetch_grouped_by_match(['players', 'teams', 'bids'], [m['id'] for m in matches])
         
-        for match_doc in matches_docs:
-            match_data = serialize_firestore_doc(match_doc)
-            
-            players_docs = db.collection('players').where('matchId', '==', match_doc.id).stream()
-            players = [serialize_firestore_doc(p) for p in players_docs]
-            
-            teams_docs = db.collection('teams').where('matchId', '==', match_doc.id).stream()
-            teams = [serialize_firestore_doc(t) for t in teams_docs]
-            
-            bids_docs = db.collection('bids').where('matchId', '==', match_doc.id).stream()
-            history = [serialize_firestore_doc(b) for b in bids_docs]
-            
-            computed_status = compute_match_status(match_data, players, history)
-            
-            if computed_status != match_data.get('status'):
-                db.collection('matches').document(match_doc.id).update({
-                    'status': computed_status,
-                    'updatedAt': datetime.now().isoformat()
-                })
-                match_data['status'] = computed_status
-            
-            match_data['players'] = players
-            match_data['teams'] = teams
-            match_data['history'] = history
-            
-            sport_type = match_data.get('sport', 'CUSTOM')
-            
-            sport_entry = next((s for s in sports_data if s.get('sportType') == sport_type), None)
-            if not sport_entry:
-                sport_entry = {
-                    'sportType': sport_type,
-                    'matches': []
-                }
-                sports_data.append(sport_entry)
+        sports_matches = []
+        for match_data in matches:
+            match_id = match_data['id']
             
-            sport_entry['matches'].append(match_data)
-        
-        result = success_response(sports_data, "Sports data retrieved successfully")
+            # Status is kept current by reconcile_match_statuses
+            match_data = public_record(match_data, MATCH_PUBLIC_HIDDEN_FIELDS)
+            match_data['players'] = [public_record(p, MATCH_PUBLIC_HIDDEN_FIELDS) for p in children['players'].get(match_id, [])]
+            match_data['teams'] = [public_record(t, MATCH_PUBLIC_HIDDEN_FIELDS) for t in children['teams'].get(match_id, [])]
+            match_data['history'] = children['bids'].get(match_id, [])
+            sports_matches.append(match_data)
+        
+        result = success_response(group_matches_by_sport(sports_matches), "Sports data retrieved successfully")
         return create_response(result)
     except Exception as e:
         result = error_response(f"Failed to retrieve sports data: {str(e)}")
         return create_response(result, 400)
 
 
+@https_fn.on_request(cors=options.CorsOptions(
+    cors_origins=["http://localhost:3000", "http://localhost:5173"],
+    cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+))
+def get_match_details(req: https_fn.Request) -> https_fn.Response:
+    """A match with its players, teams and bid history (?include= any of players,teams,history)"""
+    try:
+        path_parts = req.path.split('/')
+        match_id = req.args.get('matchId') or (path_parts[-2] if len(path_parts) >= 2 else None)
+        
+        if not match_id:
+            result = error_response("Match ID is required", 400)
+            return create_response(result, 400)
+        
+        include = [part for part in req.args.get('include', ','.join(MATCH_DETAIL_COLLECTIONS)).split(',')
+                   if part in MATCH_DETAIL_COLLECTIONS]
+        
+        def fetch(collection: str) -> List[Dict]:
+            return serialize_firestore_docs(db.collection(collection).where('matchId', '==', match_id).stream())
+        
+        futures = {part: sports_query_executor.submit(fetch, MATCH_DETAIL_COLLECTIONS[part]) for part in include}
+        match_doc = db.collection('matches').document(match_id).get()
+        if not match_doc.exists:
+            result = error_response(f"Match {match_id} not found", 404)
+            return create_response(result, 404)
+        
+        details = public_record(serialize_firestore_doc(match_doc), MATCH_PUBLIC_HIDDEN_FIELDS)
+        for part, future in futures.items():
+            details[part] = [public_record(doc, MATCH_PUBLIC_HIDDEN_FIELDS) for doc in future.result()]
+        
+        result = success_response(details, "Match details retrieved successfully")
+        return create_response(result)
+    except Exception as e:
+        result = error_response(f"Failed to retrieve match details: {str(e)}")
+        return create_response(result, 400)
+
+
 @https_fn.on_request(cors=options.CorsOptions(
     cors_origins=["http://localhost:3000", "http://localhost:5173"],
     cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
@@ -1167,7 +1358,8 @@ def save_sports(req: https_fn.Request) -> https_fn.Response:
             for match in sport_data.get('matches', []):
                 match_id = match.get('id')
                 
-                match_to_save = {k: v for k, v in match.items() if k not in ['players', 'teams', 'history']}
+                match_to_save = {k: v for k, v in match.items()
+                                 if k not in ['players', 'teams', 'history', *MATCH_COUNTER_FIELDS]}
                 match_to_save['sport'] = sport_type
                 match_to_save['updatedAt'] = datetime.now().isoformat()
                 
@@ -1192,6 +1384,9 @@ def save_sports(req: https_fn.Request) -> https_fn.Response:
                     team_to_save = {**team, 'matchId': match_id, 'updatedAt': datetime.now().isoformat()}
                     db.collection('teams').document(team_id).set(team_to_save, merge=True)
         
+        # Player docs were merged blind, so recount the affected matches
+        recount_match_counters([match.get('id') for sport_data in data for match in sport_data.get('matches', [])])
+        
         result = success_response({"saved": True}, "Sports data saved successfully")
         return create_response(result)
     except Exception as e:
@@ -1199,6 +1394,62 @@ def save_sports(req: https_fn.Request) -> https_fn.Response:
         return create_response(result, 400)
 
 
+# Firestore caps a batch at 500 writes
+FIRESTORE_BATCH_LIMIT = 500
+
+
+def recount_match_counters(match_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Recount matches' counters from their players and bids and store them (backfill and repair)"""
+    match_ids = [match_id for match_id in dict.fromkeys(match_ids) if match_id]
+    children = fetch_grouped_by_match(['players', 'bids', 'teams'], match_ids)
+    counters = {
+        match_id: tally_match_counters(children['players'].get(match_id, []), children['bids'].get(match_id, []),
+                                       children['teams'].get(match_id, []))
+        for match_id in match_ids
+    }
+    for i in range(0, len(match_ids), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for match_id in match_ids[i:i + FIRESTORE_BATCH_LIMIT]:
+            batch.set(db.collection('matches').document(match_id), counters[match_id], merge=True)
+        batch.commit()
+    return counters
+
+
+@scheduler_fn.on_schedule(schedule="every 1 minutes")
+def reconcile_match_statuses(event: scheduler_fn.ScheduledEvent) -> None:
+    """Recompute every match's status from its counters and write the changes in batches"""
+    matches = serialize_firestore_docs(db.collection('matches').stream())
+    
+    # Matches from before the counters existed are recounted once
+    stale = [m['id'] for m in matches if any(f not in m for f in MATCH_COUNTER_FIELDS)]
+    if stale:
+        counters = recount_match_counters(stale)
+        for match in matches:
+            match.update(counters.get(match['id'], {}))
+    
+    changes = []
+    for match in matches:
+        try:
+            status = compute_match_status(match)
+        except Exception as e:
+            print(f"Could not compute status for match {match['id']}: {e}")
+            continue
+        if status != match.get('status'):
+            changes.append((match['id'], status))
+    
+    now = datetime.now().isoformat()
+    for i in range(0, len(changes), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for match_id, status in changes[i:i + FIRESTORE_BATCH_LIMIT]:
+            batch.update(db.collection('matches').document(match_id), {
+                'status': status,
+                'updatedAt': now
+            })
+        batch.commit()
+    
+    print(f"Match statuses reconciled: {len(changes)}/{len(matches)} updated")
+
+
 # ========================
 # PLAYER SELLING
 # ========================
@@ -1232,25 +1483,26 @@ def sell_player(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Player {player_id} not found", 404)
             return create_response(result, 404)
         
-        player_ref.update({
+        sale = {
             'status': 'SOLD',
             'teamId': team_id,
             'soldPrice': sold_price,
             'updatedAt': datetime.now().isoformat()
-        })
+        }
+        before = player.to_dict()
         
-        team_ref = db.collection('teams').document(team_id)
-        team = team_ref.get()
-        if team.exists:
-            current_budget = team.to_dict().get('remainingBudget', 0)
-            team_ref.update({
-                'remainingBudget': max(0, current_budget - sold_price),
-                'updatedAt': datetime.now().isoformat()
-            })
+        # The team's debit, the player and its match counters commit together
+        writes = [lambda writer: writer.update(player_ref, sale)]
+        if match_exists(before.get('matchId')):
+            writes.append(lambda writer: track_player_change(before, {**before, **sale}, writer))
+        debit_team_transaction(db.transaction(), team_id, sold_price, writes=writes)
         
         updated = player_ref.get()
         result = success_response(serialize_firestore_doc(updated), "Player sold successfully")
         return create_response(result)
+    except BudgetError as e:
+        result = error_response(str(e), e.status_code)
+        return create_response(result, e.status_code)
     except Exception as e:
         result = error_response(f"Failed to sell player: {str(e)}")
         return create_response(result, 400)
@@ -1260,6 +1512,44 @@ def sell_player(req: https_fn.Request) -> https_fn.Response:
 # TEAM BUDGET MANAGEMENT
 # ========================
 
+class BudgetError(Exception):
+    """Raised inside a debit transaction when the team can't be charged"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@firestore.transactional
+def debit_team_transaction(transaction, team_id: str, amount, writes=(), extra: Optional[Dict] = None) -> int:
+    """Charge a team and apply the other writes in one transaction; returns the new balance.
+
+    remainingBudget is the balance. It is read and checked inside the
+    transaction, and budget is written with the same value so the two
+    fields can't drift apart. Each of `writes` is called with the transaction.
+    """
+    team_ref = db.collection('teams').document(team_id)
+    team_doc = team_ref.get(transaction=transaction)
+    if not team_doc.exists:
+        raise BudgetError(f"Team {team_id} not found", 404)
+    
+    team = team_doc.to_dict()
+    balance = team.get('remainingBudget', team.get('budget', 0))
+    if amount > balance:
+        raise BudgetError(f"Insufficient budget. Available: {balance}")
+    
+    for write in writes:
+        write(transaction)
+    new_balance = balance - amount
+    transaction.update(team_ref, {
+        **(extra or {}),
+        'budget': new_balance,
+        'remainingBudget': new_balance,
+        'updatedAt': datetime.now().isoformat()
+    })
+    return new_balance
+
+
 @https_fn.on_request(cors=options.CorsOptions(
     cors_origins=["http://localhost:3000", "http://localhost:5173"],
     cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
@@ -1281,28 +1571,15 @@ def update_team_budget(req: https_fn.Request) -> https_fn.Response:
             result = error_response("Missing 'amount' field")
             return create_response(result, 400)
         
-        team_ref = db.collection('teams').document(team_id)
-        team = team_ref.get()
-        
-        if not team.exists:
-            result = error_response(f"Team {team_id} not found", 404)
-            return create_response(result, 404)
+        # Check and debit in one transaction, no read-then-write window
+        debit_team_transaction(db.transaction(), team_id, amount)
         
-        current_budget = team.to_dict().get('remainingBudget', 0)
-        new_budget = current_budget - amount
-        
-        if new_budget < 0:
-            result = error_response("Insufficient budget", 400)
-            return create_response(result, 400)
-        
-        team_ref.update({
-            'remainingBudget': new_budget,
-            'updatedAt': datetime.now().isoformat()
-        })
-        
-        updated = team_ref.get()
+        updated = db.collection('teams').document(team_id).get()
         result = success_response(serialize_firestore_doc(updated), "Budget updated successfully")
         return create_response(result)
+    except BudgetError as e:
+        result = error_response(str(e), e.status_code)
+        return create_response(result, e.status_code)
     except Exception as e:
         result = error_response(f"Failed to update budget: {str(e)}")
         return create_response(result, 400)
@@ -1578,6 +1855,10 @@ def create_bid(req: https_fn.Request) -> https_fn.Response:
             result = error_response(f"Missing required fields: {required_fields}")
             return create_response(result, 400)
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            result = error_response(f"Match {data['matchId']} not found", 404)
+            return create_response(result, 404)
+        
         bid_id = generate_id('bid')
         bid_data = {
             **data,
@@ -1585,7 +1866,10 @@ def create_bid(req: https_fn.Request) -> https_fn.Response:
             'timestamp': datetime.now().isoformat()
         }
         
-        db.collection('bids').document(bid_id).set(bid_data)
+        batch = db.batch()
+        batch.set(db.collection('bids').document(bid_id), bid_data)
+        bump_match_counters(bid_data.get('matchId'), {'bidCount': 1}, batch)
+        batch.commit()
         
         result = success_response(bid_data, "Bid created successfully", 201)
         return create_response(result, 201)
@@ -1644,13 +1928,27 @@ def get_bid_history(req: https_fn.Request) -> https_fn.Response:
         auction_id = path_parts[-4]
         player_id = path_parts[-2]
         
-        docs = db.collection('bids')\
-            .where('auctionId', '==', auction_id)\
-            .where('playerId', '==', player_id)\
-            .order_by('timestamp', direction=firestore.Query.DESCENDING)\
-            .stream()
+        # Live auction lots are paged newest first from the per-lot bid log;
+        # pass `before` = the seq of the last bid received for the next page
+        data = parse_request_data(req)
+        limit = min(int(data.get('limit', 50)), 500)
+        before = data.get('before')
         
-        bids = serialize_firestore_docs(docs)
+        query = lot_bid_log(auction_id, player_id)\
+            .order_by('seq', direction=firestore.Query.DESCENDING)
+        if before is not None:
+            query = query.start_after({'seq': int(before)})
+        
+        bids = serialize_firestore_docs(query.limit(limit).stream())
+        
+        # Lots bid on before the per-lot log existed only have `bids` records
+        if not bids and before is None:
+            docs = db.collection('bids')\
+                .where('auctionId', '==', auction_id)\
+                .where('playerId', '==', player_id)\
+                .order_by('timestamp', direction=firestore.Query.DESCENDING)\
+                .stream()
+            bids = serialize_firestore_docs(docs)
         
         result = success_response(bids, f"Retrieved {len(bids)} bids")
         return create_response(result)
@@ -1739,13 +2037,7 @@ def update_match_status(req: https_fn.Request) -> https_fn.Response:
         
         match_data = serialize_firestore_doc(match_doc)
         
-        players_docs = db.collection('players').where('matchId', '==', match_id).stream()
-        players = [serialize_firestore_doc(p) for p in players_docs]
-        
-        bids_docs = db.collection('bids').where('matchId', '==', match_id).stream()
-        history = [serialize_firestore_doc(b) for b in bids_docs]
-        
-        computed_status = compute_match_status(match_data, players, history)
+        computed_status = compute_match_status(match_data)
         
         match_ref.update({
             'status': computed_status,
@@ -2211,6 +2503,11 @@ def initialize_auction(req: https_fn.Request) -> https_fn.Response:
         
         season_id = data['seasonId']
         
+        # Lots and bids keep counters on the season's match document
+        if not match_exists(season_id):
+            result = error_response(f"Match {season_id} not found", 404)
+            return create_response(result, 404)
+        
         assignments = db.collection('auctioneer_assignments')\
             .where('seasonId', '==', season_id)\
             .where('status', '==', 'approved')\
@@ -2409,12 +2706,15 @@ def start_player_bidding(req: https_fn.Request) -> https_fn.Response:
         updates = {
             'currentPlayerId': player_id,
             'currentPlayerName': player.get('name', 'Unknown'),
+            'currentPlayerStatus': player.get('status'),
             'currentBid': base_price,
             'leadingTeamId': None,
             'leadingTeamName': None,
             'biddingActive': True,
             'bidStartTime': datetime.now().isoformat(),
-            'bidHistory': []
+            'bidHistory': [],
+            'bidHistoryLimit': BID_HISTORY_LIMIT,
+            'lotBidCount': 0
         }
         
         update_auction_state_helper(season_id, updates)
@@ -2428,12 +2728,154 @@ def start_player_bidding(req: https_fn.Request) -> https_fn.Response:
         return create_response(result, 400)
 
 
+# bidHistory in the state document is a ring of the latest bids for the UI;
+# the full history of a lot lives in auction_states/{season}/lots/{player}/bids
+BID_HISTORY_LIMIT = 20
+
+# Bid transactions: bounded attempts with jittered exponential backoff
+BID_TXN_MAX_ATTEMPTS = 5
+BID_TXN_BASE_BACKOFF = 0.025
+BID_TXN_MAX_BACKOFF = 0.5
+
+# Per-instance contention counters; retries and aborts are also
+# accumulated in auction_metrics/{seasonId} so they survive cold starts
+bid_txn_counters = {
+    'fastRejects': 0,
+    'attempts': 0,
+    'retries': 0,
+    'aborts': 0,
+    'committed': 0
+}
+
+
+def lot_bid_log(season_id: str, player_id: str):
+    """Append-only log of every bid on one lot, keyed by zero-padded bid seq"""
+    return db.collection('auction_states').document(season_id)\
+        .collection('lots').document(player_id).collection('bids')
+
+
+class BidRejected(Exception):
+    """Raised inside a bid transaction when validation fails"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def validate_bid_state(state: Optional[Dict], amount) -> None:
+    """Check a bid against an auction state snapshot"""
+    if not state:
+        raise BidRejected("Auction state not found", 404)
+    
+    if state.get('status') != 'LIVE':
+        raise BidRejected("Auction is not live")
+    
+    if not state.get('biddingActive'):
+        raise BidRejected("No player is currently up for bidding")
+    
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)) or amount <= 0:
+        raise BidRejected("Bid amount must be a positive number")
+    
+    current_bid = state.get('currentBid', 0)
+    if amount <= current_bid:
+        raise BidRejected(f"Bid must be higher than current bid of {current_bid}")
+
+
+def is_bid_contention(error: Exception) -> bool:
+    """A commit lost to another writer: Aborted, or the ValueError the client
+    raises from it once the transaction's single attempt is used up"""
+    if isinstance(error, gcp_exceptions.Aborted):
+        return True
+    return isinstance(error, ValueError) and (
+        isinstance(error.__cause__, gcp_exceptions.Aborted)
+        or str(error).startswith('Failed to commit transaction')
+    )
+
+
+@firestore.transactional
+def place_bid_transaction(transaction, season_id: str, team_id: str, amount) -> Dict:
+    """Validate a bid and commit the state update and bid record atomically"""
+    state_ref = db.collection('auction_states').document(season_id)
+    team_ref = db.collection('teams').document(team_id)
+    
+    state_doc = state_ref.get(transaction=transaction)
+    validate_bid_state(state_doc.to_dict() if state_doc.exists else None, amount)
+    state = state_doc.to_dict()
+    
+    team_doc = team_ref.get(transaction=transaction)
+    if not team_doc.exists:
+        raise BidRejected("Team not found", 404)
+    
+    team = team_doc.to_dict()
+    remaining_budget = team.get('remainingBudget', 0)
+    if amount > remaining_budget:
+        raise BidRejected(f"Insufficient budget. Remaining: {remaining_budget}")
+    
+    now = datetime.now().isoformat()
+    seq = state.get('bidSeq', 0) + 1
+    
+    # Bounded ring: the state document stays the same size however long the lot runs
+    bid_history = state.get('bidHistory', [])[-(BID_HISTORY_LIMIT - 1):]
+    bid_history.append({
+        'seq': seq,
+        'teamId': team_id,
+        'teamName': team.get('name', 'Unknown'),
+        'amount': amount,
+        'timestamp': now
+    })
+    
+    transaction.set(state_ref, {
+        'bidSeq': seq,
+        'currentBid': amount,
+        'leadingTeamId': team_id,
+        'leadingTeamName': team.get('name', 'Unknown'),
+        'bidHistory': bid_history,
+        'lotBidCount': state.get('lotBidCount', 0) + 1,
+        'lastBidTime': now,
+        'updatedAt': now
+    }, merge=True)
+    
+    bid_id = generate_id('bid')
+    bid_data = {
+        'id': bid_id,
+        'seasonId': season_id,
+        'matchId': season_id,
+        'playerId': state['currentPlayerId'],
+        'teamId': team_id,
+        'teamName': team.get('name'),
+        'amount': amount,
+        'seq': seq,
+        'timestamp': now
+    }
+    transaction.set(db.collection('bids').document(bid_id), bid_data)
+    transaction.set(lot_bid_log(season_id, state['currentPlayerId']).document(f"{seq:010d}"), bid_data)
+    bump_match_counters(season_id, {'bidCount': 1}, transaction)
+    
+    return bid_data
+
+
+def record_bid_contention(season_id: str, retries: int, aborted: bool):
+    """Accumulate retry/abort counts for a season (only written under contention)"""
+    if not retries and not aborted:
+        return
+    
+    try:
+        db.collection('auction_metrics').document(season_id).set({
+            'seasonId': season_id,
+            'bidTxnRetries': firestore.Increment(retries),
+            'bidTxnAborts': firestore.Increment(1 if aborted else 0),
+            'updatedAt': datetime.now().isoformat()
+        }, merge=True)
+    except Exception as e:
+        print(f"Error recording bid contention for {season_id}: {e}")
+
+
 @https_fn.on_request(cors=options.CorsOptions(
     cors_origins=["http://localhost:3000", "http://localhost:5173"],
     cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
 ))
 def place_bid(req: https_fn.Request) -> https_fn.Response:
-    """Team Rep places a bid - SERVER VALIDATES"""
+    """Team Rep places a bid - SERVER VALIDATES inside a Firestore transaction"""
     try:
         data = parse_request_data(req)
         
@@ -2446,75 +2888,84 @@ def place_bid(req: https_fn.Request) -> https_fn.Response:
         team_id = data['teamId']
         amount = data['amount']
         
-        state = get_auction_state_helper(season_id)
-        if not state:
-            result = error_response("Auction state not found", 404)
-            return create_response(result, 404)
-        
-        if state['status'] != 'LIVE':
-            result = error_response("Auction is not live", 400)
-            return create_response(result, 400)
-        
-        if not state.get('biddingActive'):
-            result = error_response("No player is currently up for bidding", 400)
-            return create_response(result, 400)
-        
-        current_bid = state.get('currentBid', 0)
-        if amount <= current_bid:
-            result = error_response(f"Bid must be higher than current bid of {current_bid}", 400)
-            return create_response(result, 400)
-        
-        team_doc = db.collection('teams').document(team_id).get()
-        if not team_doc.exists:
-            result = error_response("Team not found", 404)
-            return create_response(result, 404)
-        
-        team = serialize_firestore_doc(team_doc)
-        
-        remaining_budget = team.get('remainingBudget', 0)
-        if amount > remaining_budget:
-            result = error_response(f"Insufficient budget. Remaining: {remaining_budget}", 400)
-            return create_response(result, 400)
-        
-        bid_history = state.get('bidHistory', [])
-        bid_history.append({
-            'teamId': team_id,
-            'teamName': team.get('name', 'Unknown'),
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        updates = {
-            'currentBid': amount,
-            'leadingTeamId': team_id,
-            'leadingTeamName': team.get('name', 'Unknown'),
-            'bidHistory': bid_history,
-            'lastBidTime': datetime.now().isoformat()
-        }
-        
-        update_auction_state_helper(season_id, updates)
+        # Fast fail: a plain read rejects stale bids without opening a transaction
+        try:
+            validate_bid_state(get_auction_state_helper(season_id), amount)
+        except BidRejected as e:
+            bid_txn_counters['fastRejects'] += 1
+            result = error_response(str(e), e.status_code)
+            return create_response(result, e.status_code)
+        
+        retries = 0
+        for attempt in range(1, BID_TXN_MAX_ATTEMPTS + 1):
+            bid_txn_counters['attempts'] += 1
+            try:
+                # One attempt per transaction object; retries and backoff are ours
+                bid_data = place_bid_transaction(db.transaction(max_attempts=1), season_id, team_id, amount)
+                break
+            except BidRejected as e:
+                record_bid_contention(season_id, retries, False)
+                result = error_response(str(e), e.status_code)
+                return create_response(result, e.status_code)
+            except (gcp_exceptions.Aborted, ValueError) as e:
+                if not is_bid_contention(e):
+                    record_bid_contention(season_id, retries, False)
+                    result = error_response(str(e), 400)
+                    return create_response(result, 400)
+                
+                # Another writer won the race
+                if attempt == BID_TXN_MAX_ATTEMPTS:
+                    bid_txn_counters['aborts'] += 1
+                    record_bid_contention(season_id, retries, True)
+                    print(f"Bid transaction aborted for {season_id} after {attempt} attempts: {e}")
+                    result = error_response("Bid not placed due to contention, please retry", 409)
+                    return create_response(result, 409)
+                
+                retries += 1
+                bid_txn_counters['retries'] += 1
+                backoff = min(BID_TXN_MAX_BACKOFF, BID_TXN_BASE_BACKOFF * (2 ** (attempt - 1)))
+                time.sleep(random.uniform(0, backoff))
         
-        bid_id = generate_id('bid')
-        bid_data = {
-            'id': bid_id,
-            'seasonId': season_id,
-            'playerId': state['currentPlayerId'],
-            'teamId': team_id,
-            'teamName': team.get('name'),
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        }
-        db.collection('bids').document(bid_id).set(bid_data)
+        bid_txn_counters['committed'] += 1
+        record_bid_contention(season_id, retries, False)
         
         # Note: Real-time bid updates should use Firestore listeners on client
         
-        result = success_response(None, "Bid placed successfully")
+        result = success_response({
+            'bidId': bid_data['id'],
+            'attempts': retries + 1
+        }, "Bid placed successfully")
         return create_response(result)
     except Exception as e:
         result = error_response(f"Failed to place bid: {str(e)}")
         return create_response(result, 400)
 
 
+@https_fn.on_request(cors=options.CorsOptions(
+    cors_origins=["http://localhost:3000", "http://localhost:5173"],
+    cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+))
+def get_bid_metrics(req: https_fn.Request) -> https_fn.Response:
+    """Bid transaction contention counters for this instance and a season"""
+    try:
+        data = parse_request_data(req)
+        season_id = data.get('seasonId')
+        
+        season_metrics = None
+        if season_id:
+            doc = db.collection('auction_metrics').document(season_id).get()
+            season_metrics = doc.to_dict() if doc.exists else {}
+        
+        result = success_response({
+            'instance': dict(bid_txn_counters),
+            'season': season_metrics
+        }, "Bid metrics retrieved")
+        return create_response(result)
+    except Exception as e:
+        result = error_response(f"Failed to get bid metrics: {str(e)}")
+        return create_response(result, 400)
+
+
 @https_fn.on_request(cors=options.CorsOptions(
     cors_origins=["http://localhost:3000", "http://localhost:5173"],
     cors_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
@@ -2555,34 +3006,34 @@ def close_player_bidding(req: https_fn.Request) -> https_fn.Response:
             'timestamp': datetime.now().isoformat()
         }
         
+        # Player, team and match counters are written together
+        player_ref = db.collection('players').document(player_id)
+        
+        def count_result(writer):
+            # The player leaves PENDING (or an earlier UNSOLD) for this result
+            track_player_change({'matchId': season_id, 'status': state.get('currentPlayerStatus') or 'PENDING'},
+                                {'matchId': season_id, 'status': 'SOLD' if sold and winning_team_id else 'UNSOLD'},
+                                writer)
+        
         if sold and winning_team_id:
-            db.collection('players').document(player_id).update({
-                'status': 'SOLD',
-                'soldTo': winning_team_id,
-                'soldAmount': final_amount,
-                'soldAt': datetime.now().isoformat()
-            })
-            
-            team_doc = db.collection('teams').document(winning_team_id).get()
-            if team_doc.exists:
-                team = serialize_firestore_doc(team_doc)
-                current_budget = team.get('budget', team.get('remainingBudget', 0))
-                new_budget = current_budget - final_amount
-                player_ids_list = team.get('playerIds', [])
-                if player_id not in player_ids_list:
-                    player_ids_list.append(player_id)
-                
-                db.collection('teams').document(winning_team_id).update({
-                    'budget': new_budget,
-                    'remainingBudget': new_budget,
-                    'playerIds': player_ids_list,
-                    'updatedAt': datetime.now().isoformat()
-                })
+            # Checked and charged in one transaction; budget follows remainingBudget
+            debit_team_transaction(db.transaction(), winning_team_id, final_amount, writes=[
+                lambda writer: writer.update(player_ref, {
+                    'status': 'SOLD',
+                    'soldTo': winning_team_id,
+                    'soldAmount': final_amount,
+                    'soldAt': datetime.now().isoformat()
+                }),
+                count_result
+            ], extra={'playerIds': firestore.ArrayUnion([player_id])})
         else:
-            db.collection('players').document(player_id).update({
+            batch = db.batch()
+            batch.update(player_ref, {
                 'status': 'UNSOLD',
                 'updatedAt': datetime.now().isoformat()
             })
+            count_result(batch)
+            batch.commit()
         
         completed = state.get('completedPlayers', [])
         completed.append(player_id)
@@ -2590,6 +3041,7 @@ def close_player_bidding(req: https_fn.Request) -> https_fn.Response:
         updates = {
             'currentPlayerId': None,
             'currentPlayerName': None,
+            'currentPlayerStatus': None,
             'currentBid': 0,
             'leadingTeamId': None,
             'leadingTeamName': None,
@@ -2604,6 +3056,9 @@ def close_player_bidding(req: https_fn.Request) -> https_fn.Response:
         
         result = success_response(result_data, "Player bidding closed")
         return create_response(result)
+    except BudgetError as e:
+        result = error_response(str(e), e.status_code)
+        return create_response(result, e.status_code)
     except Exception as e:
         result = error_response(f"Failed to close bidding: {str(e)}")
         return create_response(result, 400)
@@ -2797,7 +3252,8 @@ def api_info(req: https_fn.Request) -> https_fn.Response:
         "live_bidding": {
             "start_player": "start_player_bidding",
             "place_bid": "place_bid",
-            "close_player": "close_player_bidding"
+            "close_player": "close_player_bidding",
+            "bid_metrics": "get_bid_metrics"
         },
         "admin_controls": {
             "force_close": "admin_force_close_bidding",
@@ -14,9 +14,20 @@ import os
 import json
 from typing import Dict, List, Any, Tuple, Optional
 import uuid
+import re
 from dotenv import load_dotenv
 import threading
+import heapq
+import bisect
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 import time
+from contextlib import contextmanager
+from collections import deque, OrderedDict
+import atexit
+import signal
+import sys
+import tracemalloc
 
 # Load environment variables
 load_dotenv()
@@ -27,7 +38,8 @@ CORS(app, resources={
     r"/*": {
         "origins": ["http://localhost:3000", "http://localhost:5173", "http://localhost:*"],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key"],
+        "expose_headers": ["Idempotent-Replayed"],
         "supports_credentials": True
     }
 })
@@ -136,8 +148,28 @@ def success_response(data: Any = None, message: str = "Success", status_code: in
     return response, status_code
 
 
-def compute_match_status(match_data: Dict, players: List[Dict] = None, history: List[Dict] = None) -> str:
-    """Compute the actual status of a match/auction based on multiple factors"""
+def match_auction_date(match_data: Dict) -> Optional[datetime]:
+    """The match's auction date: matchDate, falling back to createdAt"""
+    for field in ('matchDate', 'createdAt'):
+        value = match_data.get(field)
+        if not value:
+            continue
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000 if value > 10000000000 else value)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except:
+                pass
+    return None
+
+
+def compute_match_status(match_data: Dict) -> str:
+    """Compute the actual status of a match/auction from its date and counters.
+
+    Only the match document is needed: player and bid totals come from the
+    counters kept on it (see MATCH_COUNTER_FIELDS).
+    """
     
     # If already marked as COMPLETED, keep it completed
     if match_data.get('status') == 'COMPLETED':
@@ -146,45 +178,20 @@ def compute_match_status(match_data: Dict, players: List[Dict] = None, history:
     # Get current time
     now = datetime.now()
     
-    # Get match/auction date
-    match_date = match_data.get('matchDate')
-    created_at = match_data.get('createdAt')
-    
-    # Parse date
-    auction_date = None
-    if match_date:
-        if isinstance(match_date, (int, float)):
-            auction_date = datetime.fromtimestamp(match_date / 1000 if match_date > 10000000000 else match_date)
-        elif isinstance(match_date, str):
-            try:
-                auction_date = datetime.fromisoformat(match_date.replace('Z', '+00:00'))
-            except:
-                pass
-    
-    if not auction_date and created_at:
-        if isinstance(created_at, (int, float)):
-            auction_date = datetime.fromtimestamp(created_at / 1000 if created_at > 10000000000 else created_at)
-        elif isinstance(created_at, str):
-            try:
-                auction_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            except:
-                pass
+    auction_date = match_auction_date(match_data)
     
     # Check if all players are processed
-    has_sold_players = False
-    if players is not None:
-        total_players = len(players)
-        processed_players = sum(1 for p in players if p.get('status') in ['SOLD', 'UNSOLD'])
-        sold_players = sum(1 for p in players if p.get('status') == 'SOLD')
-        has_sold_players = sold_players > 0
-        all_players_processed = total_players > 0 and processed_players == total_players
-        
-        # If all players processed, auction is completed
-        if all_players_processed:
-            return 'COMPLETED'
+    total_players = match_data.get('playerCount', 0)
+    sold_players = match_data.get('soldCount', 0)
+    processed_players = sold_players + match_data.get('unsoldCount', 0)
+    has_sold_players = sold_players > 0
+    
+    # If all players processed, auction is completed
+    if total_players > 0 and processed_players >= total_players:
+        return 'COMPLETED'
     
     # Check if auction has started based on history, sold players, or ONGOING status
-    has_history = history and len(history) > 0
+    has_history = match_data.get('bidCount', 0) > 0
     is_ongoing = match_data.get('status') == 'ONGOING'
     has_activity = has_history or has_sold_players
     
@@ -200,6 +207,72 @@ def compute_match_status(match_data: Dict, players: List[Dict] = None, history:
     return 'SETUP'
 
 
+# Per-match counters kept on the match document with Increment on every
+# registration, status change, deletion and bid, so status needs no scans
+# and a match card needs nothing but its match document
+MATCH_COUNTER_FIELDS = ('playerCount', 'soldCount', 'unsoldCount', 'bidCount', 'teamCount')
+
+
+def player_counter_deltas(player: Optional[Dict], sign: int = 1) -> Dict[str, int]:
+    """What one player document contributes to its match's counters (sign=-1 removes it)"""
+    if not player:
+        return {}
+    deltas = {'playerCount': sign}
+    if player.get('status') == 'SOLD':
+        deltas['soldCount'] = sign
+    elif player.get('status') == 'UNSOLD':
+        deltas['unsoldCount'] = sign
+    return deltas
+
+
+def match_exists(match_id: Optional[str]) -> bool:
+    """Whether match_id names a match document; counters are only kept on real matches"""
+    return bool(match_id) and db.collection('matches').document(match_id).get().exists
+
+
+def bump_match_counters(match_id: Optional[str], deltas: Dict[str, int], batch=None):
+    """Apply counter deltas to a match document, inside the caller's batch when given.
+
+    An update, never a merge, so a bad match id fails the write instead of
+    creating a counters-only match; callers check unknown ids with match_exists.
+    """
+    fields = {name: firestore.Increment(delta) for name, delta in deltas.items() if delta}
+    if not match_id or not fields:
+        return
+    ref = db.collection('matches').document(match_id)
+    if batch is not None:
+        batch.update(ref, fields)
+    else:
+        ref.update(fields)
+
+
+def track_player_change(before: Optional[Dict], after: Optional[Dict], batch=None):
+    """Move a player's counter contribution from its old document to its new one.
+
+    Pass before=None for a new player and after=None for a deleted one; a
+    change that doesn't touch status or matchId writes nothing.
+    """
+    by_match = {}
+    for player, sign in ((before, -1), (after, 1)):
+        if player and player.get('matchId'):
+            deltas = by_match.setdefault(player['matchId'], {})
+            for name, delta in player_counter_deltas(player, sign).items():
+                deltas[name] = deltas.get(name, 0) + delta
+    for match_id, deltas in by_match.items():
+        bump_match_counters(match_id, deltas, batch)
+
+
+def tally_match_counters(players: List[Dict], bids: List[Dict], teams: List[Dict] = ()) -> Dict[str, int]:
+    """Counters recomputed from scratch (backfill and repair)"""
+    counters = dict.fromkeys(MATCH_COUNTER_FIELDS, 0)
+    for player in players:
+        for name, delta in player_counter_deltas(player).items():
+            counters[name] += delta
+    counters['bidCount'] = len(bids)
+    counters['teamCount'] = len(teams)
+    return counters
+
+
 # ========================
 # ERROR HANDLERS
 # ========================
@@ -445,6 +518,9 @@ def register_team():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        if not match_exists(data['seasonId']):
+            return error_response(f"Match {data['seasonId']} not found", 404)
+        
         # Check if email exists in any collection (including matches for organizers)
         for collection in ['auctioneers', 'teams', 'players', 'guests', 'matches']:
             existing = db.collection(collection).where('email', '==', data['email']).stream()
@@ -475,7 +551,10 @@ def register_team():
             'profileComplete': True
         }
         
-        db.collection('teams').document(team_id).set(team_data)
+        batch = db.batch()
+        batch.set(db.collection('teams').document(team_id), team_data)
+        bump_match_counters(team_data['matchId'], {'teamCount': 1}, batch)
+        batch.commit()
         
         return success_response({
             'teamId': team_id
@@ -494,6 +573,13 @@ def register_player():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        if not match_exists(data['seasonId']):
+            return error_response(f"Match {data['seasonId']} not found", 404)
+        
+        bad_field = invalid_amount_field(data)
+        if bad_field:
+            return error_response(f"{bad_field} must be a number")
+        
         # Check if email exists in any collection (including matches for organizers)
         for collection in ['auctioneers', 'teams', 'players', 'guests', 'matches']:
             existing = db.collection(collection).where('email', '==', data['email']).stream()
@@ -532,7 +618,11 @@ def register_player():
             'profileComplete': True
         }
         
-        db.collection('players').document(player_id).set(player_data)
+        batch = db.batch()
+        batch.set(db.collection('players').document(player_id), player_data)
+        track_player_change(None, player_data, batch)
+        batch.commit()
+        store_player(player_data)
         
         return success_response({
             'playerId': player_id
@@ -680,6 +770,9 @@ def create_team():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            return error_response(f"Match {data['matchId']} not found", 404)
+        
         team_id = generate_id('team')
         team_data = {
             **data,
@@ -691,7 +784,10 @@ def create_team():
             'updatedAt': datetime.now().isoformat()
         }
         
-        db.collection('teams').document(team_id).set(team_data)
+        batch = db.batch()
+        batch.set(db.collection('teams').document(team_id), team_data)
+        bump_match_counters(team_data.get('matchId'), {'teamCount': 1}, batch)
+        batch.commit()
         
         return success_response(team_data, "Team created successfully", 201)
     except Exception as e:
@@ -711,6 +807,7 @@ def update_team(team_id):
         
         data['updatedAt'] = datetime.now().isoformat()
         team_ref.update(data)
+        update_cached_team(team_id, data)
         updated_doc = team_ref.get()
         
         return success_response(serialize_firestore_doc(updated_doc), "Team updated successfully")
@@ -722,7 +819,14 @@ def update_team(team_id):
 def delete_team(team_id):
     """Delete a team"""
     try:
-        db.collection('teams').document(team_id).delete()
+        team_ref = db.collection('teams').document(team_id)
+        team_doc = team_ref.get()
+        batch = db.batch()
+        batch.delete(team_ref)
+        if team_doc.exists and match_exists(team_doc.to_dict().get('matchId')):
+            bump_match_counters(team_doc.to_dict().get('matchId'), {'teamCount': -1}, batch)
+        batch.commit()
+        invalidate_cached_team(team_id)
         return success_response(None, "Team deleted successfully")
     except Exception as e:
         return error_response(f"Failed to delete team: {str(e)}")
@@ -794,19 +898,13 @@ def update_team_budget(team_id):
         if not team.exists:
             return error_response(f"Team {team_id} not found", 404)
         
-        current_budget = team.get('remainingBudget', 0)
-        new_budget = current_budget - amount
-        
-        if new_budget < 0:
-            return error_response("Insufficient budget", 400)
-        
-        team_ref.update({
-            'remainingBudget': new_budget,
-            'updatedAt': datetime.now().isoformat()
-        })
+        # Debit through the ledger (checks reserved funds, atomic Increment)
+        debit_budget(team.to_dict().get('matchId', ''), team_id, amount)
         
         updated = team_ref.get()
         return success_response(serialize_firestore_doc(updated), "Budget updated successfully")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
     except Exception as e:
         return error_response(f"Failed to update budget: {str(e)}")
 
@@ -835,19 +933,89 @@ def get_players():
             query = query.where('email', '==', email)
         if match_id:
             query = query.where('matchId', '==', match_id)
+        if auction_id:
+            query = query.where('auctionId', '==', auction_id)
         
         docs = query.stream()
         players = serialize_firestore_docs(docs)
         
-        # Filter by auction if specified
-        if auction_id:
-            players = [p for p in players if p.get('auctionId') == auction_id]
-        
         return success_response(players, f"Retrieved {len(players)} players")
     except Exception as e:
         return error_response(f"Failed to retrieve players: {str(e)}")
 
 
+@app.route('/api/players/search', methods=['GET'])
+def search_players():
+    """Search a season's player pool from its in-memory index (paged)"""
+    try:
+        season_id = request.args.get('seasonId') or request.args.get('matchId')
+        if not season_id:
+            return error_response("seasonId required")
+        
+        min_price = request.args.get('minPrice')
+        max_price = request.args.get('maxPrice')
+        criteria = {
+            'q': request.args.get('q'),
+            'role': request.args.get('role'),
+            'category': request.args.get('category'),
+            'status': request.args.get('status'),
+            'min_price': float(min_price) if min_price else None,
+            'max_price': float(max_price) if max_price else None
+        }
+        
+        page = max(1, int(request.args.get('page', 1)))
+        page_size = min(max(1, int(request.args.get('pageSize', 50))), 200)
+        
+        players, total = search_season_players(season_id, criteria, (page - 1) * page_size, page_size)
+        return success_response({
+            'players': players,
+            'total': total,
+            'page': page,
+            'pageSize': page_size,
+            'hasMore': page * page_size < total
+        }, f"Found {total} players")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
+    except ValueError:
+        return error_response("minPrice, maxPrice, page and pageSize must be numbers")
+    except Exception as e:
+        return error_response(f"Failed to search players: {str(e)}")
+
+
+@app.route('/api/players/pool', methods=['GET'])
+def get_player_pool():
+    """Remaining player pool sorted by base price (top-k / range), optionally grouped by role"""
+    try:
+        season_id = request.args.get('seasonId') or request.args.get('matchId')
+        if not season_id:
+            return error_response("seasonId required")
+        
+        statuses = [status.strip() for status in request.args.get('status', 'PENDING,UNSOLD').split(',') if status.strip()]
+        min_price = request.args.get('minPrice')
+        max_price = request.args.get('maxPrice')
+        limit = min(max(1, int(request.args.get('limit', 20))), 200)
+        offset = max(0, int(request.args.get('offset', 0)))
+        
+        pool = season_player_pool(
+            season_id,
+            statuses,
+            request.args.get('role'),
+            float(min_price) if min_price else None,
+            float(max_price) if max_price else None,
+            request.args.get('order', 'desc').lower() != 'asc',
+            offset,
+            limit,
+            request.args.get('groupBy') == 'role'
+        )
+        return success_response(pool, "Player pool retrieved")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
+    except ValueError:
+        return error_response("minPrice, maxPrice, limit and offset must be numbers")
+    except Exception as e:
+        return error_response(f"Failed to get player pool: {str(e)}")
+
+
 @app.route('/api/players/<player_id>', methods=['GET'])
 def get_player(player_id):
     """Get specific player by ID"""
@@ -874,6 +1042,13 @@ def create_player():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            return error_response(f"Match {data['matchId']} not found", 404)
+        
+        bad_field = invalid_amount_field(data)
+        if bad_field:
+            return error_response(f"{bad_field} must be a number")
+        
         player_id = generate_id('player')
         player_data = {
             **data,
@@ -884,7 +1059,11 @@ def create_player():
             'updatedAt': datetime.now().isoformat()
         }
         
-        db.collection('players').document(player_id).set(player_data)
+        batch = db.batch()
+        batch.set(db.collection('players').document(player_id), player_data)
+        track_player_change(None, player_data, batch)
+        batch.commit()
+        store_player(player_data)
         
         return success_response(player_data, "Player created successfully", 201)
     except Exception as e:
@@ -903,12 +1082,29 @@ def update_player(player_id):
         if not player_doc.exists:
             return error_response(f"Player {player_id} not found", 404)
         
+        bad_field = invalid_amount_field(data)
+        if bad_field:
+            return error_response(f"{bad_field} must be a number")
+        
         player_data = serialize_firestore_doc(player_doc)
         
+        # Counters move only between matches that exist
+        old_match_id = player_data.get('matchId')
+        new_match_id = data.get('matchId', old_match_id)
+        if new_match_id != old_match_id and new_match_id and not match_exists(new_match_id):
+            return error_response(f"Match {new_match_id} not found", 404)
+        old_counted = match_exists(old_match_id)
+        new_counted = old_counted if new_match_id == old_match_id else bool(new_match_id)
+        
         data['updatedAt'] = datetime.now().isoformat()
-        player_ref.update(data)
+        batch = db.batch()
+        batch.update(player_ref, data)
+        track_player_change(player_data if old_counted else None,
+                            {**player_data, **data} if new_counted else None, batch)
+        batch.commit()
         updated_doc = player_ref.get()
         updated_player = serialize_firestore_doc(updated_doc)
+        forget_prefetched_player(player_id, updated_player)
         
         # Broadcast player update to all connected clients in the season room
         match_id = player_data.get('matchId')
@@ -928,7 +1124,14 @@ def update_player(player_id):
 def delete_player(player_id):
     """Delete a player"""
     try:
-        db.collection('players').document(player_id).delete()
+        player_ref = db.collection('players').document(player_id)
+        player_doc = player_ref.get()
+        batch = db.batch()
+        batch.delete(player_ref)
+        if player_doc.exists and match_exists(player_doc.to_dict().get('matchId')):
+            track_player_change(serialize_firestore_doc(player_doc), None, batch)
+        batch.commit()
+        forget_prefetched_player(player_id)
         return success_response(None, "Player deleted successfully")
     except Exception as e:
         return error_response(f"Failed to delete player: {str(e)}")
@@ -951,26 +1154,31 @@ def sell_player(player_id):
         if not player.exists:
             return error_response(f"Player {player_id} not found", 404)
         
-        # Update player
-        player_ref.update({
+        before = player.to_dict()
+        sale = {
             'status': 'SOLD',
             'teamId': team_id,
             'soldPrice': sold_price,
             'updatedAt': datetime.now().isoformat()
-        })
-        
-        # Update team's remaining budget
-        team_ref = db.collection('teams').document(team_id)
-        team = team_ref.get()
-        if team.exists:
-            current_budget = team.get('remainingBudget', 0)
-            team_ref.update({
-                'remainingBudget': max(0, current_budget - sold_price),
-                'updatedAt': datetime.now().isoformat()
-            })
+        }
         
-        updated = player_ref.get()
-        return success_response(serialize_firestore_doc(updated), "Player sold successfully")
+        # Charge the team, update the player and its match counters in one
+        # batch; the ledger rolls back if the commit fails
+        with budget_debit(before.get('matchId', ''), team_id, sold_price, player_id) as new_balance:
+            batch = db.batch()
+            batch.update(player_ref, sale)
+            if match_exists(before.get('matchId')):
+                track_player_change(before, {**before, **sale}, batch)
+            batch.update(db.collection('teams').document(team_id), team_debit_fields(sold_price, new_balance))
+            batch.commit()
+        
+        request_match_reconcile()
+        
+        updated = serialize_firestore_doc(player_ref.get())
+        forget_prefetched_player(player_id, updated)
+        return success_response(updated, "Player sold successfully")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
     except Exception as e:
         return error_response(f"Failed to sell player: {str(e)}")
 
@@ -1165,6 +1373,9 @@ def create_bid():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        if data.get('matchId') and not match_exists(data['matchId']):
+            return error_response(f"Match {data['matchId']} not found", 404)
+        
         bid_id = generate_id('bid')
         bid_data = {
             **data,
@@ -1172,7 +1383,10 @@ def create_bid():
             'timestamp': datetime.now().isoformat()
         }
         
-        db.collection('bids').document(bid_id).set(bid_data)
+        batch = db.batch()
+        batch.set(db.collection('bids').document(bid_id), bid_data)
+        bump_match_counters(bid_data.get('matchId'), {'bidCount': 1}, batch)
+        batch.commit()
         
         return success_response(bid_data, "Bid created successfully", 201)
     except Exception as e:
@@ -1202,15 +1416,30 @@ def get_highest_bid(auction_id, player_id):
 
 @app.route('/api/bids/<auction_id>/player/<player_id>/history', methods=['GET'])
 def get_bid_history(auction_id, player_id):
-    """Get bid history for a player in an auction"""
+    """Get bid history for a player in an auction, newest first.
+    
+    Live auction lots are paged from the per-lot bid log: pass `limit`
+    and, for the next page, `before` = the seq of the last bid received.
+    """
     try:
-        docs = db.collection('bids')\
-            .where('auctionId', '==', auction_id)\
-            .where('playerId', '==', player_id)\
-            .order_by('timestamp', direction=firestore.Query.DESCENDING)\
-            .stream()
+        limit = min(int(request.args.get('limit', 50)), 500)
+        before = request.args.get('before')
         
-        bids = serialize_firestore_docs(docs)
+        query = lot_bid_log(auction_id, player_id)\
+            .order_by('seq', direction=firestore.Query.DESCENDING)
+        if before is not None:
+            query = query.start_after({'seq': int(before)})
+        
+        bids = serialize_firestore_docs(query.limit(limit).stream())
+        
+        # Lots bid on before the per-lot log existed only have `bids` records
+        if not bids and before is None:
+            docs = db.collection('bids')\
+                .where('auctionId', '==', auction_id)\
+                .where('playerId', '==', player_id)\
+                .order_by('timestamp', direction=firestore.Query.DESCENDING)\
+                .stream()
+            bids = serialize_firestore_docs(docs)
         
         return success_response(bids, f"Retrieved {len(bids)} bids")
     except Exception as e:
@@ -1272,6 +1501,7 @@ def create_match():
         match_id = generate_id('match')
         match_data = {
             **data,
+            **dict.fromkeys(MATCH_COUNTER_FIELDS, 0),
             'id': match_id,
             'status': data.get('status', 'SETUP'),
             'createdAt': datetime.now().isoformat(),
@@ -1279,6 +1509,7 @@ def create_match():
         }
         
         db.collection('matches').document(match_id).set(match_data)
+        request_match_reconcile()
         
         return success_response(match_data, "Match created successfully", 201)
     except Exception as e:
@@ -1296,9 +1527,13 @@ def update_match(match_id):
         if not match_ref.get().exists:
             return error_response(f"Match {match_id} not found", 404)
         
+        # Counters are maintained by the server, never taken from the client
+        for field in MATCH_COUNTER_FIELDS:
+            data.pop(field, None)
         data['updatedAt'] = datetime.now().isoformat()
         match_ref.update(data)
         updated_doc = match_ref.get()
+        request_match_reconcile()
         
         return success_response(serialize_firestore_doc(updated_doc), "Match updated successfully")
     except Exception as e:
@@ -1317,15 +1552,8 @@ def update_match_status(match_id):
         
         match_data = serialize_firestore_doc(match_doc)
         
-        # Get players and history
-        players_docs = db.collection('players').where('matchId', '==', match_id).stream()
-        players = [serialize_firestore_doc(p) for p in players_docs]
-        
-        bids_docs = db.collection('bids').where('matchId', '==', match_id).stream()
-        history = [serialize_firestore_doc(b) for b in bids_docs]
-        
-        # Compute actual status
-        computed_status = compute_match_status(match_data, players, history)
+        # Compute actual status (the match's counters are all it needs)
+        computed_status = compute_match_status(match_data)
         
         # Update in database
         match_ref.update({
@@ -1384,6 +1612,7 @@ def delete_match(match_id):
         auction_state_ref = db.collection('auction_states').document(match_id)
         if auction_state_ref.get().exists:
             auction_state_ref.delete()
+        discard_auction_state(match_id)
         
         # CASCADE DELETE: Delete auctioneer assignments for this match
         assignments_query = db.collection('auctioneer_assignments').where('matchId', '==', match_id).stream()
@@ -1442,63 +1671,141 @@ def update_app_state():
 # SPORTS DATA ROUTES
 # ========================
 
+# Firestore caps the values of a single 'in' filter
+FIRESTORE_IN_LIMIT = 30
+SPORTS_QUERY_WORKERS = int(os.getenv('SPORTS_QUERY_WORKERS', '8'))
+
+sports_query_executor = ThreadPoolExecutor(max_workers=SPORTS_QUERY_WORKERS, thread_name_prefix='sports-query')
+
+
+def chunked(values: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most size items"""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def fetch_grouped_by_match(collections: List[str], match_ids: List[str]) -> Dict[str, Dict[str, List[Dict]]]:
+    """Fetch child documents for many matches at once.
+
+    Runs one 'in' query per collection per chunk of match ids concurrently and
+    groups the results by matchId, replacing a query per match per collection.
+    Returns {collection: {matchId: [docs]}}.
+    """
+    grouped = {name: {} for name in collections}
+    if not match_ids:
+        return grouped
+
+    def fetch(name: str, chunk: List[str]) -> List[Dict]:
+        return serialize_firestore_docs(db.collection(name).where('matchId', 'in', chunk).stream())
+
+    futures = [
+        (name, sports_query_executor.submit(fetch, name, chunk))
+        for name in collections
+        for chunk in chunked(match_ids, FIRESTORE_IN_LIMIT)
+    ]
+    for name, future in futures:
+        bucket = grouped[name]
+        for doc in future.result():
+            bucket.setdefault(doc.get('matchId'), []).append(doc)
+    return grouped
+
+
+# Everything a match card needs: no players, teams, bids or organizer credentials
+MATCH_SUMMARY_FIELDS = ('name', 'sport', 'status', 'matchDate', 'createdAt', 'place', 'config',
+                        'organizerName', 'organizationName', *MATCH_COUNTER_FIELDS)
+
+# Lazily loaded parts of a match and the collection each one comes from
+MATCH_DETAIL_COLLECTIONS = {'players': 'players', 'teams': 'teams', 'history': 'bids'}
+
+# Kept out of the unauthenticated match reads (full /api/sports and match
+# details): credentials and the contact details of organizers, players and teams
+MATCH_PUBLIC_HIDDEN_FIELDS = ('password', 'email', 'phone')
+
+
+def group_matches_by_sport(matches: List[Dict]) -> List[Dict]:
+    """[{sportType, matches}] in first-seen order of sport"""
+    sports_by_type = {}
+    for match_data in matches:
+        sport_type = match_data.get('sport', 'CUSTOM')
+        sport_entry = sports_by_type.get(sport_type)
+        if not sport_entry:
+            sport_entry = sports_by_type[sport_type] = {
+                'sportType': sport_type,
+                'matches': []
+            }
+        sport_entry['matches'].append(match_data)
+    return list(sports_by_type.values())
+
+
 @app.route('/api/sports', methods=['GET'])
 def get_all_sports():
-    """Get all sports data aggregated from Firestore with computed auction status"""
+    """Get all sports data aggregated from Firestore.
+
+    ?shape=summary returns match cards only, projected from the match
+    documents (their counters stand in for the player, team and bid lists);
+    the default full shape embeds every match's players, teams and bids.
+    Passwords are never included.
+    """
     try:
-        sports_data = []
+        started = time.perf_counter()
+        
+        if request.args.get('shape') == 'summary':
+            matches = serialize_firestore_docs(db.collection('matches').select(MATCH_SUMMARY_FIELDS).stream())
+            metric_observe('sports.summary', time.perf_counter() - started)
+            metric_incr('sports.documentReads', len(matches))
+            return success_response(group_matches_by_sport(matches), "Sports summary retrieved successfully")
+        
+        # Get all matches, then their players, teams and bids in batched queries
+        matches = serialize_firestore_docs(db.collection('matches').stream())
+        match_ids = [m['id'] for m in matches]
+        children = fetch_grouped_by_match(['players', 'teams', 'bids'], match_ids)
+        
+        sports_matches = []
+        for match_data in matches:
+            match_id = match_data['id']
+            
+            # Status is kept current by the reconciler (see reconcile_match_statuses);
+            # players, teams, and history are attached without credentials
+            match_data = public_record(match_data, MATCH_PUBLIC_HIDDEN_FIELDS)
+            match_data['players'] = [public_record(p, MATCH_PUBLIC_HIDDEN_FIELDS) for p in children['players'].get(match_id, [])]
+            match_data['teams'] = [public_record(t, MATCH_PUBLIC_HIDDEN_FIELDS) for t in children['teams'].get(match_id, [])]
+            match_data['history'] = children['bids'].get(match_id, [])
+            sports_matches.append(match_data)
+        
+        metric_observe('sports.aggregate', time.perf_counter() - started)
+        metric_incr('sports.documentReads', len(matches) + sum(
+            len(docs) for groups in children.values() for docs in groups.values()
+        ))
+        return success_response(group_matches_by_sport(sports_matches), "Sports data retrieved successfully")
+    except Exception as e:
+        return error_response(f"Failed to retrieve sports data: {str(e)}")
+
+
+@app.route('/api/matches/<match_id>/details', methods=['GET'])
+def get_match_details(match_id):
+    """A match with its players, teams and bid history, for opening one card of the summary.
+
+    ?include= picks any of players,teams,history (default all three); the
+    parts are fetched concurrently. Passwords are never included.
+    """
+    try:
+        include = [part for part in request.args.get('include', ','.join(MATCH_DETAIL_COLLECTIONS)).split(',')
+                   if part in MATCH_DETAIL_COLLECTIONS]
         
-        # Get all matches with their associated players and teams
-        matches_docs = db.collection('matches').stream()
+        def fetch(collection: str) -> List[Dict]:
+            return serialize_firestore_docs(db.collection(collection).where('matchId', '==', match_id).stream())
         
-        for match_doc in matches_docs:
-            match_data = serialize_firestore_doc(match_doc)
-            
-            # Get players for this match
-            players_docs = db.collection('players').where('matchId', '==', match_doc.id).stream()
-            players = [serialize_firestore_doc(p) for p in players_docs]
-            
-            # Get teams for this match
-            teams_docs = db.collection('teams').where('matchId', '==', match_doc.id).stream()
-            teams = [serialize_firestore_doc(t) for t in teams_docs]
-            
-            # Get bid history for this match
-            bids_docs = db.collection('bids').where('matchId', '==', match_doc.id).stream()
-            history = [serialize_firestore_doc(b) for b in bids_docs]
-            
-            # Compute actual status based on date, players, and history
-            computed_status = compute_match_status(match_data, players, history)
-            
-            # Update status in database if it changed
-            if computed_status != match_data.get('status'):
-                db.collection('matches').document(match_doc.id).update({
-                    'status': computed_status,
-                    'updatedAt': datetime.now().isoformat()
-                })
-                match_data['status'] = computed_status
-            
-            # Add players, teams, and history to match data
-            match_data['players'] = players
-            match_data['teams'] = teams
-            match_data['history'] = history
-            
-            # Group by sport
-            sport_type = match_data.get('sport', 'CUSTOM')
-            
-            # Find or create sport entry
-            sport_entry = next((s for s in sports_data if s.get('sportType') == sport_type), None)
-            if not sport_entry:
-                sport_entry = {
-                    'sportType': sport_type,
-                    'matches': []
-                }
-                sports_data.append(sport_entry)
-            
-            sport_entry['matches'].append(match_data)
+        futures = {part: sports_query_executor.submit(fetch, MATCH_DETAIL_COLLECTIONS[part]) for part in include}
+        match_doc = db.collection('matches').document(match_id).get()
+        if not match_doc.exists:
+            return error_response(f"Match {match_id} not found", 404)
+        
+        details = public_record(serialize_firestore_doc(match_doc), MATCH_PUBLIC_HIDDEN_FIELDS)
+        for part, future in futures.items():
+            details[part] = [public_record(doc, MATCH_PUBLIC_HIDDEN_FIELDS) for doc in future.result()]
         
-        return success_response(sports_data, "Sports data retrieved successfully")
+        return success_response(details, "Match details retrieved successfully")
     except Exception as e:
-        return error_response(f"Failed to retrieve sports data: {str(e)}")
+        return error_response(f"Failed to retrieve match details: {str(e)}")
 
 
 @app.route('/api/sports', methods=['POST'])
@@ -1516,7 +1823,8 @@ def save_all_sports():
                 
                 # Save match (include organizer credentials if present)
                 # Exclude nested arrays and prevent duplicate fields
-                match_to_save = {k: v for k, v in match.items() if k not in ['players', 'teams', 'history']}
+                match_to_save = {k: v for k, v in match.items()
+                                 if k not in ['players', 'teams', 'history', *MATCH_COUNTER_FIELDS]}
                 match_to_save['sport'] = sport_type
                 match_to_save['updatedAt'] = datetime.now().isoformat()
                 
@@ -1543,7 +1851,11 @@ def save_all_sports():
                     team_id = team.get('id')
                     team_to_save = {**team, 'matchId': match_id, 'updatedAt': datetime.now().isoformat()}
                     db.collection('teams').document(team_id).set(team_to_save, merge=True)
+                    invalidate_cached_team(team_id)
         
+        # Player docs were merged blind, so recount the affected matches
+        recount_match_counters([match.get('id') for sport_data in data for match in sport_data.get('matches', [])])
+        request_match_reconcile()
         return success_response({"saved": True}, "Sports data saved successfully")
     except Exception as e:
         return error_response(f"Failed to save sports data: {str(e)}")
@@ -1597,7 +1909,7 @@ def create_log():
             'timestamp': datetime.now().isoformat()
         }
         
-        db.collection('auditLogs').document(log_id).set(log_data)
+        write_behind.set(db.collection('auditLogs').document(log_id), log_data)
         
         return success_response(log_data, "Log entry created successfully", 201)
     except Exception as e:
@@ -1849,6 +2161,8 @@ def approve_auctioneer():
             'message': 'Your application has been approved! You can now access the auction dashboard.'
         }, room=f'user_{auctioneer_id}')
         
+        refresh_season_auctioneer(season_id)
+        
         return success_response(assignment_data, "Auctioneer approved successfully")
     except Exception as e:
         return error_response(f"Failed to approve auctioneer: {str(e)}")
@@ -1942,60 +2256,1391 @@ def get_auctioneer_status(auctioneer_id):
 # LIVE AUCTION STATE MANAGEMENT
 # ========================
 
-# Global auction state (in-memory, synced with Firestore)
-auction_state = {}
+# Live auction state per season. While the process is up this is the
+# authoritative copy: bids are validated and applied here, and Firestore
+# (auction_states/{season}) is written behind the hot path.
+auction_state: Dict[str, Dict] = {}
+auction_state_lock = threading.Lock()
+
+# bidHistory in the state document is a ring of the latest bids for the UI;
+# the full history of a lot lives in auction_states/{season}/lots/{player}/bids
+BID_HISTORY_LIMIT = 20
+
+# Fields changed since the last Firestore write, per season
+dirty_auction_fields: Dict[str, set] = {}
+auction_persist_event = threading.Event()
+
+
+class AuctionError(Exception):
+    """Raised by the live auction engine when an operation is rejected"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Engine counters and timings, reported by /api/debug/engine-metrics
+engine_metrics: Dict[str, Any] = {}
+engine_metrics_lock = threading.Lock()
+
+
+def metric_incr(name: str, value: int = 1):
+    """Increment an engine counter"""
+    with engine_metrics_lock:
+        engine_metrics[name] = engine_metrics.get(name, 0) + value
+
+
+def metric_observe(name: str, seconds: float):
+    """Record a timing sample (count, total and max in milliseconds)"""
+    ms = seconds * 1000
+    with engine_metrics_lock:
+        entry = engine_metrics.setdefault(name, {'count': 0, 'totalMs': 0.0, 'maxMs': 0.0})
+        entry['count'] += 1
+        entry['totalMs'] += ms
+        entry['maxMs'] = max(entry['maxMs'], ms)
+
+
+class SeasonSequencer:
+    """Single-writer turnstile for one season.
+
+    Writers take a ticket and are admitted strictly in arrival order, so
+    bids for a season are validated, applied and broadcast one at a time
+    while other seasons proceed in parallel on their own sequencers.
+    """
+
+    def __init__(self, season_id: str):
+        self.season_id = season_id
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._now_serving = 0
+        self.max_depth = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Writers holding or waiting for the turn"""
+        return self._next_ticket - self._now_serving
+
+    @contextmanager
+    def turn(self):
+        """Hold the season's write turn; yields the seconds spent queueing"""
+        started = time.perf_counter()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.max_depth = max(self.max_depth, self.queue_depth)
+            while ticket != self._now_serving:
+                self._cond.wait()
+            waited = time.perf_counter() - started
+            self.waits += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        metric_observe('sequencer.wait', waited)
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._now_serving += 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Queue depth and wait-time summary for metrics"""
+        with self._cond:
+            return {
+                'queueDepth': self.queue_depth,
+                'maxQueueDepth': self.max_depth,
+                'turns': self.waits,
+                'avgWaitMs': round(self.total_wait * 1000 / self.waits, 3) if self.waits else 0.0,
+                'maxWaitMs': round(self.max_wait * 1000, 3)
+            }
+
+
+season_sequencers: Dict[str, SeasonSequencer] = {}
+season_sequencers_lock = threading.Lock()
+
+
+def get_season_sequencer(season_id: str) -> SeasonSequencer:
+    """Get (or create) the single-writer sequencer for a season"""
+    with season_sequencers_lock:
+        sequencer = season_sequencers.get(season_id)
+        if sequencer is None:
+            sequencer = season_sequencers[season_id] = SeasonSequencer(season_id)
+        return sequencer
+
+
+def copy_auction_state(state: Dict) -> Dict:
+    """Copy a live state so callers can't mutate the engine's lists"""
+    return {k: list(v) if isinstance(v, list) else v for k, v in state.items()}
+
+
+def load_auction_state(season_id: str) -> Optional[Dict]:
+    """Return the live state for a season, rebuilding it only on a cold start.
+
+    The event log (snapshot + replayed tail) is the most recent record; the
+    auction_states document is written behind and used when it is newer or
+    there is no log.
+    """
+    with auction_state_lock:
+        state = auction_state.get(season_id)
+    if state is not None:
+        return state
+
+    doc = db.collection('auction_states').document(season_id).get()
+    stored = serialize_firestore_doc(doc) if doc.exists else None
+    replayed = auction_event_log.replay(season_id, EVENT_REPLAY_BUDGET, remote=doc.exists)
+    candidates = [s for s in (replayed, stored) if s is not None]
+    if not candidates:
+        return None
+    recovered = max(candidates, key=lambda s: s.get('version', 0))
+
+    with auction_state_lock:
+        # Another request may have loaded it while we were reading
+        state = auction_state.get(season_id)
+        if state is not None:
+            return state
+        state = auction_state[season_id] = recovered
+
+    resume_recovered_season(season_id, state)
+    return state
+
+
+def mark_auction_state_dirty(season_id: str, fields):
+    """Queue fields for the persistence worker (caller holds auction_state_lock)"""
+    dirty_auction_fields.setdefault(season_id, set()).update(fields)
+    auction_persist_event.set()
+
+
+def flush_auction_state():
+    """Write all dirty state fields to Firestore, one merge per season"""
+    with auction_state_lock:
+        pending = {}
+        for season_id, fields in dirty_auction_fields.items():
+            state = auction_state.get(season_id)
+            if state is None:
+                continue
+            pending[season_id] = {
+                field: list(state[field]) if isinstance(state.get(field), list) else state.get(field)
+                for field in fields
+            }
+        dirty_auction_fields.clear()
+
+    for season_id, data in pending.items():
+        try:
+            db.collection('auction_states').document(season_id).set(data, merge=True)
+        except Exception as e:
+            print(f"Error persisting auction state for {season_id}: {e}")
+            with auction_state_lock:
+                if season_id in auction_state:
+                    mark_auction_state_dirty(season_id, data.keys())
+            time.sleep(1)
+
+
+def auction_state_persist_worker():
+    """Background thread that persists live state changes to Firestore"""
+    while True:
+        auction_persist_event.wait()
+        auction_persist_event.clear()
+        flush_auction_state()
+
+
+threading.Thread(target=auction_state_persist_worker, daemon=True).start()
+
+
+# Records that never decide a request's outcome (bid records, lot logs,
+# audit logs) are queued here and committed in batches off the hot path
+FIRESTORE_BATCH_LIMIT = 500
+WRITE_BEHIND_MAX_LAG = float(os.getenv('WRITE_BEHIND_MAX_LAG_MS', '250')) / 1000
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv('WRITE_BEHIND_MAX_QUEUE', '10000'))
+
+
+class WriteBehindQueue:
+    """Bounded queue of Firestore document writes with a background flusher.
+
+    A batch is committed once FIRESTORE_BATCH_LIMIT writes are waiting or
+    the oldest queued write is max_lag seconds old. When the queue is full
+    the caller writes directly, so memory stays bounded and nothing is
+    dropped. close() drains whatever is left (registered at exit).
+    """
+
+    def __init__(self, max_lag: float, max_size: int):
+        self.max_lag = max_lag
+        self.max_size = max_size
+        self._pending = deque()  # (queued_at, ref, data, merge)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self.max_depth = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Writes queued and not yet committed"""
+        return len(self._pending)
+
+    def set(self, ref, data: Dict, merge: bool = False):
+        """Queue a document set; written synchronously if the queue is full or closed"""
+        with self._cond:
+            if not self._closed and len(self._pending) < self.max_size:
+                self._pending.append((time.monotonic(), ref, data, merge))
+                self.max_depth = max(self.max_depth, len(self._pending))
+                if len(self._pending) in (1, FIRESTORE_BATCH_LIMIT):
+                    # First write starts the lag clock; a full batch goes now
+                    self._cond.notify()
+                return
+        metric_incr('writeBehind.overflow')
+        ref.set(data, merge=merge)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                while self._pending and len(self._pending) < FIRESTORE_BATCH_LIMIT and not self._closed:
+                    remaining = self._pending[0][0] + self.max_lag - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            if not self.flush():
+                time.sleep(1)
+
+    def flush(self) -> bool:
+        """Commit everything queued so far in batches; False if a commit failed"""
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    if not self._pending:
+                        return True
+                    chunk = [self._pending.popleft()
+                             for _ in range(min(FIRESTORE_BATCH_LIMIT, len(self._pending)))]
+
+                started = time.perf_counter()
+                try:
+                    batch = db.batch()
+                    for _, ref, data, merge in chunk:
+                        batch.set(ref, data, merge=merge)
+                    batch.commit()
+                except Exception as e:
+                    print(f"Error flushing {len(chunk)} queued writes: {e}")
+                    metric_incr('writeBehind.failedFlushes')
+                    with self._cond:
+                        # Put them back in front so ordering is preserved on retry
+                        self._pending.extendleft(reversed(chunk))
+                    return False
+
+                metric_observe('writeBehind.flush', time.perf_counter() - started)
+                metric_observe('writeBehind.lag', time.monotonic() - chunk[0][0])
+                metric_incr('writeBehind.written', len(chunk))
+
+    def close(self, attempts: int = 3):
+        """Stop the flusher and drain the queue"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+        for _ in range(attempts):
+            if self.flush():
+                return
+            time.sleep(1)
+        print(f"⚠️ {self.depth} queued writes could not be flushed on shutdown")
+
+    def stats(self) -> Dict:
+        """Queue depth and configuration for metrics"""
+        return {
+            'queueDepth': self.depth,
+            'maxQueueDepth': self.max_depth,
+            'maxLagMs': round(self.max_lag * 1000),
+            'maxQueueSize': self.max_size
+        }
+
+
+write_behind = WriteBehindQueue(WRITE_BEHIND_MAX_LAG, WRITE_BEHIND_MAX_QUEUE)
+
+
+def flush_on_shutdown():
+    """Drain queued writes and dirty live state before the process exits"""
+    # The event log queues onto write_behind, so it drains first
+    auction_event_log.close()
+    write_behind.close()
+    flush_auction_state()
+
+
+atexit.register(flush_on_shutdown)
+
+
+# Team snapshots per season so bids validate without a Firestore team read.
+# Loaded when a season's auction starts and kept in step by the routes that
+# write teams (close, sell, budget, update); other writers invalidate.
+TEAM_SNAPSHOT_FIELDS = ('id', 'name', 'budget', 'remainingBudget', 'matchId')
+team_cache: Dict[str, Dict[str, Dict]] = {}
+team_cache_lock = threading.Lock()
+
+
+def team_snapshot(team: Dict) -> Dict:
+    """Keep only the team fields bid validation needs.
+
+    remainingBudget is the balance; the cached budget mirrors it (the next
+    debit writes it back, so a document where the two drifted is re-synced).
+    """
+    snapshot = {field: team[field] for field in TEAM_SNAPSHOT_FIELDS if field in team}
+    balance = snapshot.get('remainingBudget', snapshot.get('budget', 0))
+    snapshot['budget'] = snapshot['remainingBudget'] = balance
+    return snapshot
+
+
+def load_team_cache(season_id: str, keep_cached: bool = False) -> int:
+    """Load snapshots of all teams in a season; returns how many were loaded.
+
+    With keep_cached, snapshots already in the cache win over the loaded
+    ones: a read path must not put back a balance a pending debit lowered.
+    """
+    docs = db.collection('teams').where('matchId', '==', season_id).stream()
+    teams = {doc.id: team_snapshot(serialize_firestore_doc(doc)) for doc in docs}
+    with team_cache_lock:
+        if keep_cached:
+            cached = team_cache.setdefault(season_id, {})
+            for team_id, team in teams.items():
+                cached.setdefault(team_id, team)
+        else:
+            team_cache[season_id] = teams
+    metric_incr('teamCache.loads')
+    return len(teams)
+
+
+def get_cached_team(season_id: str, team_id: str) -> Optional[Dict]:
+    """Team snapshot for a season, reading Firestore only on a miss"""
+    with team_cache_lock:
+        team = team_cache.get(season_id, {}).get(team_id)
+        if team is not None:
+            metric_incr('teamCache.hits')
+            return dict(team)
+
+    metric_incr('teamCache.misses')
+    doc = db.collection('teams').document(team_id).get()
+    if not doc.exists:
+        return None
+
+    with team_cache_lock:
+        # Keep a snapshot a mutation route may have installed meanwhile
+        team = team_cache.setdefault(season_id, {}).setdefault(
+            team_id, team_snapshot(serialize_firestore_doc(doc)))
+        return dict(team)
+
+
+def update_cached_team(team_id: str, fields: Dict):
+    """Apply a team write to every cached snapshot of that team"""
+    if 'matchId' in fields:
+        # The team moved season; let the next lookup reload it
+        invalidate_cached_team(team_id)
+        return
+    changes = {k: v for k, v in fields.items() if k in TEAM_SNAPSHOT_FIELDS}
+    if not changes:
+        return
+    with team_cache_lock:
+        for teams in team_cache.values():
+            if team_id in teams:
+                teams[team_id].update(changes)
+
+
+def invalidate_cached_team(team_id: str):
+    """Drop a team's snapshots (deleted or rewritten outside the engine)"""
+    with team_cache_lock:
+        for teams in team_cache.values():
+            teams.pop(team_id, None)
+    metric_incr('teamCache.invalidations')
+
+
+def invalidate_team_cache(season_id: str):
+    """Drop all team snapshots for a season"""
+    with team_cache_lock:
+        team_cache.pop(season_id, None)
+    release_season_reservations(season_id)
+
+
+# Budget ledger. A team's available balance is its cached remainingBudget
+# minus the funds held by its leading bids. A leading bid reserves its
+# amount, being outbid releases it, and a sale commits it as an atomic
+# Increment on remainingBudget, with budget set to the new balance so the
+# two fields never drift. All of it runs under team_cache_lock, so checks
+# and debits can't interleave.
+team_reservations: Dict[str, Dict[str, int]] = {}  # team_id -> {'season/player': amount}
+
+
+def reservation_key(season_id: str, player_id: str) -> str:
+    return f'{season_id}/{player_id}'
+
+
+def held_funds(team_id: str, except_key: Optional[str] = None) -> int:
+    """Funds reserved by a team's leading bids (caller holds team_cache_lock)"""
+    return sum(amount for key, amount in team_reservations.get(team_id, {}).items() if key != except_key)
+
+
+def available_budget(season_id: str, team_id: str, player_id: Optional[str] = None) -> int:
+    """Balance a team can still bid with on player_id's lot (after get_cached_team has loaded it).
+
+    The team's own hold on that lot is not counted, as reserve_budget replaces it.
+    """
+    key = reservation_key(season_id, player_id) if player_id else None
+    with team_cache_lock:
+        team = team_cache.get(season_id, {}).get(team_id, {})
+        return team.get('remainingBudget', 0) - held_funds(team_id, except_key=key)
+
+
+def reserve_budget(season_id: str, team_id: str, player_id: str, amount: int):
+    """Hold funds for a team's leading bid, replacing its earlier hold on the lot"""
+    key = reservation_key(season_id, player_id)
+    with team_cache_lock:
+        team = team_cache.get(season_id, {}).get(team_id)
+        if team is None:
+            raise AuctionError("Team not found", 404)
+        available = team.get('remainingBudget', 0) - held_funds(team_id, except_key=key)
+        if amount > available:
+            raise AuctionError(f"Insufficient budget. Available: {available}")
+        team_reservations.setdefault(team_id, {})[key] = amount
+    metric_incr('ledger.reservations')
+
+
+def release_budget(season_id: str, team_id: str, player_id: str):
+    """Release a team's hold on a lot (it was outbid)"""
+    with team_cache_lock:
+        team_reservations.get(team_id, {}).pop(reservation_key(season_id, player_id), None)
+
+
+def release_season_reservations(season_id: str):
+    """Release every hold on a season's lots (lot closed unsold, new lot, season gone)"""
+    prefix = f'{season_id}/'
+    with team_cache_lock:
+        for held in team_reservations.values():
+            for key in [key for key in held if key.startswith(prefix)]:
+                del held[key]
+
+
+@contextmanager
+def budget_debit(season_id: str, team_id: str, amount: int, player_id: Optional[str] = None):
+    """Take a debit off the cached balance and yield the new balance.
+
+    Commits the team's hold on player_id's lot if there is one. The
+    caller writes team_debit_fields() inside the block; if the block
+    raises, the balance and the hold are put back.
+    """
+    if get_cached_team(season_id, team_id) is None:
+        raise AuctionError("Team not found", 404)
+
+    key = reservation_key(season_id, player_id) if player_id else None
+    with team_cache_lock:
+        team = team_cache.get(season_id, {}).get(team_id)
+        if team is None:
+            raise AuctionError("Team not found", 404)
+        available = team.get('remainingBudget', 0) - held_funds(team_id, except_key=key)
+        if amount > available:
+            raise AuctionError(f"Insufficient budget. Available: {available}")
+        held = team_reservations.get(team_id, {}).pop(key, None) if key else None
+        new_balance = team['budget'] = team['remainingBudget'] = team.get('remainingBudget', 0) - amount
+
+    try:
+        yield new_balance
+    except Exception:
+        with team_cache_lock:
+            team['budget'] = team['remainingBudget'] = team.get('remainingBudget', 0) + amount
+            if held is not None:
+                team_reservations.setdefault(team_id, {})[key] = held
+        raise
+
+    metric_incr('ledger.debits')
+
+
+def team_debit_fields(amount: int, new_balance: int, extra: Optional[Dict] = None) -> Dict:
+    """Team document update for a debit: Increment remainingBudget, mirror the balance into budget"""
+    return {
+        **(extra or {}),
+        'budget': new_balance,
+        'remainingBudget': firestore.Increment(-amount),
+        'updatedAt': datetime.now().isoformat()
+    }
+
+
+def debit_budget(season_id: str, team_id: str, amount: int,
+                 player_id: Optional[str] = None, extra: Optional[Dict] = None) -> int:
+    """Spend a team's funds and return its new balance (one team update, plus any extra fields)"""
+    with budget_debit(season_id, team_id, amount, player_id) as new_balance:
+        db.collection('teams').document(team_id).update(team_debit_fields(amount, new_balance, extra))
+    return new_balance
+
+
+# Idempotency keys let clients retry bids and lot controls safely: a repeated
+# key gets the stored response instead of running the operation again
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '600'))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv('IDEMPOTENCY_MAX_KEYS', '10000'))
+IDEMPOTENCY_PERSIST = os.getenv('IDEMPOTENCY_PERSIST', 'false').lower() == 'true'
+
+
+class IdempotencyStore:
+    """Completed results by idempotency key, bounded and evicted after a TTL.
+
+    A duplicate that arrives while the first request is still running waits
+    for it rather than running in parallel. Only successful results are
+    stored, so a failed attempt can be retried. With persist on, results
+    are also written behind to idempotency_keys/ and survive a restart.
+    """
+
+    def __init__(self, ttl: int, max_keys: int, persist: bool):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.persist = persist
+        self._results = OrderedDict()  # key -> (expires_at, (body, status))
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        """Drop expired keys, then the oldest beyond max_keys (caller holds _lock)"""
+        while self._results:
+            key, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now and len(self._results) <= self.max_keys:
+                break
+            del self._results[key]
+
+    def _doc(self, key: str):
+        return db.collection('idempotency_keys').document(key.replace('/', '_'))
+
+    def _load(self, key: str) -> Optional[Tuple[Dict, int]]:
+        doc = self._doc(key).get()
+        if not doc.exists:
+            return None
+        stored = doc.to_dict()
+        if stored.get('expiresAt', 0) <= time.time():
+            return None
+        return stored['body'], stored['status']
+
+    def run(self, key: str, operation) -> Tuple[Tuple[Dict, int], bool]:
+        """Run operation() once per key; returns its (body, status) and whether it was replayed"""
+        while True:
+            with self._lock:
+                self._evict(time.time())
+                entry = self._results.get(key)
+                if entry is not None:
+                    metric_incr('idempotency.replays')
+                    return entry[1], True
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            waiter.wait(timeout=30)
+
+        try:
+            result = self._load(key) if self.persist else None
+            if result is not None:
+                metric_incr('idempotency.replays')
+                replayed = True
+            else:
+                result = operation()
+                replayed = False
+                if not 200 <= result[1] < 300:
+                    return result, False
+                if self.persist:
+                    write_behind.set(self._doc(key), {
+                        'body': result[0],
+                        'status': result[1],
+                        'expiresAt': time.time() + self.ttl
+                    })
+            with self._lock:
+                self._results[key] = (time.time() + self.ttl, result)
+                self._evict(time.time())
+            return result, replayed
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'keys': len(self._results), 'inFlight': len(self._inflight), 'ttlSeconds': self.ttl}
+
+
+idempotency_store = IdempotencyStore(IDEMPOTENCY_TTL, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_PERSIST)
+
+
+def idempotency_key_from_request() -> Optional[str]:
+    """Idempotency-Key header, or idempotencyKey in the JSON body"""
+    body = request.get_json(silent=True)
+    body_key = body.get('idempotencyKey') if isinstance(body, dict) else None
+    return request.headers.get('Idempotency-Key') or body_key
+
+
+def idempotent(scope: str):
+    """Replay a route's stored response when its idempotency key is repeated"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = idempotency_key_from_request()
+            if not key:
+                return fn(*args, **kwargs)
+
+            (body, status), replayed = idempotency_store.run(f'{scope}:{key}', lambda: fn(*args, **kwargs))
+            response = jsonify(body)
+            response.status_code = status
+            if replayed:
+                response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        return wrapper
+    return decorator
+
+
+# Every state transition is appended to a per-season event log, locally and
+# in Firestore, with a compact snapshot every EVENT_SNAPSHOT_EVERY events.
+# A cold start rebuilds the state from the latest snapshot plus the tail.
+EVENT_LOG_DIR = os.path.join(os.path.dirname(__file__), 'data', 'events')
+EVENT_SNAPSHOT_EVERY = int(os.getenv('EVENT_SNAPSHOT_EVERY', '200'))
+EVENT_REPLAY_BUDGET = float(os.getenv('EVENT_REPLAY_BUDGET_MS', '2000')) / 1000
+
+
+def apply_event(state: Optional[Dict], event: Dict) -> Dict:
+    """Fold one logged event into a state (the replay reducer)"""
+    if event['type'] == 'INITIALIZED':
+        return copy_auction_state(event['state'])
+    for field, value in event.get('changes', {}).items():
+        state[field] = list(value) if isinstance(value, list) else value
+    for field, items in event.get('appended', {}).items():
+        ring = state.setdefault(field, [])
+        ring.extend(items)
+        limit = state.get(f'{field}Limit')
+        if limit and len(ring) > limit:
+            del ring[:len(ring) - limit]
+    state['version'] = event['version']
+    return state
+
+
+class AuctionEventLog:
+    """Append-only log of auction state transitions with periodic snapshots.
+
+    Locally, data/events/<season>.jsonl holds the events since the last
+    snapshot and <season>.snapshot.json the snapshot itself, so replay is
+    never longer than EVENT_SNAPSHOT_EVERY events. Firestore keeps the full
+    history in auction_events/{season}/events and the latest snapshot in
+    auction_events/{season}, both written behind.
+
+    Callers only queue work while they hold auction_state_lock; a single
+    writer thread does the file I/O in queue order, so bids never wait on
+    the disk and events still land in version order.
+    """
+
+    def __init__(self, directory: str, snapshot_every: int):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._files = {}  # writer thread only
+        self._since_snapshot: Dict[str, int] = {}  # guarded by auction_state_lock
+        self._pending = deque()  # (op, season_id, payload)
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _path(self, season_id: str, suffix: str) -> str:
+        # Season ids are generated ids; anything else is kept off the path
+        name = re.sub(r'[^A-Za-z0-9_-]', '_', season_id)
+        return os.path.join(self.directory, f'{name}{suffix}')
+
+    def _file(self, season_id: str):
+        f = self._files.get(season_id)
+        if f is None:
+            f = self._files[season_id] = open(self._path(season_id, '.jsonl'), 'a', encoding='utf-8')
+        return f
+
+    def append(self, season_id: str, event: Dict, state: Dict):
+        """Queue an event (caller holds auction_state_lock, so events stay in version order)"""
+        self._enqueue('event', season_id, event)
+        metric_incr('eventLog.events')
+
+        self._since_snapshot[season_id] = self._since_snapshot.get(season_id, 0) + 1
+        if event['type'] == 'INITIALIZED' or self._since_snapshot[season_id] >= self.snapshot_every:
+            self.snapshot(season_id, state)
+
+    def snapshot(self, season_id: str, state: Dict):
+        """Queue a compact snapshot of the state as it is now (caller holds auction_state_lock)"""
+        snapshot = {'seasonId': season_id, 'version': state.get('version', 0),
+                    'state': copy_auction_state(state), 'takenAt': datetime.now().isoformat()}
+        self._since_snapshot[season_id] = 0
+        self._enqueue('snapshot', season_id, snapshot)
+
+    def _enqueue(self, op: str, season_id: str, payload: Optional[Dict] = None):
+        with self._cond:
+            if self._closed:
+                # The writer has stopped (shutdown): write in place
+                self._write(op, season_id, payload)
+                return
+            self._pending.append((op, season_id, payload))
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                op, season_id, payload = self._pending.popleft()
+                self._busy = True
+            try:
+                self._write(op, season_id, payload)
+            except Exception as e:
+                print(f"Error writing {op} for {season_id} to the event log: {e}")
+                metric_incr('eventLog.failures')
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, op: str, season_id: str, payload: Optional[Dict]):
+        """Do one queued write (writer thread, or the caller once closed)"""
+        if op == 'event':
+            f = self._file(season_id)
+            f.write(json.dumps(payload, default=str) + '\n')
+            f.flush()
+            write_behind.set(db.collection('auction_events').document(season_id)
+                             .collection('events').document(f"{payload['version']:010d}"), payload)
+        elif op == 'snapshot':
+            started = time.perf_counter()
+            path = self._path(season_id, '.snapshot.json')
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str)
+            os.replace(path + '.tmp', path)
+
+            # Events up to this version are in the snapshot now
+            self._file(season_id).close()
+            self._files[season_id] = open(self._path(season_id, '.jsonl'), 'w', encoding='utf-8')
+
+            write_behind.set(db.collection('auction_events').document(season_id), payload)
+            metric_observe('eventLog.snapshot', time.perf_counter() - started)
+        elif op == 'drop':
+            f = self._files.pop(season_id, None)
+            if f is not None:
+                f.close()
+            for suffix in ('.jsonl', '.snapshot.json'):
+                if os.path.exists(self._path(season_id, suffix)):
+                    os.remove(self._path(season_id, suffix))
+
+    @property
+    def depth(self) -> int:
+        """Writes queued and not yet on disk"""
+        return len(self._pending)
+
+    def flush(self):
+        """Wait until everything queued so far is on disk"""
+        with self._cond:
+            while self._pending or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        """Stop the writer once the queue is drained"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+
+    def _read_local(self, season_id: str) -> Tuple[Optional[Dict], List[Dict]]:
+        snapshot = None
+        snapshot_path = self._path(season_id, '.snapshot.json')
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+
+        events = []
+        log_path = self._path(season_id, '.jsonl')
+        if os.path.exists(log_path):
+            with open(log_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        break  # torn final line from a crash mid-write
+        return snapshot, events
+
+    def _read_firestore(self, season_id: str) -> Tuple[Optional[Dict], List[Dict]]:
+        season_ref = db.collection('auction_events').document(season_id)
+        doc = season_ref.get()
+        snapshot = doc.to_dict() if doc.exists else None
+        after = snapshot['version'] if snapshot else 0
+        docs = season_ref.collection('events').where('version', '>', after).order_by('version').stream()
+        return snapshot, [d.to_dict() for d in docs]
+
+    def replay(self, season_id: str, budget: float, remote: bool = True) -> Optional[Dict]:
+        """Rebuild a season from its snapshot and tail; None if there is no log or replay overruns budget.
+
+        The Firestore copy is only consulted when `remote` is set (the season
+        still exists there) and there is no local log.
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + budget
+
+        # Queued events for this season must be on disk before it is read back
+        self.flush()
+        snapshot, events = self._read_local(season_id)
+        if snapshot is None and not events and remote:
+            snapshot, events = self._read_firestore(season_id)
+        if snapshot is None and not events:
+            return None
+
+        state = copy_auction_state(snapshot['state']) if snapshot else None
+        for event in events:
+            if time.monotonic() > deadline:
+                metric_incr('eventLog.replayOverBudget')
+                print(f"⚠️ Replay for {season_id} ran over its {budget}s budget")
+                return None
+            if state is not None and event['version'] <= state.get('version', 0):
+                continue
+            if event['type'] != 'INITIALIZED' and (state is None or event['version'] != state.get('version', 0) + 1):
+                break  # gap: keep what is consistent so far
+            state = apply_event(state, event)
+
+        with auction_state_lock:
+            self._since_snapshot[season_id] = len(events)
+        metric_observe('eventLog.replay', time.perf_counter() - started)
+        return state
+
+    def drop(self, season_id: str):
+        """Forget a season's local log (the season was deleted; caller holds auction_state_lock)"""
+        self._since_snapshot.pop(season_id, None)
+        self._enqueue('drop', season_id)
+
+    def local_seasons(self) -> List[str]:
+        """Season ids with a local snapshot or log"""
+        seasons = set()
+        for name in os.listdir(self.directory):
+            if not name.endswith(('.jsonl', '.snapshot.json')):
+                continue
+            with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                first = f.readline()
+            try:
+                seasons.add(json.loads(first)['seasonId'])
+            except (ValueError, KeyError):
+                continue
+        return sorted(seasons)
+
+
+auction_event_log = AuctionEventLog(EVENT_LOG_DIR, EVENT_SNAPSHOT_EVERY)
+
+
+def record_auction_event(season_id: str, event_type: str, state: Dict, patch: Dict):
+    """Append a state transition to the season's event log (caller holds auction_state_lock)"""
+    event = {'type': event_type, 'at': datetime.now().isoformat(), **patch}
+    try:
+        auction_event_log.append(season_id, event, state)
+    except Exception as e:
+        print(f"Error recording {event_type} event for {season_id}: {e}")
+        metric_incr('eventLog.failures')
+
+
+def resume_recovered_season(season_id: str, state: Dict):
+    """Restore what lives beside the state: the leader's funds hold and the clock"""
+    if state.get('biddingActive') and state.get('leadingTeamId') and state.get('currentPlayerId'):
+        if get_cached_team(season_id, state['leadingTeamId']) is not None:
+            try:
+                reserve_budget(season_id, state['leadingTeamId'], state['currentPlayerId'], state.get('currentBid', 0))
+            except AuctionError as e:
+                print(f"Could not restore hold for {state['leadingTeamId']}: {e}")
+    if state.get('status') == 'LIVE':
+        start_auction_timer(season_id)
+        arm_lot_clock(season_id)
+
+
+def recover_local_seasons():
+    """Rebuild every season with a local event log (runs once at startup)"""
+    for season_id in auction_event_log.local_seasons():
+        try:
+            state = load_auction_state(season_id)
+            if state is not None:
+                print(f"♻️ Recovered auction {season_id} at v{state.get('version')}")
+        except Exception as e:
+            print(f"Error recovering auction {season_id}: {e}")
+
 
 def get_auction_state(season_id: str) -> Dict:
-    """Get current auction state from Firestore"""
+    """Get current auction state (from memory once the season is loaded)"""
     try:
-        doc = db.collection('auction_states').document(season_id).get()
-        if doc.exists:
-            return serialize_firestore_doc(doc)
-        return None
+        state = load_auction_state(season_id)
+        if state is None:
+            return None
+        with auction_state_lock:
+            return copy_auction_state(state)
     except Exception as e:
         print(f"Error getting auction state: {e}")
         return None
 
 
-def update_auction_state(season_id: str, updates: Dict):
-    """Update auction state in Firestore and broadcast"""
+def set_auction_state(season_id: str, state_data: Dict):
+    """Replace a season's live state and write it to Firestore in full"""
+    with auction_state_lock:
+        previous = auction_state.get(season_id) or {}
+        # Versions keep increasing across re-initialization so clients resync
+        state_data['version'] = previous.get('version', 0) + 1
+    db.collection('auction_states').document(season_id).set(state_data)
+    with auction_state_lock:
+        state = auction_state[season_id] = copy_auction_state(state_data)
+        dirty_auction_fields.pop(season_id, None)
+        record_auction_event(season_id, 'INITIALIZED', state, {
+            'seasonId': season_id,
+            'version': state['version'],
+            'state': copy_auction_state(state)
+        })
+
+
+def discard_auction_state(season_id: str):
+    """Drop a season from the engine (its Firestore document is gone)"""
+    with auction_state_lock:
+        auction_state.pop(season_id, None)
+        dirty_auction_fields.pop(season_id, None)
+    with season_sequencers_lock:
+        season_sequencers.pop(season_id, None)
+    invalidate_team_cache(season_id)
+    clear_lot_proxies(season_id)
+    with lot_prefetch_lock:
+        lot_prefetch.pop(season_id, None)
+    with season_store_lock:
+        season_store.pop(season_id, None)
+    with auction_state_lock:
+        auction_event_log.drop(season_id)
+    stop_auction_timer(season_id)
+
+
+def apply_state_changes(season_id: str, state: Dict, updates: Dict,
+                        append: Optional[Dict[str, List]] = None,
+                        event_type: str = 'STATE_UPDATED') -> Dict:
+    """Apply updates to a live state and return the versioned patch (caller holds auction_state_lock).
+
+    Only fields whose value actually changed go into the patch. A list that
+    only grew is sent as the appended items rather than the whole list.
+    Items in `append` are pushed onto ring fields (trimmed to `<field>Limit`)
+    without comparing or copying the existing list. The patch is also the
+    event recorded in the season's event log.
+    """
+    changes = {}
+    appended = {}
+    for field, items in (append or {}).items():
+        ring = state.setdefault(field, [])
+        ring.extend(items)
+        limit = state.get(f'{field}Limit')
+        if limit and len(ring) > limit:
+            del ring[:len(ring) - limit]
+        appended[field] = list(items)
+    for field, value in updates.items():
+        old = state.get(field)
+        if old == value:
+            continue
+        if isinstance(old, list) and isinstance(value, list) and len(value) > len(old) \
+                and value[:len(old)] == old:
+            appended[field] = value[len(old):]
+        else:
+            changes[field] = value
+        state[field] = list(value) if isinstance(value, list) else value
+
+    state['version'] = state.get('version', 0) + 1
+    mark_auction_state_dirty(season_id, list(changes) + list(appended) + ['version'])
+
+    patch = {'seasonId': season_id, 'version': state['version'], 'changes': changes}
+    if appended:
+        patch['appended'] = appended
+    record_auction_event(season_id, event_type, state, patch)
+    return patch
+
+
+def lot_bid_log(season_id: str, player_id: str):
+    """Append-only log of every bid on one lot, keyed by zero-padded bid seq"""
+    return db.collection('auction_states').document(season_id)\
+        .collection('lots').document(player_id).collection('bids')
+
+
+def broadcast_state_patch(season_id: str, patch: Dict):
+    """Send a compact versioned patch to the season room.
+
+    Clients apply patches in version order and ask for a full snapshot
+    (request_state_snapshot) when they see a gap.
+    """
+    socketio.emit('AUCTION_STATE_PATCH', patch, room=f'season_{season_id}')
+
+
+def update_auction_state(season_id: str, updates: Dict, event_type: str = 'STATE_UPDATED'):
+    """Update auction state in memory, persist behind the request and broadcast a patch"""
     try:
-        updates['updatedAt'] = datetime.now().isoformat()
-        db.collection('auction_states').document(season_id).set(updates, merge=True)
-        
-        # Broadcast to all connected clients in this season room
-        socketio.emit('AUCTION_STATE_UPDATE', updates, room=f'season_{season_id}')
-        
+        updates.setdefault('updatedAt', datetime.now().isoformat())
+        load_auction_state(season_id)
+
+        with auction_state_lock:
+            state = auction_state.setdefault(season_id, {'id': season_id, 'seasonId': season_id})
+            patch = apply_state_changes(season_id, state, updates, event_type=event_type)
+
+        # Broadcast only what changed to all connected clients in this season room
+        broadcast_state_patch(season_id, patch)
+
         return True
     except Exception as e:
         print(f"Error updating auction state: {e}")
         return False
 
 
-@app.route('/api/auction/state/<season_id>', methods=['GET'])
-def get_auction_state_api(season_id):
-    """Get current auction state"""
-    try:
-        state = get_auction_state(season_id)
-        if not state:
-            return error_response("Auction state not found", 404)
-        return success_response(state, "Auction state retrieved")
-    except Exception as e:
-        return error_response(f"Failed to get auction state: {str(e)}")
+def validate_bid(state: Optional[Dict], amount):
+    """Raise AuctionError if a bid can't be accepted (caller holds auction_state_lock)"""
+    if state is None:
+        raise AuctionError("Auction state not found", 404)
 
+    if state.get('status') != 'LIVE':
+        raise AuctionError("Auction is not live")
 
-@app.route('/api/auction/initialize', methods=['POST'])
-def initialize_auction():
-    """Initialize auction state for a season - Admin only"""
-    try:
-        data = request.get_json()
-        
-        required_fields = ['seasonId', 'startTime', 'endTime']
-        if not all(field in data for field in required_fields):
-            return error_response(f"Missing required fields: {required_fields}")
-        
+    if not state.get('biddingActive'):
+        raise AuctionError("No player is currently up for bidding")
+
+    # The lot's clock ran out; its close job is about to run
+    lot_ends_at = state.get('lotEndsAt')
+    if lot_ends_at and seconds_until(lot_ends_at) <= 0:
+        raise AuctionError("Bidding on this player has closed")
+
+    current_bid = state.get('currentBid', 0)
+    if amount <= current_bid:
+        raise AuctionError(f"Bid must be higher than current bid of {current_bid}")
+
+
+def check_bid(season_id: str, amount):
+    """Fast-fail a bid against the live state before doing any other work"""
+    with auction_state_lock:
+        validate_bid(auction_state.get(season_id), amount)
+
+
+def apply_bid(season_id: str, team_id: str, team_name: str, amount,
+              extra: Optional[Dict] = None) -> Tuple[Dict, str, Dict]:
+    """Validate and apply a bid atomically; returns the bid entry, player id and state patch"""
+    now = datetime.now().isoformat()
+
+    with auction_state_lock:
+        state = auction_state.get(season_id)
+        # Re-check under the lock: another bid may have landed since check_bid
+        validate_bid(state, amount)
+
+        # Hold the funds before anything changes (raises if the team can't cover
+        # the bid); the team it displaces gets its hold back
+        player_id = state.get('currentPlayerId')
+        previous_leader = state.get('leadingTeamId')
+        reserve_budget(season_id, team_id, player_id, amount)
+        if previous_leader and previous_leader != team_id:
+            release_budget(season_id, previous_leader, player_id)
+
+        # Accepted bids get a season-wide, monotonically increasing sequence
+        seq = state.get('bidSeq', 0) + 1
+        bid_entry = {
+            'seq': seq,
+            'teamId': team_id,
+            'teamName': team_name,
+            'amount': amount,
+            'timestamp': now,
+            **(extra or {})
+        }
+
+        updates = {
+            'bidSeq': seq,
+            'currentBid': amount,
+            'leadingTeamId': team_id,
+            'leadingTeamName': team_name,
+            'lotBidCount': state.get('lotBidCount', 0) + 1,
+            'lastBidTime': now,
+            'updatedAt': now
+        }
+        # Each bid resets the lot's countdown (and buys extra time in the final seconds)
+        updates.update(lot_clock_after_bid(state))
+        # Constant cost per bid: the ring is bounded, the full log is appended elsewhere
+        patch = apply_state_changes(season_id, state, updates, append={'bidHistory': [bid_entry]},
+                                    event_type='BID')
+
+        return bid_entry, player_id, patch
+
+
+def publish_bid(season_id: str, player_id: str, bid_entry: Dict, patch: Dict):
+    """Broadcast an accepted bid and its state patch (caller holds the season's turn)"""
+    # Broadcast to ALL dashboards - EVERYONE SEES SAME BID
+    bid_broadcast = {'seasonId': season_id, 'playerId': player_id, **bid_entry}
+    if patch['changes'].get('lotEndsAt'):
+        bid_broadcast['lotEndsAtMs'] = epoch_ms(patch['changes']['lotEndsAt'])
+
+    print(f'💰 Broadcasting NEW_BID to season_{season_id}: {bid_entry["teamName"]} bid {bid_entry["amount"]} (seq {bid_entry["seq"]})')
+    socketio.emit('NEW_BID', bid_broadcast, room=f'season_{season_id}')
+
+    # Also send the state patch (changed fields only)
+    broadcast_state_patch(season_id, patch)
+
+
+def persist_bid(season_id: str, player_id: str, bid_entry: Dict):
+    """Queue the bid record and the lot's bid log entry (written behind)"""
+    bid_id = generate_id('bid')
+    bid_data = {'id': bid_id, 'seasonId': season_id, 'matchId': season_id, 'playerId': player_id, **bid_entry}
+    write_behind.set(db.collection('bids').document(bid_id), bid_data)
+    write_behind.set(lot_bid_log(season_id, player_id).document(f"{bid_entry['seq']:010d}"), bid_data)
+    # A merge rather than an update: a failed update would stall the queue,
+    # and initialize_auction has already checked the match exists
+    write_behind.set(db.collection('matches').document(season_id), {'bidCount': firestore.Increment(1)}, merge=True)
+
+
+# Proxy (maximum) bids for each season's current lot, kept in memory and never
+# broadcast: {season_id: {'playerId': ..., 'bids': {team_id: {...}}}}.
+# Guarded by auction_state_lock; changed only inside the season's turn.
+lot_proxies: Dict[str, Dict] = {}
+proxy_order = 0
+
+
+def default_bid_increment(base_price) -> int:
+    """Minimum raise for a lot when the auctioneer doesn't set one"""
+    return max(1, int(base_price) // 20)
+
+
+def clear_lot_proxies(season_id: str):
+    """Forget proxy bids when the season's lot changes"""
+    with auction_state_lock:
+        lot_proxies.pop(season_id, None)
+
+
+def register_proxy_bid(season_id: str, team_id: str, team_name: str, max_amount):
+    """Record a team's maximum for the current lot (caller holds the season's turn)"""
+    global proxy_order
+    with auction_state_lock:
+        state = auction_state.get(season_id)
+        validate_bid(state, max_amount)
+        player_id = state.get('currentPlayerId')
+        increment = state.get('bidIncrement') or default_bid_increment(state.get('currentBid', 0))
+        if state.get('leadingTeamId') != team_id and max_amount < state.get('currentBid', 0) + increment:
+            raise AuctionError(f"Maximum must be at least {state.get('currentBid', 0) + increment}")
+
+        lot = lot_proxies.get(season_id)
+        if lot is None or lot['playerId'] != player_id:
+            lot = lot_proxies[season_id] = {'playerId': player_id, 'bids': {}}
+        existing = lot['bids'].get(team_id)
+        if existing and max_amount <= existing['maxAmount']:
+            raise AuctionError(f"Maximum can only be raised (current {existing['maxAmount']})")
+
+        # Ties go to the earliest registration, so a raise keeps its place
+        proxy_order += 1
+        lot['bids'][team_id] = {
+            'teamName': team_name,
+            'maxAmount': max_amount,
+            'order': existing['order'] if existing else proxy_order
+        }
+    metric_incr('proxy.registered')
+
+
+def bidding_power(season_id: str, team_id: str, player_id: str, max_amount) -> int:
+    """A proxy can't bid beyond what the team could actually pay"""
+    key = reservation_key(season_id, player_id)
+    with team_cache_lock:
+        team = team_cache.get(season_id, {}).get(team_id)
+        if team is None:
+            return 0
+        return min(max_amount, team.get('remainingBudget', 0) - held_funds(team_id, except_key=key))
+
+
+def resolve_proxy_bids(season_id: str) -> Optional[Tuple[Dict, str, Dict]]:
+    """Settle the lot's proxy bids in one step (caller holds the season's turn).
+
+    eBay-style: the highest effective maximum leads at one increment over
+    the best competing maximum (or the standing manual bid), capped at its
+    own maximum. Exhausted proxies are dropped. The outcome is applied as
+    a single bid whose 'ladder' lists the outbid maximums in ascending
+    order and then the winning price. Returns what apply_bid returns, or
+    None when the leader doesn't change and the price doesn't move.
+    """
+    with auction_state_lock:
+        state = auction_state.get(season_id)
+        lot = lot_proxies.get(season_id)
+        if not state or not lot or not state.get('biddingActive') or lot['playerId'] != state.get('currentPlayerId'):
+            return None
+        player_id = lot['playerId']
+        current_bid = state.get('currentBid', 0)
+        leader = state.get('leadingTeamId')
+        increment = state.get('bidIncrement') or default_bid_increment(current_bid)
+        proxies = dict(lot['bids'])
+
+    # Effective maximums, best first (earliest registration wins ties)
+    live = []
+    for team_id, proxy in proxies.items():
+        power = bidding_power(season_id, team_id, player_id, proxy['maxAmount'])
+        if power > current_bid or team_id == leader:
+            live.append((power, proxy['order'], team_id, proxy))
+    live.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    with auction_state_lock:
+        # Proxies that can no longer beat the standing bid are spent
+        for team_id in set(proxies) - {entry[2] for entry in live}:
+            lot['bids'].pop(team_id, None)
+
+    if not live:
+        return None
+
+    top_power, _, winner, winner_proxy = live[0]
+    rivals = [entry for entry in live[1:] if entry[0] > current_bid]
+    competing = [entry[0] for entry in rivals]
+    if leader and leader != winner and leader not in proxies:
+        competing.append(current_bid)  # standing manual bid
+
+    if winner == leader:
+        if not competing:
+            return None
+        price = min(top_power, max(competing) + increment)
+    elif competing:
+        price = min(top_power, max(competing) + increment)
+    else:
+        price = min(top_power, current_bid + increment)
+    if price <= current_bid:
+        return None
+
+    ladder = [{'teamId': team_id, 'teamName': proxy['teamName'], 'amount': power}
+              for power, _, team_id, proxy in reversed(rivals)]
+    ladder.append({'teamId': winner, 'teamName': winner_proxy['teamName'], 'amount': price})
+
+    with auction_state_lock:
+        for _, _, team_id, _ in rivals:
+            lot['bids'].pop(team_id, None)
+
+    metric_incr('proxy.resolutions')
+    metric_incr('proxy.stepsCollapsed', max(0, (price - current_bid) // increment - 1))
+    return apply_bid(season_id, winner, winner_proxy['teamName'], price,
+                     extra={'proxy': True, 'ladder': ladder})
+
+
+@app.route('/api/auction/state/<season_id>', methods=['GET'])
+def get_auction_state_api(season_id):
+    """Get current auction state"""
+    try:
+        state = get_auction_state(season_id)
+        if not state:
+            return error_response("Auction state not found", 404)
+        return success_response(state, "Auction state retrieved")
+    except Exception as e:
+        return error_response(f"Failed to get auction state: {str(e)}")
+
+
+@app.route('/api/debug/engine-metrics', methods=['GET'])
+def get_engine_metrics():
+    """DEBUG: Live engine counters, timings and per-season sequencer stats"""
+    try:
+        with engine_metrics_lock:
+            metrics = {k: dict(v) if isinstance(v, dict) else v for k, v in engine_metrics.items()}
+
+        with season_sequencers_lock:
+            sequencers = dict(season_sequencers)
+
+        with team_cache_lock:
+            team_cache_sizes = {season_id: len(teams) for season_id, teams in team_cache.items()}
+            reserved = {team_id: held_funds(team_id) for team_id, held in team_reservations.items() if held}
+
+        seasons = {}
+        for season_id, sequencer in sequencers.items():
+            seasons[season_id] = sequencer.stats()
+            with auction_state_lock:
+                seasons[season_id]['lastBidSeq'] = auction_state.get(season_id, {}).get('bidSeq', 0)
+
+        return success_response({
+            'metrics': metrics,
+            'seasons': seasons,
+            'writeBehind': write_behind.stats(),
+            'eventLogDepth': auction_event_log.depth,
+            'teamCache': team_cache_sizes,
+            'reservedFunds': reserved,
+            'idempotency': idempotency_store.stats(),
+            'scheduler': auction_scheduler.stats(),
+            'seasonStore': season_store_reports(),
+            'matchStatus': dict(match_reconcile_report)
+        }, "Engine metrics retrieved")
+    except Exception as e:
+        return error_response(f"Failed to get engine metrics: {str(e)}")
+
+
+def benchmark_player(i: int) -> Dict:
+    """A player shaped like register_player's document"""
+    return {
+        'id': f'player_{i}', 'name': f'Player {i}', 'email': f'player{i}@example.com',
+        'phone': f'98{i:08d}', 'role': 'PLAYER', 'roleId': ('batsman', 'bowler', 'all-rounder', 'wicket-keeper')[i % 4],
+        'basePrice': float(100000 + (i % 20) * 50000), 'isOverseas': i % 7 == 0, 'status': 'PENDING',
+        'matchId': 'benchmark_season', 'age': 18 + i % 20, 'nationality': 'India', 'dateOfBirth': '2000-01-01',
+        'gender': 'Male', 'battingStyle': 'Right-hand', 'bowlingStyle': 'Right-arm medium',
+        'experienceLevel': 'Intermediate', 'previousTeams': '', 'playerCategory': 'Uncapped',
+        'availability': 'Yes', 'imageUrl': f'https://storage.example.com/players/{i}.jpg', 'bio': '',
+        'stats': '', 'createdAt': '2025-01-01T00:00:00', 'updatedAt': '2025-01-01T00:00:00',
+        'profileComplete': True
+    }
+
+
+def traced_build(build) -> Tuple[Any, int, float]:
+    """Run build() under tracemalloc; returns its result, bytes still held and seconds taken"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - started
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return result, held, elapsed
+
+
+@app.route('/api/debug/season-store-benchmark', methods=['GET'])
+def season_store_benchmark():
+    """DEBUG: Memory per player as Firestore-style dicts vs PlayerRecords"""
+    try:
+        count = min(int(request.args.get('players', 10000)), 100000)
+        # One JSON round trip per player, like decoding a Firestore document
+        encoded = [json.dumps(benchmark_player(i)) for i in range(count)]
+        
+        dicts, dict_bytes, dict_seconds = traced_build(lambda: [json.loads(doc) for doc in encoded])
+        records, record_bytes, record_seconds = traced_build(
+            lambda: [PlayerRecord(json.loads(doc)) for doc in encoded])
+        started = time.perf_counter()
+        for record in records:
+            record.to_dict()
+        serialize_seconds = time.perf_counter() - started
+        
+        return success_response({
+            'players': count,
+            'dictBytesPerPlayer': dict_bytes // count,
+            'recordBytesPerPlayer': record_bytes // count,
+            'savedPercent': round(100 * (1 - record_bytes / dict_bytes), 1) if dict_bytes else 0,
+            'dictBuildMs': round(dict_seconds * 1000, 1),
+            'recordBuildMs': round(record_seconds * 1000, 1),
+            'serializeAllMs': round(serialize_seconds * 1000, 1)
+        }, "Season store benchmark complete")
+    except Exception as e:
+        return error_response(f"Failed to run benchmark: {str(e)}")
+
+
+@app.route('/api/auction/warmup', methods=['POST'])
+def warmup_season():
+    """Preload a season's players, teams and auctioneer now and report the load"""
+    try:
+        data = request.get_json()
+        season_id = data.get('seasonId')
+        
+        if not season_id:
+            return error_response("seasonId required")
+        
+        return success_response(preload_season(season_id), "Season preloaded")
+    except Exception as e:
+        return error_response(f"Failed to preload season: {str(e)}")
+
+
+@app.route('/api/auction/initialize', methods=['POST'])
+def initialize_auction():
+    """Initialize auction state for a season - Admin only"""
+    try:
+        data = request.get_json()
+        
+        required_fields = ['seasonId', 'startTime', 'endTime']
+        if not all(field in data for field in required_fields):
+            return error_response(f"Missing required fields: {required_fields}")
+        
         season_id = data['seasonId']
         
+        # Lots and bids keep counters on the season's match document
+        if not match_exists(season_id):
+            return error_response(f"Match {season_id} not found", 404)
+        
         # Check if auctioneer is approved
         assignments = db.collection('auctioneer_assignments')\
             .where('seasonId', '==', season_id)\
@@ -2022,7 +3667,10 @@ def initialize_auction():
             'updatedAt': datetime.now().isoformat()
         }
         
-        db.collection('auction_states').document(season_id).set(auction_state_data)
+        set_auction_state(season_id, auction_state_data)
+        
+        # Warm the season's players, teams and auctioneer before the first lot
+        schedule_season_preload(season_id)
         
         # Broadcast to all dashboards
         socketio.emit('AUCTION_INITIALIZED', auction_state_data, room=f'season_{season_id}')
@@ -2054,10 +3702,11 @@ def start_auction():
             'startedAt': datetime.now().isoformat()
         }
         
-        update_auction_state(season_id, updates)
+        update_auction_state(season_id, updates, 'AUCTION_STARTED')
         
-        # Get updated state
-        updated_state = get_auction_state(season_id)
+        # Snapshot the season's teams so bids validate from memory
+        load_team_cache(season_id)
+        schedule_lot_prefetch(season_id)
         
         # Broadcast to all dashboards with status
         socketio.emit('AUCTION_STARTED', {
@@ -2067,12 +3716,9 @@ def start_auction():
             'timestamp': datetime.now().isoformat()
         }, room=f'season_{season_id}')
         
-        # Also send full state update
-        if updated_state:
-            socketio.emit('AUCTION_STATE_UPDATE', updated_state, room=f'season_{season_id}')
-        
-        # Start server timer
+        # Start server timer and tell clients when it runs out
         start_auction_timer(season_id)
+        broadcast_deadline(season_id)
         
         return success_response(None, "Auction started successfully")
     except Exception as e:
@@ -2086,15 +3732,26 @@ def pause_auction():
         data = request.get_json()
         season_id = data.get('seasonId')
         
+        state = get_auction_state(season_id)
+        if not state:
+            return error_response("Auction not found", 404)
+        
         updates = {
             'status': 'PAUSED',
             'pausedAt': datetime.now().isoformat()
         }
-        
-        update_auction_state(season_id, updates)
-        
-        # Get updated state
-        updated_state = get_auction_state(season_id)
+        # The clock stops while paused; resume restarts it from what was left
+        if state.get('endTime'):
+            updates['pausedRemainingMs'] = max(0, int(seconds_until(state['endTime']) * 1000))
+        if state.get('lotEndsAt'):
+            updates['lotRemainingMs'] = max(0, int(seconds_until(state['lotEndsAt']) * 1000))
+            updates['lotEndsAt'] = None
+        
+        with get_season_sequencer(season_id).turn():
+            stop_auction_timer(season_id)
+            update_auction_state(season_id, updates, 'AUCTION_PAUSED')
+        broadcast_deadline(season_id)
+        broadcast_lot_countdown(season_id)
         
         socketio.emit('AUCTION_PAUSED', {
             'seasonId': season_id,
@@ -2102,10 +3759,6 @@ def pause_auction():
             'timestamp': datetime.now().isoformat()
         }, room=f'season_{season_id}')
         
-        # Also send full state update
-        if updated_state:
-            socketio.emit('AUCTION_STATE_UPDATE', updated_state, room=f'season_{season_id}')
-        
         return success_response(None, "Auction paused")
     except Exception as e:
         return error_response(f"Failed to pause auction: {str(e)}")
@@ -2118,15 +3771,28 @@ def resume_auction():
         data = request.get_json()
         season_id = data.get('seasonId')
         
+        state = get_auction_state(season_id)
+        if not state:
+            return error_response("Auction not found", 404)
+        
+        now = datetime.now()
         updates = {
             'status': 'LIVE',
-            'resumedAt': datetime.now().isoformat()
+            'resumedAt': now.isoformat()
         }
-        
-        update_auction_state(season_id, updates)
-        
-        # Get updated state
-        updated_state = get_auction_state(season_id)
+        if state.get('pausedRemainingMs') is not None:
+            updates['endTime'] = (now + timedelta(milliseconds=state['pausedRemainingMs'])).isoformat()
+            updates['pausedRemainingMs'] = None
+        if state.get('lotRemainingMs') is not None:
+            updates['lotEndsAt'] = (now + timedelta(milliseconds=state['lotRemainingMs'])).isoformat()
+            updates['lotRemainingMs'] = None
+        
+        with get_season_sequencer(season_id).turn():
+            update_auction_state(season_id, updates, 'AUCTION_RESUMED')
+            start_auction_timer(season_id)
+            arm_lot_clock(season_id)
+        broadcast_deadline(season_id)
+        broadcast_lot_countdown(season_id)
         
         socketio.emit('AUCTION_RESUMED', {
             'seasonId': season_id,
@@ -2134,10 +3800,6 @@ def resume_auction():
             'timestamp': datetime.now().isoformat()
         }, room=f'season_{season_id}')
         
-        # Also send full state update
-        if updated_state:
-            socketio.emit('AUCTION_STATE_UPDATE', updated_state, room=f'season_{season_id}')
-        
         return success_response(None, "Auction resumed")
     except Exception as e:
         return error_response(f"Failed to resume auction: {str(e)}")
@@ -2155,7 +3817,9 @@ def end_auction():
             'endedAt': datetime.now().isoformat()
         }
         
-        update_auction_state(season_id, updates)
+        stop_auction_timer(season_id)
+        update_auction_state(season_id, updates, 'AUCTION_ENDED')
+        broadcast_deadline(season_id)
         
         socketio.emit('AUCTION_ENDED', {
             'seasonId': season_id,
@@ -2171,7 +3835,575 @@ def end_auction():
 # LIVE BIDDING SYSTEM
 # ========================
 
+# Player documents for the next lots in the season's playerQueue, read in
+# one get_all() while the current lot is running so opening the next lot
+# doesn't wait on Firestore
+LOT_PREFETCH_DEPTH = int(os.getenv('LOT_PREFETCH_DEPTH', '3'))
+lot_prefetch: Dict[str, Dict[str, Dict]] = {}
+lot_prefetch_lock = threading.Lock()
+preload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='preload')
+
+# Season preload: every player in the season and its approved auctioneer,
+# bulk-loaded on initialize (or /api/auction/warmup) so lots open without a
+# Firestore read. Teams go into team_cache, which the ledger already keeps
+# current. Passwords are never held here.
+season_store: Dict[str, Dict] = {}
+season_store_lock = threading.Lock()
+SEASON_STORE_PRIVATE_FIELDS = ('password',)
+
+# Players are held as PlayerRecords rather than Firestore dicts. A record
+# is a tuple of values; its keys live in a shape shared by every record
+# with the same fields, enum-like strings are interned and amounts are
+# ints. Dicts are only built when a record is serialized.
+PLAYER_ENUM_FIELDS = frozenset({'status', 'role', 'roleId', 'playerCategory', 'gender', 'availability',
+                                'battingStyle', 'bowlingStyle', 'experienceLevel', 'nationality', 'matchId'})
+PLAYER_AMOUNT_FIELDS = frozenset({'basePrice', 'soldAmount', 'soldPrice'})
+record_shapes: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Dict[str, int]]] = {}
+
+
+def as_amount(value):
+    """Whole-number amounts as int (what bids and budgets use); anything else unchanged"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return value
+    return value
+
+
+def invalid_amount_field(data: Dict) -> Optional[str]:
+    """The first player amount field in a request that isn't a number, if any"""
+    for field in sorted(PLAYER_AMOUNT_FIELDS):
+        value = data.get(field)
+        if value is None or value == '':
+            continue
+        if isinstance(value, bool):
+            return field
+        try:
+            float(value)
+        except (TypeError, ValueError):
+            return field
+    return None
+
+
+def compact_value(field: str, value):
+    if field in PLAYER_AMOUNT_FIELDS:
+        return as_amount(value)
+    if field in PLAYER_ENUM_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def record_shape(fields) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """The shared (keys, index) pair for a set of fields"""
+    keys = tuple(sys.intern(field) for field in sorted(fields))
+    shape = record_shapes.get(keys)
+    if shape is None:
+        shape = record_shapes.setdefault(keys, (keys, {field: i for i, field in enumerate(keys)}))
+    return shape
+
+
+class PlayerRecord:
+    """Compact in-memory player for the season store"""
+
+    __slots__ = ('_shape', '_values')
+
+    def __init__(self, data: Dict):
+        self._shape = record_shape(data)
+        self._values = tuple(compact_value(field, data[field]) for field in self._shape[0])
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.get('id')
+
+    def get(self, field: str, default=None):
+        i = self._shape[1].get(field)
+        return default if i is None else self._values[i]
+
+    def update(self, fields: Dict):
+        merged = self.to_dict()
+        merged.update(fields)
+        PlayerRecord.__init__(self, merged)
+
+    def to_dict(self) -> Dict:
+        return dict(zip(self._shape[0], self._values))
+
+
+MAX_KEY = '\U0010ffff'  # sorts after any id or word, for bisect upper bounds
+
+
+class PlayerSearchIndex:
+    """Per-season player search: name prefix, role/category/status, price range.
+
+    Each word of a player's name (and the full name) sits in a sorted list
+    of (word, player_id), so a prefix is one bisect range. Base prices sit
+    in a sorted list of (price, player_id). Role, category and status map
+    each lowercased value to a set of ids. The pool list keeps
+    (status, role, price, player_id) sorted, so one status/role group in a
+    price range is a bisect slice and top-k across groups is a lazy merge
+    of slices. add() and remove() touch only the player's own entries;
+    nothing is rebuilt. Callers hold season_store_lock.
+    """
+
+    FILTER_FIELDS = {'role': 'roleId', 'category': 'playerCategory', 'status': 'status'}
+
+    def __init__(self):
+        self._words: List[Tuple[str, str]] = []
+        self._prices: List[Tuple[Any, str]] = []
+        self._pool: List[Tuple[str, str, Any, str]] = []
+        self._filters: Dict[str, Dict[str, set]] = {name: {} for name in self.FILTER_FIELDS}
+        self._entries: Dict[str, Tuple] = {}  # player_id -> (words, price, filter values, sort name)
+
+    @classmethod
+    def build(cls, players) -> 'PlayerSearchIndex':
+        """Index a whole pool with one sort per list"""
+        index = cls()
+        for player in players:
+            index._register(player, index._words.append, index._prices.append, index._pool.append)
+        index._words.sort()
+        index._prices.sort()
+        index._pool.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _register(self, player, add_word, add_price, add_pool):
+        player_id = player.get('id')
+        name = str(player.get('name') or '').lower()
+        words = set(name.split())
+        if name:
+            words.add(name)
+        price = player.get('basePrice')
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            price = None
+        values = tuple(str(player.get(field)).lower() if player.get(field) is not None else None
+                       for field in self.FILTER_FIELDS.values())
+
+        for word in words:
+            add_word((word, player_id))
+        if price is not None:
+            add_price((price, player_id))
+            add_pool(self._pool_key(values, price, player_id))
+        for filter_name, value in zip(self.FILTER_FIELDS, values):
+            if value is not None:
+                self._filters[filter_name].setdefault(value, set()).add(player_id)
+        self._entries[player_id] = (tuple(words), price, values, name)
+
+    def add(self, player):
+        """Index a player, replacing its previous entries"""
+        self.remove(player.get('id'))
+        self._register(player, lambda item: bisect.insort(self._words, item),
+                       lambda item: bisect.insort(self._prices, item),
+                       lambda item: bisect.insort(self._pool, item))
+
+    def remove(self, player_id: str):
+        entry = self._entries.pop(player_id, None)
+        if entry is None:
+            return
+        words, price, values, _ = entry
+        for word in words:
+            self._discard(self._words, (word, player_id))
+        if price is not None:
+            self._discard(self._prices, (price, player_id))
+            self._discard(self._pool, self._pool_key(values, price, player_id))
+        for filter_name, value in zip(self.FILTER_FIELDS, values):
+            if value is not None:
+                ids = self._filters[filter_name].get(value)
+                if ids is not None:
+                    ids.discard(player_id)
+                    if not ids:
+                        del self._filters[filter_name][value]
+
+    @staticmethod
+    def _pool_key(values: Tuple, price, player_id: str) -> Tuple[str, str, Any, str]:
+        role, _, status = values
+        return (status or '', role or '', price, player_id)
+
+    @staticmethod
+    def _discard(items: List, item):
+        i = bisect.bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    def search(self, q: Optional[str] = None, role: Optional[str] = None, category: Optional[str] = None,
+               status: Optional[str] = None, min_price=None, max_price=None) -> List[str]:
+        """Ids of matching players, ordered by name"""
+        candidates = None
+
+        def narrow(ids):
+            nonlocal candidates
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+
+        # Cheapest criteria first: set lookups, then bisect ranges
+        for filter_name, value in (('status', status), ('role', role), ('category', category)):
+            if value:
+                narrow(self._filters[filter_name].get(value.lower(), ()))
+        if min_price is not None or max_price is not None:
+            lo = bisect.bisect_left(self._prices, (min_price,)) if min_price is not None else 0
+            hi = bisect.bisect_right(self._prices, (max_price, MAX_KEY)) if max_price is not None else len(self._prices)
+            narrow(player_id for _, player_id in self._prices[lo:hi])
+        if q and q.strip():
+            prefix = q.strip().lower()
+            lo = bisect.bisect_left(self._words, (prefix,))
+            hi = bisect.bisect_left(self._words, (prefix + MAX_KEY,))
+            narrow(player_id for _, player_id in self._words[lo:hi])
+
+        ids = self._entries.keys() if candidates is None else candidates
+        return sorted(ids, key=lambda player_id: (self._entries[player_id][3], player_id))
+
+    def pool_roles(self) -> List[str]:
+        """Role groups in the pool ('' for players without one)"""
+        return sorted(set(self._filters['role']) | {''})
+
+    def _pool_range(self, status: str, role: str, min_price=None, max_price=None) -> Tuple[int, int]:
+        """Bounds of one status/role group within a price range (two bisects)"""
+        if min_price is None:
+            lo = bisect.bisect_left(self._pool, (status, role))
+        else:
+            lo = bisect.bisect_left(self._pool, (status, role, min_price))
+        if max_price is None:
+            hi = bisect.bisect_left(self._pool, (status, role + '\x00'))
+        else:
+            hi = bisect.bisect_right(self._pool, (status, role, max_price, MAX_KEY))
+        return lo, max(lo, hi)
+
+    def _pool_walk(self, lo: int, hi: int, descending: bool):
+        steps = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        return (self._pool[i] for i in steps)
+
+    def pool_slice(self, statuses: List[str], roles: List[str], min_price=None, max_price=None,
+                   descending: bool = True, offset: int = 0, limit: int = 20) -> Tuple[List[str], int]:
+        """Ids of one page of the pool by base price, and the total in range.
+
+        Costs two bisects per status/role group plus offset + limit steps;
+        the pool itself is never scanned.
+        """
+        ranges = [self._pool_range(status.lower(), role.lower(), min_price, max_price)
+                  for status in statuses for role in roles]
+        total = sum(hi - lo for lo, hi in ranges)
+        merged = heapq.merge(*(self._pool_walk(lo, hi, descending) for lo, hi in ranges if hi > lo),
+                             key=lambda entry: (entry[2], entry[3]), reverse=descending)
+        return [entry[3] for entry in islice(merged, offset, offset + limit)], total
+
+
+def public_record(data: Dict, hidden=SEASON_STORE_PRIVATE_FIELDS) -> Dict:
+    return {k: v for k, v in data.items() if k not in hidden}
+
+
+def approx_size(obj, seen: Optional[set] = None) -> int:
+    """Deep sys.getsizeof over dicts, sequences and slotted records (shared objects counted once)"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, seen) + approx_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(approx_size(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(approx_size(getattr(obj, slot), seen) for slot in obj.__slots__)
+    return size
+
+
+def load_season_auctioneer(season_id: str) -> Optional[Dict]:
+    """The season's approved assignment joined with the auctioneer's profile"""
+    assignments = list(db.collection('auctioneer_assignments')
+                       .where('seasonId', '==', season_id)
+                       .where('status', '==', 'approved')
+                       .limit(1).stream())
+    if not assignments:
+        return None
+    assignment = serialize_firestore_doc(assignments[0])
+    profile = db.collection('auctioneers').document(assignment.get('auctioneerId', '')).get()
+    return {
+        'assignment': assignment,
+        'profile': public_record(serialize_firestore_doc(profile)) if profile.exists else None
+    }
+
+
+def preload_season(season_id: str) -> Dict:
+    """Bulk-load a season's players, teams and auctioneer; returns the load report"""
+    started = time.perf_counter()
+    # The three queries run side by side (own pool: this may itself run on preload_executor)
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix='season-load') as pool:
+        players_query = pool.submit(
+            lambda: list(db.collection('players').where('matchId', '==', season_id).stream()))
+        teams_query = pool.submit(load_team_cache, season_id, True)
+        auctioneer_query = pool.submit(load_season_auctioneer, season_id)
+
+        players = {doc.id: PlayerRecord(public_record(serialize_firestore_doc(doc)))
+                   for doc in players_query.result()}
+        team_count = teams_query.result()
+        auctioneer = auctioneer_query.result()
+    load_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    index_started = time.perf_counter()
+    index = PlayerSearchIndex.build(players.values())
+    index_ms = round((time.perf_counter() - index_started) * 1000, 1)
+
+    approx_bytes = approx_size(players) + approx_size(auctioneer)
+    report = {
+        'seasonId': season_id,
+        'players': len(players),
+        'teams': team_count,
+        'auctioneerId': auctioneer['assignment'].get('auctioneerId') if auctioneer else None,
+        'loadMs': load_ms,
+        'indexMs': index_ms,
+        'approxBytes': approx_bytes,
+        'bytesPerPlayer': approx_bytes // len(players) if players else 0,
+        'loadedAt': datetime.now().isoformat()
+    }
+    with season_store_lock:
+        season_store[season_id] = {'players': players, 'auctioneer': auctioneer, 'report': report, 'index': index}
+    with lot_prefetch_lock:
+        lot_prefetch.pop(season_id, None)
+    metric_observe('seasonStore.load', load_ms / 1000)
+    print(f"📦 Preloaded season {season_id}: {len(players)} players, {team_count} teams in {load_ms}ms (~{approx_bytes // 1024} KiB)")
+    return report
+
+
+def schedule_season_preload(season_id: str):
+    """Preload a season off the request thread"""
+    def run():
+        try:
+            preload_season(season_id)
+        except Exception as e:
+            print(f"Error preloading season {season_id}: {e}")
+    preload_executor.submit(run)
+
+
+def get_stored_player(season_id: str, player_id: str) -> Optional[Dict]:
+    with season_store_lock:
+        player = season_store.get(season_id, {}).get('players', {}).get(player_id)
+    return player.to_dict() if player is not None else None
+
+
+def store_player(player: Dict):
+    """Add or replace a player in its season's store (if that season is loaded)"""
+    with season_store_lock:
+        store = season_store.get(player.get('matchId'))
+        if store is not None:
+            record = store['players'][player['id']] = PlayerRecord(public_record(player))
+            store['index'].add(record)
+
+
+def update_stored_player(season_id: str, player_id: str, fields: Dict):
+    with season_store_lock:
+        store = season_store.get(season_id)
+        player = store['players'].get(player_id) if store else None
+        if player is not None:
+            player.update(fields)
+            store['index'].add(player)
+
+
+def refresh_season_auctioneer(season_id: str):
+    """Re-read a loaded season's auctioneer after an approval or replacement"""
+    with season_store_lock:
+        loaded = season_id in season_store
+    if loaded:
+        auctioneer = load_season_auctioneer(season_id)
+        with season_store_lock:
+            if season_id in season_store:
+                season_store[season_id]['auctioneer'] = auctioneer
+
+
+def upcoming_player_ids(state: Dict, limit: int) -> List[str]:
+    """Queued players that haven't been auctioned and aren't up now"""
+    done = set(state.get('completedPlayers') or [])
+    current = state.get('currentPlayerId')
+    return [pid for pid in state.get('playerQueue') or [] if pid not in done and pid != current][:limit]
+
+
+def prefetch_next_lots(season_id: str) -> int:
+    """Read the next LOT_PREFETCH_DEPTH queued players that aren't cached yet"""
+    state = get_auction_state(season_id)
+    if not state:
+        return 0
+    wanted = upcoming_player_ids(state, LOT_PREFETCH_DEPTH)
+    with lot_prefetch_lock:
+        cached = lot_prefetch.setdefault(season_id, {})
+        # Lots that left the window (auctioned or dequeued) aren't needed
+        for player_id in [pid for pid in cached if pid not in wanted]:
+            del cached[player_id]
+        missing = [pid for pid in wanted if pid not in cached]
+    with season_store_lock:
+        stored = season_store.get(season_id, {}).get('players', {})
+        missing = [pid for pid in missing if pid not in stored]
+    if not missing:
+        return 0
+
+    docs = db.get_all([db.collection('players').document(pid) for pid in missing])
+    players = {doc.id: serialize_firestore_doc(doc) for doc in docs if doc.exists}
+    with lot_prefetch_lock:
+        lot_prefetch.setdefault(season_id, {}).update(players)
+    metric_incr('lot.prefetched', len(players))
+    return len(players)
+
+
+def schedule_lot_prefetch(season_id: str):
+    """Prefetch the next lots off the request thread"""
+    def run():
+        try:
+            prefetch_next_lots(season_id)
+        except Exception as e:
+            print(f"Error prefetching lots for {season_id}: {e}")
+    preload_executor.submit(run)
+
+
+def forget_prefetched_player(player_id: str, player: Optional[Dict] = None):
+    """Drop a player's cached copies after an edit (player given) or delete"""
+    with lot_prefetch_lock:
+        for players in lot_prefetch.values():
+            players.pop(player_id, None)
+    with season_store_lock:
+        for store in season_store.values():
+            if store['players'].pop(player_id, None) is not None:
+                store['index'].remove(player_id)
+    if player is not None:
+        store_player(player)
+
+
+def season_exists(season_id: str) -> bool:
+    """A season is known if it has a match document or an auction state"""
+    with auction_state_lock:
+        if season_id in auction_state:
+            return True
+    return (db.collection('matches').document(season_id).get().exists
+            or db.collection('auction_states').document(season_id).get().exists)
+
+
+def ensure_season_loaded(season_id: str):
+    """Preload a season for a read; unknown seasons raise a 404 and are not cached"""
+    with season_store_lock:
+        if season_id in season_store:
+            return
+    if not season_exists(season_id):
+        raise AuctionError("Season not found", 404)
+    preload_season(season_id)
+
+
+def search_season_players(season_id: str, criteria: Dict, offset: int, limit: int) -> Tuple[List[Dict], int]:
+    """One page of a season's players matching criteria, and the total match count"""
+    ensure_season_loaded(season_id)
+    with season_store_lock:
+        store = season_store.get(season_id)
+        if store is None:
+            return [], 0
+        ids = store['index'].search(**criteria)
+        page = [store['players'][player_id] for player_id in ids[offset:offset + limit]]
+    metric_incr('playerSearch.queries')
+    return [record.to_dict() for record in page], len(ids)
+
+
+def season_player_pool(season_id: str, statuses: List[str], role: Optional[str], min_price, max_price,
+                       descending: bool, offset: int, limit: int, group_by_role: bool) -> Dict:
+    """Slices of a season's pool sorted by base price, overall or per role"""
+    ensure_season_loaded(season_id)
+    with season_store_lock:
+        store = season_store.get(season_id)
+        if store is None:
+            return {'players': [], 'total': 0}
+        index = store['index']
+        roles = [role] if role is not None else index.pool_roles()
+        if group_by_role:
+            groups = {}
+            for group_role in roles:
+                ids, total = index.pool_slice(statuses, [group_role], min_price, max_price, descending, offset, limit)
+                if total:
+                    groups[group_role] = {'records': [store['players'][pid] for pid in ids], 'total': total}
+        else:
+            ids, total = index.pool_slice(statuses, roles, min_price, max_price, descending, offset, limit)
+            records = [store['players'][pid] for pid in ids]
+    metric_incr('playerPool.queries')
+    if group_by_role:
+        return {'groups': {group_role: {'players': [record.to_dict() for record in group['records']],
+                                        'total': group['total']}
+                           for group_role, group in groups.items()}}
+    return {'players': [record.to_dict() for record in records], 'total': total}
+
+
+def season_store_reports() -> Dict:
+    with season_store_lock:
+        return {season_id: dict(store['report']) for season_id, store in season_store.items()}
+
+
+def get_lot_player(season_id: str, player_id: str) -> Optional[Dict]:
+    """The player document for a lot, from the season store or prefetch when it's there.
+
+    Private fields are stripped on every path, since the result is broadcast.
+    """
+    player = get_stored_player(season_id, player_id)
+    if player is not None:
+        metric_incr('seasonStore.hits')
+        return player
+    with lot_prefetch_lock:
+        player = lot_prefetch.get(season_id, {}).pop(player_id, None)
+    if player is not None:
+        metric_incr('lot.prefetchHits')
+        return public_record(player)
+    metric_incr('lot.prefetchMisses')
+    doc = db.collection('players').document(player_id).get()
+    return public_record(serialize_firestore_doc(doc)) if doc.exists else None
+
+
+def open_lot(season_id: str, player: Dict, base_price, options: Dict) -> Dict:
+    """Put a player up for bidding (caller holds the season's turn).
+
+    Returns the PLAYER_BIDDING_STARTED payload; the caller broadcasts it.
+    """
+    player_id = player['id']
+    updates = {
+        'currentPlayerId': player_id,
+        'currentPlayerName': player.get('name', 'Unknown'),
+        'currentPlayerStatus': player.get('status'),
+        'currentBid': base_price,
+        'leadingTeamId': None,
+        'leadingTeamName': None,
+        'biddingActive': True,
+        'bidStartTime': datetime.now().isoformat(),
+        'bidHistory': [],
+        'bidHistoryLimit': BID_HISTORY_LIMIT,
+        'bidIncrement': options.get('bidIncrement') or default_bid_increment(base_price),
+        'lotBidCount': 0,
+        'lotEndsAt': None,
+        'lotPhase': None,
+        'lotRemainingMs': None
+    }
+    
+    # countdownSeconds: 0 leaves the lot open until the auctioneer closes it
+    countdown = float(options.get('countdownSeconds', LOT_COUNTDOWN_SECONDS) or 0)
+    if countdown > 0:
+        updates['lotPhase'] = 'OPEN'
+        state = get_auction_state(season_id) or {}
+        if state.get('status') == 'LIVE':
+            updates['lotEndsAt'] = (datetime.now() + timedelta(seconds=countdown)).isoformat()
+        else:
+            updates['lotRemainingMs'] = int(countdown * 1000)
+    
+    # Holds and proxies from a lot that was never closed don't carry over
+    release_season_reservations(season_id)
+    clear_lot_proxies(season_id)
+    update_auction_state(season_id, updates, 'PLAYER_BIDDING_STARTED')
+    arm_lot_clock(season_id)
+    
+    # Read ahead while this lot runs
+    schedule_lot_prefetch(season_id)
+    
+    print(f'🔔 Lot open in season_{season_id}: {player.get("name")}, Base Price: {base_price}')
+    return {
+        'seasonId': season_id,
+        'player': player,
+        'basePrice': base_price,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
 @app.route('/api/auction/player/start', methods=['POST'])
+@idempotent('lot_start')
 def start_player_bidding():
     """Auctioneer starts bidding for a player"""
     try:
@@ -2182,46 +4414,77 @@ def start_player_bidding():
             return error_response(f"Missing required fields: {required_fields}")
         
         season_id = data['seasonId']
-        player_id = data['playerId']
-        base_price = data['basePrice']
         
         # Get player details
-        player_doc = db.collection('players').document(player_id).get()
-        if not player_doc.exists:
+        player = get_lot_player(season_id, data['playerId'])
+        if player is None:
             return error_response("Player not found", 404)
         
-        player = serialize_firestore_doc(player_doc)
-        
-        updates = {
-            'currentPlayerId': player_id,
-            'currentPlayerName': player.get('name', 'Unknown'),
-            'currentBid': base_price,
-            'leadingTeamId': None,
-            'leadingTeamName': None,
-            'biddingActive': True,
-            'bidStartTime': datetime.now().isoformat(),
-            'bidHistory': []
-        }
-        
-        update_auction_state(season_id, updates)
+        with get_season_sequencer(season_id).turn():
+            started = open_lot(season_id, player, data['basePrice'], data)
         
         # Broadcast to all dashboards
-        room_name = f'season_{season_id}'
-        print(f'🔔 Emitting PLAYER_BIDDING_STARTED to room: {room_name}')
-        print(f'   Player: {player.get("name")}, Base Price: {base_price}')
-        socketio.emit('PLAYER_BIDDING_STARTED', {
-            'seasonId': season_id,
-            'player': player,
-            'basePrice': base_price,
-            'timestamp': datetime.now().isoformat()
-        }, room=room_name)
+        socketio.emit('PLAYER_BIDDING_STARTED', started, room=f'season_{season_id}')
+        broadcast_lot_countdown(season_id)
         
         return success_response(None, "Player bidding started")
     except Exception as e:
         return error_response(f"Failed to start player bidding: {str(e)}")
 
 
+def submit_bid(season_id: str, team_id: str, amount) -> Dict:
+    """Validate, apply, broadcast and persist a bid; raises AuctionError on rejection.
+
+    Shared by the HTTP route and the place_bid socket event.
+    """
+    # Live state is in memory; Firestore is only read on a cold start
+    live_state = load_auction_state(season_id)
+    if live_state is None:
+        raise AuctionError("Auction state not found", 404)
+
+    # Reject stale bids before doing any other work
+    check_bid(season_id, amount)
+
+    # Team name and budget come from the season's team cache
+    team = get_cached_team(season_id, team_id)
+    if team is None:
+        raise AuctionError("Team not found", 404)
+
+    # O(1) check against the ledger: remaining budget minus funds reserved
+    # elsewhere (a leading team raising its own bid replaces its hold)
+    with auction_state_lock:
+        lot_player_id = live_state.get('currentPlayerId')
+    available = available_budget(season_id, team_id, lot_player_id)
+    if amount > available:
+        raise AuctionError(f"Insufficient budget. Available: {available}")
+
+    # One writer per season: bids are applied and broadcast in arrival order
+    sequencer = get_season_sequencer(season_id)
+    with sequencer.turn() as waited:
+        # Apply the bid to the live state (re-validated under the engine lock)
+        bid_entry, player_id, patch = apply_bid(season_id, team_id, team.get('name', 'Unknown'), amount)
+        publish_bid(season_id, player_id, bid_entry, patch)
+        persist_bid(season_id, player_id, bid_entry)
+
+        # Standing proxy bids answer the new bid in the same turn
+        proxy_outcome = resolve_proxy_bids(season_id)
+        if proxy_outcome:
+            proxy_entry, _, proxy_patch = proxy_outcome
+            publish_bid(season_id, player_id, proxy_entry, proxy_patch)
+            persist_bid(season_id, player_id, proxy_entry)
+
+        arm_lot_clock(season_id)
+
+    return {
+        'seq': bid_entry['seq'],
+        'outbidByProxy': bool(proxy_outcome and proxy_outcome[0]['teamId'] != team_id),
+        'queueWaitMs': round(waited * 1000, 3),
+        'queueDepth': sequencer.queue_depth
+    }
+
+
 @app.route('/api/auction/bid', methods=['POST'])
+@idempotent('bid')
 def place_bid():
     """Team Rep places a bid - SERVER VALIDATES"""
     try:
@@ -2231,96 +4494,184 @@ def place_bid():
         if not all(field in data for field in required_fields):
             return error_response(f"Missing required fields: {required_fields}")
         
+        result = submit_bid(data['seasonId'], data['teamId'], data['amount'])
+        return success_response(result, "Bid placed successfully")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
+    except Exception as e:
+        return error_response(f"Failed to place bid: {str(e)}")
+
+
+@app.route('/api/auction/proxy-bid', methods=['POST'])
+@idempotent('proxy_bid')
+def place_proxy_bid():
+    """Team Rep registers a maximum bid; the engine bids for them up to it"""
+    try:
+        data = request.get_json()
+        
+        required_fields = ['seasonId', 'teamId', 'maxAmount']
+        if not all(field in data for field in required_fields):
+            return error_response(f"Missing required fields: {required_fields}")
+        
         season_id = data['seasonId']
         team_id = data['teamId']
-        amount = data['amount']
-        
-        # Get current auction state
-        state = get_auction_state(season_id)
-        if not state:
+        max_amount = data['maxAmount']
+
+        if load_auction_state(season_id) is None:
             return error_response("Auction state not found", 404)
-        
-        # Validate auction is live
-        if state['status'] != 'LIVE':
-            return error_response("Auction is not live", 400)
-        
-        # Validate bidding is active
-        if not state.get('biddingActive'):
-            return error_response("No player is currently up for bidding", 400)
-        
-        # Validate bid amount
-        current_bid = state.get('currentBid', 0)
-        if amount <= current_bid:
-            return error_response(f"Bid must be higher than current bid of {current_bid}", 400)
-        
-        # Get team details
-        team_doc = db.collection('teams').document(team_id).get()
-        if not team_doc.exists:
+
+        team = get_cached_team(season_id, team_id)
+        if team is None:
             return error_response("Team not found", 404)
-        
-        team = serialize_firestore_doc(team_doc)
-        
-        # Validate team has enough budget
-        remaining_budget = team.get('remainingBudget', 0)
-        if amount > remaining_budget:
-            return error_response(f"Insufficient budget. Remaining: {remaining_budget}", 400)
-        
-        # Update auction state with new bid
-        bid_history = state.get('bidHistory', [])
-        bid_history.append({
-            'teamId': team_id,
-            'teamName': team.get('name', 'Unknown'),
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        updates = {
-            'currentBid': amount,
-            'leadingTeamId': team_id,
-            'leadingTeamName': team.get('name', 'Unknown'),
-            'bidHistory': bid_history,
-            'lastBidTime': datetime.now().isoformat()
-        }
-        
-        update_auction_state(season_id, updates)
-        
-        # Save bid to bids collection
-        bid_id = generate_id('bid')
-        bid_data = {
-            'id': bid_id,
-            'seasonId': season_id,
-            'playerId': state['currentPlayerId'],
-            'teamId': team_id,
-            'teamName': team.get('name'),
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        }
-        db.collection('bids').document(bid_id).set(bid_data)
-        
-        # Broadcast to ALL dashboards - EVERYONE SEES SAME BID
-        bid_broadcast = {
-            'seasonId': season_id,
-            'playerId': state['currentPlayerId'],
-            'teamId': team_id,
-            'teamName': team.get('name'),
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        print(f'💰 Broadcasting NEW_BID to season_{season_id}: {team.get("name")} bid {amount}')
-        socketio.emit('NEW_BID', bid_broadcast, room=f'season_{season_id}')
-        
-        # Also send updated auction state
-        updated_state = get_auction_state(season_id)
-        if updated_state:
-            socketio.emit('AUCTION_STATE_UPDATE', updated_state, room=f'season_{season_id}')
-        
-        return success_response(None, "Bid placed successfully")
+
+        with get_season_sequencer(season_id).turn():
+            register_proxy_bid(season_id, team_id, team.get('name', 'Unknown'), max_amount)
+
+            # Settle every competing proxy now: one bid, one broadcast, one log entry
+            outcome = resolve_proxy_bids(season_id)
+            if outcome:
+                bid_entry, player_id, patch = outcome
+                publish_bid(season_id, player_id, bid_entry, patch)
+                persist_bid(season_id, player_id, bid_entry)
+                arm_lot_clock(season_id)
+
+            state = get_auction_state(season_id)
+
+        return success_response({
+            'leading': state.get('leadingTeamId') == team_id,
+            'currentBid': state.get('currentBid'),
+            'leadingTeamId': state.get('leadingTeamId'),
+            'seq': outcome[0]['seq'] if outcome else None,
+            'ladder': outcome[0]['ladder'] if outcome else []
+        }, "Proxy bid registered")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
     except Exception as e:
-        return error_response(f"Failed to place bid: {str(e)}")
+        return error_response(f"Failed to place proxy bid: {str(e)}")
+
+
+def lot_result_ref(season_id: str, player_id: str):
+    """One result record per closed lot"""
+    return db.collection('auction_states').document(season_id).collection('results').document(player_id)
+
+
+def close_current_lot(season_id: str, sold: bool, announce: bool = True) -> Dict:
+    """Close bidding for the season's current player and return the result.
+
+    The player, the winning team's debit, the state fields and the result
+    record are committed in one batch, so a failure leaves none of them
+    applied. Broadcasts are built from what is already in memory; with
+    announce=False the caller sends them (see close_and_start_next).
+    """
+    state = get_auction_state(season_id)
+    if not state:
+        raise AuctionError("Auction state not found", 404)
+    
+    player_id = state.get('currentPlayerId')
+    if not player_id:
+        raise AuctionError("No player currently up for bidding")
+    
+    final_amount = state.get('currentBid', 0)
+    winning_team_id = state.get('leadingTeamId')
+    sold = bool(sold and winning_team_id)
+    now = datetime.now().isoformat()
+    
+    print(f'[CLOSE_BIDDING] Player: {player_id}, Sold: {sold}, Winning Team: {winning_team_id}, Amount: {final_amount}')
+    
+    result_data = {
+        'playerId': player_id,
+        'playerName': state.get('currentPlayerName'),
+        'sold': sold,
+        'finalAmount': final_amount if sold else 0,
+        'teamId': winning_team_id if sold else None,
+        'teamName': state.get('leadingTeamName') if sold else None,
+        'timestamp': now
+    }
+    
+    updates = {
+        'currentPlayerId': None,
+        'currentPlayerName': None,
+        'currentPlayerStatus': None,
+        'currentBid': 0,
+        'leadingTeamId': None,
+        'leadingTeamName': None,
+        'biddingActive': False,
+        'completedPlayers': state.get('completedPlayers', []) + [player_id],
+        'bidHistory': [],
+        'lotEndsAt': None,
+        'lotPhase': None,
+        'lotRemainingMs': None,
+        'updatedAt': now
+    }
+    
+    batch = db.batch()
+    batch.set(db.collection('auction_states').document(season_id), updates, merge=True)
+    batch.set(lot_result_ref(season_id, player_id), {**result_data, 'seasonId': season_id})
+    # The player leaves PENDING (or an earlier UNSOLD) for this result
+    track_player_change({'matchId': season_id, 'status': state.get('currentPlayerStatus') or 'PENDING'},
+                        {'matchId': season_id, 'status': 'SOLD' if sold else 'UNSOLD'}, batch)
+    
+    if sold:
+        print(f'[CLOSE_BIDDING] Marking player {player_id} as SOLD to team {winning_team_id}')
+        batch.update(db.collection('players').document(player_id), {
+            'status': 'SOLD',
+            'soldTo': winning_team_id,
+            'soldAmount': final_amount,
+            'soldAt': now
+        })
+        # Commit the winner's reservation: remainingBudget drops by an atomic
+        # Increment, budget follows it and the player joins the roster (no team read)
+        with budget_debit(season_id, winning_team_id, final_amount, player_id) as new_budget:
+            batch.update(db.collection('teams').document(winning_team_id), team_debit_fields(
+                final_amount, new_budget, {'playerIds': firestore.ArrayUnion([player_id])}))
+            batch.commit()
+        print(f'[CLOSE_BIDDING] Team {winning_team_id} charged {final_amount}, remaining {new_budget}')
+    else:
+        print(f'[CLOSE_BIDDING] Marking player {player_id} as UNSOLD (winning_team={winning_team_id})')
+        batch.update(db.collection('players').document(player_id), {
+            'status': 'UNSOLD',
+            'updatedAt': now
+        })
+        batch.commit()
+    metric_incr('lot.batchedCloses')
+    update_stored_player(season_id, player_id, {'status': 'SOLD', 'soldTo': winning_team_id,
+                                                'soldAmount': final_amount, 'soldAt': now}
+                         if sold else {'status': 'UNSOLD', 'updatedAt': now})
+    
+    # Whatever is still held or proxied on this lot is void now
+    release_season_reservations(season_id)
+    clear_lot_proxies(season_id)
+    
+    # The batch already wrote these fields, but the persistence worker may have
+    # flushed the old lot's values from memory after it; mark them dirty again
+    # so the worker's last write for this season carries the closed lot
+    update_auction_state(season_id, updates, 'PLAYER_SOLD' if sold else 'PLAYER_UNSOLD')
+    auction_scheduler.cancel(('lot', season_id))
+    request_match_reconcile()
+    
+    if announce:
+        # Broadcast to all dashboards
+        event_name = 'PLAYER_SOLD' if sold else 'PLAYER_UNSOLD'
+        socketio.emit(event_name, result_data, room=f'season_{season_id}')
+        if sold:
+            socketio.emit('TEAM_UPDATED', team_update_payload(season_id, result_data), room=f'season_{season_id}')
+    
+    return result_data
+
+
+def team_update_payload(season_id: str, result_data: Dict) -> Dict:
+    """Budget update for real-time dashboards, from the ledger rather than a re-read"""
+    team_id = result_data['teamId']
+    team = get_cached_team(season_id, team_id) or {}
+    return {
+        'teamId': team_id,
+        'team': {**team, 'id': team_id},
+        'addedPlayerIds': [result_data['playerId']]
+    }
 
 
 @app.route('/api/auction/player/close', methods=['POST'])
+@idempotent('lot_close')
 def close_player_bidding():
     """Auctioneer closes bidding for current player"""
     try:
@@ -2333,166 +4684,487 @@ def close_player_bidding():
         season_id = data['seasonId']
         sold = data['sold']  # True if sold, False if unsold
         
-        state = get_auction_state(season_id)
-        if not state:
-            return error_response("Auction state not found", 404)
-        
-        player_id = state.get('currentPlayerId')
-        if not player_id:
-            return error_response("No player currently up for bidding", 400)
-        
-        final_amount = state.get('currentBid', 0)
-        winning_team_id = state.get('leadingTeamId')
-        
-        print(f'[CLOSE_BIDDING] Player: {player_id}, Sold: {sold}, Winning Team: {winning_team_id}, Amount: {final_amount}')
-        
-        result_data = {
-            'playerId': player_id,
-            'playerName': state.get('currentPlayerName'),
-            'sold': sold,
-            'finalAmount': final_amount if sold else 0,
-            'teamId': winning_team_id if sold else None,
-            'teamName': state.get('leadingTeamName') if sold else None,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        if sold and winning_team_id:
-            print(f'[CLOSE_BIDDING] Marking player {player_id} as SOLD to team {winning_team_id}')
-            # Update player status
-            db.collection('players').document(player_id).update({
-                'status': 'SOLD',
-                'soldTo': winning_team_id,
-                'soldAmount': final_amount,
-                'soldAt': datetime.now().isoformat()
-            })
-            
-            # Update team budget and roster
-            team_doc = db.collection('teams').document(winning_team_id).get()
-            if team_doc.exists:
-                team = serialize_firestore_doc(team_doc)
-                # Get current budget (try both field names for backwards compatibility)
-                current_budget = team.get('budget', team.get('remainingBudget', 0))
-                new_budget = current_budget - final_amount
-                # Use playerIds array (the correct field name)
-                player_ids_list = team.get('playerIds', [])
-                if player_id not in player_ids_list:
-                    player_ids_list.append(player_id)
-                
-                print(f'[CLOSE_BIDDING] Updating team {winning_team_id}: budget {current_budget} -> {new_budget}, playerIds: {player_ids_list}')
-                db.collection('teams').document(winning_team_id).update({
-                    'budget': new_budget,
-                    'remainingBudget': new_budget,  # Keep for backwards compatibility
-                    'playerIds': player_ids_list,
-                    'updatedAt': datetime.now().isoformat()
-                })
-                print(f'Updated team {winning_team_id}: added player {player_id}, playerIds count: {len(player_ids_list)}')
-                
-                # Emit TEAM_UPDATED event for real-time budget updates
-                updated_team = serialize_firestore_doc(db.collection('teams').document(winning_team_id).get())
-                socketio.emit('TEAM_UPDATED', {
-                    'teamId': winning_team_id,
-                    'team': updated_team
-                }, room=f'season_{season_id}')
-        else:
-            print(f'[CLOSE_BIDDING] Marking player {player_id} as UNSOLD (sold={sold}, winning_team={winning_team_id})')
-            # Mark player as unsold
-            db.collection('players').document(player_id).update({
-                'status': 'UNSOLD',
-                'updatedAt': datetime.now().isoformat()
-            })
-        
-        # Update auction state
-        completed = state.get('completedPlayers', [])
-        completed.append(player_id)
-        
-        updates = {
-            'currentPlayerId': None,
-            'currentPlayerName': None,
-            'currentBid': 0,
-            'leadingTeamId': None,
-            'leadingTeamName': None,
-            'biddingActive': False,
-            'completedPlayers': completed,
-            'bidHistory': []
-        }
-        
-        update_auction_state(season_id, updates)
-        
-        # Broadcast to all dashboards
-        event_name = 'PLAYER_SOLD' if sold else 'PLAYER_UNSOLD'
-        socketio.emit(event_name, result_data, room=f'season_{season_id}')
+        # Closing holds the season's write turn so no bid can slip in mid-close
+        with get_season_sequencer(season_id).turn():
+            result_data = close_current_lot(season_id, sold)
         
         return success_response(result_data, "Player bidding closed")
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
     except Exception as e:
         return error_response(f"Failed to close bidding: {str(e)}")
 
 
-# ========================
-# SERVER-CONTROLLED TIMER
-# ========================
-
-active_timers = {}
-
-def auction_timer_thread(season_id: str, end_time_str: str):
-    """Background thread that broadcasts timer updates"""
+@app.route('/api/auction/player/close-and-next', methods=['POST'])
+@idempotent('lot_transition')
+def close_and_start_next():
+    """Auctioneer closes the current lot and opens the next queued player in one step"""
     try:
-        end_time = datetime.fromisoformat(end_time_str)
+        data = request.get_json()
+        
+        required_fields = ['seasonId', 'sold']
+        if not all(field in data for field in required_fields):
+            return error_response(f"Missing required fields: {required_fields}")
         
-        while season_id in active_timers:
+        season_id = data['seasonId']
+        
+        with get_season_sequencer(season_id).turn():
             state = get_auction_state(season_id)
-            if not state or state['status'] not in ['LIVE', 'READY']:
-                break
+            if not state:
+                raise AuctionError("Auction state not found", 404)
             
-            now = datetime.now()
-            remaining = (end_time - now).total_seconds()
+            # Resolve the next player before closing so a bad id leaves the lot open
+            next_id = data.get('nextPlayerId') or next(iter(upcoming_player_ids(state, 1)), None)
+            next_player = get_lot_player(season_id, next_id) if next_id else None
+            if next_id and next_player is None:
+                raise AuctionError(f"Player {next_id} not found", 404)
             
-            if remaining <= 0:
-                # Auction time ended
-                update_auction_state(season_id, {'status': 'ENDED'})
-                socketio.emit('AUCTION_TIME_ENDED', {
-                    'seasonId': season_id,
-                    'timestamp': now.isoformat()
-                }, room=f'season_{season_id}')
-                break
+            result_data = close_current_lot(season_id, data['sold'], announce=False)
+            started = None
+            if next_player:
+                base_price = data.get('basePrice') or next_player.get('basePrice', 0)
+                started = open_lot(season_id, next_player, base_price, data)
             
-            # Broadcast timer update every second
-            socketio.emit('AUCTION_TIMER_UPDATE', {
+            transition = {
                 'seasonId': season_id,
-                'remainingSeconds': int(remaining),
-                'serverTime': now.isoformat()
-            }, room=f'season_{season_id}')
-            
-            time.sleep(1)
-        
+                'closed': result_data,
+                'teamUpdate': team_update_payload(season_id, result_data) if result_data['sold'] else None,
+                'next': started,
+                'lot': lot_countdown_payload(season_id, get_auction_state(season_id)) if started else None,
+                'timestamp': datetime.now().isoformat()
+            }
+            # One message for the whole changeover
+            socketio.emit('LOT_TRANSITION', transition, room=f'season_{season_id}')
+        
+        metric_incr('lot.transitions')
+        message = "Lot closed and next player up" if started else "Lot closed; no players left in the queue"
+        return success_response({'closed': result_data, 'next': started}, message)
+    except AuctionError as e:
+        return error_response(str(e), e.status_code)
     except Exception as e:
-        print(f"Timer thread error: {e}")
-    finally:
-        if season_id in active_timers:
-            del active_timers[season_id]
+        return error_response(f"Failed to close and start next: {str(e)}")
+
+
+# ========================
+# SERVER-CONTROLLED TIMER
+# ========================
+
+class AuctionScheduler:
+    """One heap of deadlines for every season, driven by a single thread.
+
+    Jobs are keyed, e.g. ('end', season_id): scheduling a key replaces its
+    pending job and cancel() just forgets it (stale heap entries are
+    skipped when popped), so handlers never sleep or wait on a timer. The
+    clock is injectable; with start=False nothing runs in the background
+    and tests advance a fake clock and call run_due() themselves. Due
+    callbacks go to `executor` when one is given so a slow callback can't
+    hold up other seasons' deadlines.
+    """
+
+    def __init__(self, clock=time.monotonic, executor=None, start: bool = True):
+        self.clock = clock
+        self.executor = executor
+        self._heap = []
+        self._jobs: Dict[Any, Tuple[float, int]] = {}
+        self._counter = 0
+        self._cond = threading.Condition()
+        if start:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def schedule(self, key, delay: float, callback):
+        """Run callback after delay seconds, replacing any pending job for key"""
+        with self._cond:
+            self._counter += 1
+            due = self.clock() + max(0.0, delay)
+            self._jobs[key] = (due, self._counter)
+            heapq.heappush(self._heap, (due, self._counter, key, callback))
+            self._cond.notify()
+
+    def cancel(self, key) -> bool:
+        """Forget a pending job; returns whether there was one"""
+        with self._cond:
+            return self._jobs.pop(key, None) is not None
+
+    def remaining(self, key) -> Optional[float]:
+        """Seconds until a pending job is due"""
+        with self._cond:
+            job = self._jobs.get(key)
+            return None if job is None else max(0.0, job[0] - self.clock())
+
+    def _pop_due(self) -> List:
+        """Pop every live job that is due (caller holds _cond)"""
+        due = []
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            when, token, key, callback = heapq.heappop(self._heap)
+            if self._jobs.get(key) == (when, token):
+                del self._jobs[key]
+                due.append(callback)
+        return due
+
+    def run_due(self) -> int:
+        """Run every job that is due now; returns how many ran"""
+        with self._cond:
+            due = self._pop_due()
+        for callback in due:
+            if self.executor is not None:
+                self.executor.submit(self._call, callback)
+            else:
+                self._call(callback)
+        return len(due)
+
+    def _call(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Scheduled job error: {e}")
+            metric_incr('scheduler.errors')
+        else:
+            metric_incr('scheduler.jobs')
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Drop cancelled entries so the wait is for a live deadline
+                while self._heap and self._jobs.get(self._heap[0][2]) != self._heap[0][:2]:
+                    heapq.heappop(self._heap)
+                timeout = self._heap[0][0] - self.clock() if self._heap else None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+            self.run_due()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {'pendingJobs': len(self._jobs), 'heapSize': len(self._heap)}
+
+
+auction_scheduler = AuctionScheduler(executor=ThreadPoolExecutor(max_workers=4, thread_name_prefix='auction-timer'))
+
+
+def seconds_until(iso_time: str) -> float:
+    return (datetime.fromisoformat(iso_time) - datetime.now()).total_seconds()
+
+
+def epoch_ms(iso_time: Optional[str]) -> Optional[int]:
+    return int(datetime.fromisoformat(iso_time).timestamp() * 1000) if iso_time else None
 
 
 def start_auction_timer(season_id: str):
-    """Start the server-controlled timer"""
+    """(Re)arm the season's clock from its in-memory endTime"""
     state = get_auction_state(season_id)
     if not state or not state.get('endTime'):
         return False
     
-    # Stop existing timer if any
-    if season_id in active_timers:
-        active_timers[season_id] = False
-        time.sleep(1)
+    auction_scheduler.schedule(('end', season_id), seconds_until(state['endTime']),
+                               lambda: auction_time_up(season_id))
+    return True
+
+
+def stop_auction_timer(season_id: str):
+    """Cancel the season's clock jobs (pause, end, delete)"""
+    auction_scheduler.cancel(('end', season_id))
+    auction_scheduler.cancel(('lot', season_id))
+
+
+def deadline_payload(season_id: str, state: Dict) -> Dict:
+    """The authoritative deadline; clients count down locally against synced time"""
+    status = state.get('status')
+    end_time = state.get('endTime')
+    if status == 'PAUSED' and state.get('pausedRemainingMs') is not None:
+        remaining_ms = state['pausedRemainingMs']
+    elif status in ('LIVE', 'READY') and end_time:
+        remaining_ms = max(0, int(seconds_until(end_time) * 1000))
+    else:
+        remaining_ms = 0
+    return {
+        'seasonId': season_id,
+        'status': status,
+        'endTime': end_time,
+        'endsAtMs': epoch_ms(end_time),
+        'remainingMs': remaining_ms,
+        'serverTimeMs': int(time.time() * 1000)
+    }
+
+
+def broadcast_deadline(season_id: str):
+    """Send the deadline to the room - only when it changes (start/extend/pause/resume/end)"""
+    state = get_auction_state(season_id)
+    if not state:
+        return
+    metric_incr('timer.broadcasts')
+    socketio.emit('AUCTION_DEADLINE', deadline_payload(season_id, state), room=f'season_{season_id}')
+
+
+def auction_time_up(season_id: str):
+    """Deadline job: end the auction once its endTime has really passed"""
+    with get_season_sequencer(season_id).turn():
+        state = get_auction_state(season_id)
+        if not state or state['status'] not in ['LIVE', 'READY']:
+            return
+        
+        remaining = seconds_until(state['endTime'])
+        if remaining > 0:
+            # endTime moved after this job was armed
+            auction_scheduler.schedule(('end', season_id), remaining, lambda: auction_time_up(season_id))
+            return
+        
+        update_auction_state(season_id, {'status': 'ENDED'}, 'AUCTION_TIME_ENDED')
     
-    # Start new timer thread
-    active_timers[season_id] = True
-    timer_thread = threading.Thread(
-        target=auction_timer_thread,
-        args=(season_id, state['endTime']),
-        daemon=True
-    )
-    timer_thread.start()
+    stop_auction_timer(season_id)
+    broadcast_deadline(season_id)
+    socketio.emit('AUCTION_TIME_ENDED', {
+        'seasonId': season_id,
+        'timestamp': datetime.now().isoformat()
+    }, room=f'season_{season_id}')
+
+
+# Per-lot countdown: the lot opens with LOT_COUNTDOWN_SECONDS on the clock,
+# the auctioneer calls "going once" / "going twice" at the marks below, and
+# the lot closes itself when the clock runs out. Every accepted bid resets
+# the clock to at least LOT_BID_RESET_SECONDS; a bid in the final
+# LOT_ANTI_SNIPE_WINDOW seconds adds LOT_ANTI_SNIPE_EXTENSION on top.
+# Off by default (0): lots close when the auctioneer closes them, unless the
+# deployment or a lot's countdownSeconds option turns the clock on.
+LOT_COUNTDOWN_SECONDS = float(os.getenv('LOT_COUNTDOWN_SECONDS', '0'))
+LOT_BID_RESET_SECONDS = float(os.getenv('LOT_BID_RESET_SECONDS', '10'))
+LOT_GOING_ONCE_AT = float(os.getenv('LOT_GOING_ONCE_SECONDS', '6'))
+LOT_GOING_TWICE_AT = float(os.getenv('LOT_GOING_TWICE_SECONDS', '3'))
+LOT_ANTI_SNIPE_WINDOW = float(os.getenv('LOT_ANTI_SNIPE_WINDOW_SECONDS', '2'))
+LOT_ANTI_SNIPE_EXTENSION = float(os.getenv('LOT_ANTI_SNIPE_EXTENSION_SECONDS', '5'))
+LOT_CLOSE_RETRY_SECONDS = float(os.getenv('LOT_CLOSE_RETRY_SECONDS', '2'))
+
+
+def lot_phase_for(remaining: float) -> str:
+    if remaining <= LOT_GOING_TWICE_AT:
+        return 'GOING_TWICE'
+    if remaining <= LOT_GOING_ONCE_AT:
+        return 'GOING_ONCE'
+    return 'OPEN'
+
+
+def lot_clock_after_bid(state: Dict) -> Dict:
+    """State updates that reset the lot clock for an accepted bid (caller holds auction_state_lock)"""
+    if not state.get('lotEndsAt'):
+        return {}
+    now = datetime.now()
+    ends_at = datetime.fromisoformat(state['lotEndsAt'])
+    new_end = max(ends_at, now + timedelta(seconds=LOT_BID_RESET_SECONDS))
+    if (ends_at - now).total_seconds() <= LOT_ANTI_SNIPE_WINDOW:
+        new_end += timedelta(seconds=LOT_ANTI_SNIPE_EXTENSION)
+        metric_incr('lot.antiSnipeExtensions')
+    return {'lotEndsAt': new_end.isoformat(), 'lotPhase': 'OPEN'}
+
+
+def arm_lot_clock(season_id: str) -> bool:
+    """(Re)arm the lot job for the next call or the close (caller holds the season's turn)"""
+    with auction_state_lock:
+        state = auction_state.get(season_id) or {}
+        running = state.get('status') == 'LIVE' and state.get('biddingActive')
+        ends_at = state.get('lotEndsAt') if running else None
+
+    if not ends_at:
+        auction_scheduler.cancel(('lot', season_id))
+        return False
+
+    remaining = seconds_until(ends_at)
+    # Wake at the next mark still ahead, or at the close
+    delay = min([remaining - mark for mark in (LOT_GOING_ONCE_AT, LOT_GOING_TWICE_AT) if remaining > mark]
+                + [remaining])
+    auction_scheduler.schedule(('lot', season_id), delay, lambda: lot_clock_due(season_id))
     return True
 
 
+def lot_countdown_payload(season_id: str, state: Dict) -> Dict:
+    ends_at = state.get('lotEndsAt')
+    if ends_at:
+        remaining_ms = max(0, int(seconds_until(ends_at) * 1000))
+    else:
+        remaining_ms = state.get('lotRemainingMs') or 0
+    return {
+        'seasonId': season_id,
+        'playerId': state.get('currentPlayerId'),
+        'phase': state.get('lotPhase'),
+        'status': state.get('status'),
+        'endsAtMs': epoch_ms(ends_at),
+        'remainingMs': remaining_ms,
+        'serverTimeMs': int(time.time() * 1000)
+    }
+
+
+def broadcast_lot_countdown(season_id: str):
+    """Tell the room where the lot clock stands (lot start, each call, pause/resume)"""
+    state = get_auction_state(season_id)
+    if not state or not state.get('currentPlayerId') or not state.get('lotPhase'):
+        return
+    socketio.emit('LOT_COUNTDOWN', lot_countdown_payload(season_id, state), room=f'season_{season_id}')
+
+
+def lot_clock_due(season_id: str):
+    """Lot job: announce the next call, or close the lot once its clock has really run out"""
+    with get_season_sequencer(season_id).turn():
+        state = get_auction_state(season_id)
+        if not state or state.get('status') != 'LIVE' or not state.get('biddingActive') \
+                or not state.get('lotEndsAt'):
+            return
+
+        remaining = seconds_until(state['lotEndsAt'])
+        if remaining <= 0:
+            # Same close as the auctioneer's; a lot nobody bid on goes unsold
+            try:
+                close_current_lot(season_id, sold=bool(state.get('leadingTeamId')))
+            except Exception as e:
+                # Bids are already refused past the deadline, so try again
+                # rather than leave the lot open with nothing to close it
+                print(f"Error auto-closing lot in {season_id}, retrying in {LOT_CLOSE_RETRY_SECONDS}s: {e}")
+                metric_incr('lot.autoCloseFailures')
+                auction_scheduler.schedule(('lot', season_id), LOT_CLOSE_RETRY_SECONDS,
+                                           lambda: lot_clock_due(season_id))
+                return
+            metric_incr('lot.autoClosed')
+            return
+
+        phase = lot_phase_for(remaining)
+        if phase != state.get('lotPhase'):
+            update_auction_state(season_id, {'lotPhase': phase}, f'LOT_{phase}')
+            broadcast_lot_countdown(season_id)
+        arm_lot_clock(season_id)
+
+
+# ========================
+# MATCH STATUS RECONCILER
+# ========================
+
+MATCH_RECONCILE_DELAY_SECONDS = float(os.getenv('MATCH_RECONCILE_DELAY_SECONDS', '2'))
+
+match_reconcile_lock = threading.Lock()
+match_reconcile_report: Dict[str, Any] = {}
+
+
+def request_match_reconcile(delay: Optional[float] = None):
+    """Queue a reconcile pass; triggers that arrive while one is pending share it"""
+    if auction_scheduler.remaining(('match-status', 'pass')) is None:
+        auction_scheduler.schedule(('match-status', 'pass'),
+                                   MATCH_RECONCILE_DELAY_SECONDS if delay is None else delay,
+                                   reconcile_match_statuses)
+
+
+def arm_match_date_boundary(matches: List[Dict]) -> Optional[str]:
+    """Schedule the next pass for the earliest matchDate still ahead"""
+    now = time.time()
+    upcoming = []
+    for match in matches:
+        if match.get('status') == 'COMPLETED':
+            continue
+        auction_date = match_auction_date(match)
+        if auction_date and auction_date.timestamp() > now:
+            upcoming.append(auction_date)
+    
+    if not upcoming:
+        auction_scheduler.cancel(('match-status', 'boundary'))
+        return None
+    boundary = min(upcoming, key=lambda d: d.timestamp())
+    # A hair past the boundary so compute_match_status sees the date as passed
+    auction_scheduler.schedule(('match-status', 'boundary'), boundary.timestamp() - now + 0.05,
+                               reconcile_match_statuses)
+    return boundary.isoformat()
+
+
+def recount_match_counters(match_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Recount matches' counters from their players and bids and store them.
+
+    Backfills matches created before the counters existed and repairs drift;
+    everyday writes keep the counters current with Increment instead.
+    """
+    match_ids = [match_id for match_id in dict.fromkeys(match_ids) if match_id]
+    children = fetch_grouped_by_match(['players', 'bids', 'teams'], match_ids)
+    counters = {
+        match_id: tally_match_counters(children['players'].get(match_id, []), children['bids'].get(match_id, []),
+                                       children['teams'].get(match_id, []))
+        for match_id in match_ids
+    }
+    for chunk in chunked(match_ids, FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for match_id in chunk:
+            batch.set(db.collection('matches').document(match_id), counters[match_id], merge=True)
+        batch.commit()
+    metric_incr('matchStatus.recounts', len(match_ids))
+    return counters
+
+
+def reconcile_match_statuses(recount: bool = False) -> Dict:
+    """Recompute every match's status in one pass and write the changes in batches.
+
+    Status comes from each match document's counters, so the pass reads
+    only the matches collection; matches without counters (or all of them
+    with recount=True) are recounted first. Only matches whose status moved
+    are written. Afterwards the next matchDate still ahead is armed on the
+    scheduler, so date-driven transitions land on time.
+    """
+    with match_reconcile_lock:
+        started = time.perf_counter()
+        matches = serialize_firestore_docs(db.collection('matches').stream())
+        
+        stale = [m['id'] for m in matches if recount or any(f not in m for f in MATCH_COUNTER_FIELDS)]
+        if stale:
+            counters = recount_match_counters(stale)
+            for match in matches:
+                match.update(counters.get(match['id'], {}))
+        
+        changes = []
+        for match in matches:
+            try:
+                status = compute_match_status(match)
+            except Exception as e:
+                print(f"⚠️ Could not compute status for match {match['id']}: {e}")
+                continue
+            if status != match.get('status'):
+                changes.append((match['id'], status))
+                match['status'] = status
+        
+        now = datetime.now().isoformat()
+        for chunk in chunked(changes, FIRESTORE_BATCH_LIMIT):
+            batch = db.batch()
+            for match_id, status in chunk:
+                batch.update(db.collection('matches').document(match_id), {
+                    'status': status,
+                    'updatedAt': now
+                })
+            batch.commit()
+        
+        for match_id, status in changes:
+            socketio.emit('MATCH_STATUS_UPDATED', {
+                'matchId': match_id,
+                'status': status,
+                'timestamp': now
+            }, room=f'match_{match_id}')
+        
+        elapsed = time.perf_counter() - started
+        metric_observe('matchStatus.reconcile', elapsed)
+        metric_incr('matchStatus.updates', len(changes))
+        match_reconcile_report.update({
+            'matches': len(matches),
+            'recounted': len(stale),
+            'updated': len(changes),
+            'batches': -(-len(changes) // FIRESTORE_BATCH_LIMIT),
+            'ms': round(elapsed * 1000, 1),
+            'nextBoundary': arm_match_date_boundary(matches),
+            'ranAt': now
+        })
+        if changes:
+            print(f"🔄 Match statuses reconciled: {len(changes)}/{len(matches)} updated")
+        return dict(match_reconcile_report)
+
+
+@app.route('/api/matches/reconcile', methods=['POST'])
+def reconcile_matches_now():
+    """Run a match-status reconcile pass now and report it ({"recount": true} rebuilds every counter)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        return success_response(reconcile_match_statuses(bool(data.get('recount'))), "Match statuses reconciled")
+    except Exception as e:
+        return error_response(f"Failed to reconcile match statuses: {str(e)}")
+
+
 # ========================
 # WEBSOCKET EVENT HANDLERS
 # ========================
@@ -2530,10 +5202,12 @@ def handle_join_season(data):
     room_name = f'season_{season_id}'
     print(f'✅ User {user_id} ({role}) joined room: {room_name}')
     
-    # Send current auction state
+    # Send a full snapshot; later changes arrive as versioned patches
     state = get_auction_state(season_id)
     if state:
         emit('AUCTION_STATE_UPDATE', state)
+        # Late joiners get the current deadline instead of waiting for a tick
+        emit('AUCTION_DEADLINE', deadline_payload(season_id, state))
     
     emit('joined_season', {
         'seasonId': season_id,
@@ -2541,6 +5215,58 @@ def handle_join_season(data):
     })
 
 
+@socketio.on('time_sync')
+def handle_time_sync(data):
+    """Clock sync probe: the ack carries server time so the client can work out its offset"""
+    return {
+        'clientSendMs': (data or {}).get('clientSendMs'),
+        'serverTimeMs': time.time() * 1000
+    }
+
+
+@socketio.on('request_state_snapshot')
+def handle_request_state_snapshot(data):
+    """Client saw a gap in patch versions - resend the full state to it only"""
+    season_id = data.get('seasonId')
+    
+    if not season_id:
+        emit('error', {'message': 'seasonId required'})
+        return
+    
+    state = get_auction_state(season_id)
+    if state:
+        print(f'🔁 Snapshot for season_{season_id}: client at v{data.get("version")}, server at v{state.get("version")}')
+        emit('AUCTION_STATE_UPDATE', state)
+
+
+@socketio.on('place_bid')
+def handle_place_bid(data):
+    """Team Rep bids over the existing socket; the return value is the ack"""
+    required_fields = ['seasonId', 'teamId', 'amount']
+    if not data or not all(field in data for field in required_fields):
+        return {'success': False, 'error': f"Missing required fields: {required_fields}", 'code': 400}
+    
+    def attempt():
+        try:
+            result = submit_bid(data['seasonId'], data['teamId'], data['amount'])
+            metric_incr('socketBids.accepted')
+            return {'success': True, 'data': result}, 200
+        except AuctionError as e:
+            metric_incr('socketBids.rejected')
+            return {'success': False, 'error': str(e), 'code': e.status_code}, e.status_code
+        except Exception as e:
+            print(f'Socket bid error: {e}')
+            return {'success': False, 'error': f"Failed to place bid: {str(e)}", 'code': 500}, 500
+    
+    # Same key space as the HTTP route, so a client may retry over either
+    if data.get('idempotencyKey'):
+        (ack, _), replayed = idempotency_store.run(f"bid:{data['idempotencyKey']}", attempt)
+        ack = {**ack, 'replayed': replayed}
+    else:
+        ack, _ = attempt()
+    return {**ack, 'serverTime': datetime.now().isoformat()}
+
+
 @socketio.on('leave_season')
 def handle_leave_season(data):
     """Leave a season room"""
@@ -2757,7 +5483,10 @@ def admin_extend_timer():
             'endTime': new_end.isoformat()
         }
         
-        update_auction_state(season_id, updates)
+        update_auction_state(season_id, updates, 'TIMER_EXTENDED')
+        if state.get('status') == 'LIVE':
+            start_auction_timer(season_id)
+        broadcast_deadline(season_id)
         
         socketio.emit('TIMER_EXTENDED', {
             'seasonId': season_id,
@@ -2811,11 +5540,17 @@ def admin_replace_auctioneer():
             'newAuctioneerId': new_auctioneer_id
         }, room=f'season_{season_id}')
         
+        refresh_season_auctioneer(season_id)
+        
         return success_response(None, "Auctioneer replaced")
     except Exception as e:
         return error_response(f"Failed to replace auctioneer: {str(e)}")
 
 
+# Rebuild seasons left behind by a previous process (needs every handler above)
+threading.Thread(target=recover_local_seasons, daemon=True).start()
+
+
 # ========================
 # MAIN
 # ========================
@@ -2826,6 +5561,12 @@ if __name__ == '__main__':
     print("✅ Real-time bidding enabled")
     print("✅ Server-controlled auction system active")
     print(f"🌐 Server running on http://localhost:5000")
+
+    # Turn SIGTERM into a normal exit so queued writes are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    # First pass also arms the next matchDate boundary
+    request_match_reconcile(0)
     
     socketio.run(
         app,
@@ -220,6 +220,42 @@ export async function getAllPlayers(filters?: { sport?: string; status?: string;
   return apiCall(`/players${query}`);
 }
 
+// Server-side search over a season's player pool (name prefix, filters, price range), paged
+export async function searchPlayers(seasonId: string, filters?: {
+  q?: string;
+  role?: string;
+  category?: string;
+  status?: string;
+  minPrice?: number;
+  maxPrice?: number;
+  page?: number;
+  pageSize?: number;
+}) {
+  const params = new URLSearchParams({ seasonId });
+  Object.entries(filters || {}).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') params.append(key, String(value));
+  });
+  return apiCall(`/players/search?${params.toString()}`);
+}
+
+// Remaining pool sorted by base price (top-k or a price range), optionally grouped by role
+export async function getPlayerPool(seasonId: string, options?: {
+  status?: string;
+  role?: string;
+  minPrice?: number;
+  maxPrice?: number;
+  order?: 'asc' | 'desc';
+  limit?: number;
+  offset?: number;
+  groupBy?: 'role';
+}) {
+  const params = new URLSearchParams({ seasonId });
+  Object.entries(options || {}).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') params.append(key, String(value));
+  });
+  return apiCall(`/players/pool?${params.toString()}`);
+}
+
 export async function getPlayerById(playerId: string) {
   return apiCall(`/players/${playerId}`);
 }
@@ -485,6 +521,8 @@ export default {
   
   // Players
   getAllPlayers,
+  searchPlayers,
+  getPlayerPool,
   getPlayerById,
   createPlayer,
   updatePlayer,
@@ -13,6 +13,7 @@ class SocketService {
   private currentSeasonId: string | null = null;
   private currentUserId: string | null = null;
   private currentRole: string | null = null;
+  private clockOffsetMs: number = 0; // server time minus local time
 
   /**
    * Initialize WebSocket connection to server
@@ -38,6 +39,7 @@ class SocketService {
       console.log('✅ Connected to server:', this.socket?.id);
       this.connected = true;
       this.reconnectAttempts = 0;
+      this.syncClock();
 
       // Rejoin season if was previously connected
       if (this.currentSeasonId && this.currentUserId && this.currentRole) {
@@ -62,9 +64,37 @@ class SocketService {
       console.log('Server response:', data.message);
     });
 
+    this.installLotTransition();
+
     return this.socket;
   }
 
+  /**
+   * A sell-and-next changeover arrives as one LOT_TRANSITION message; replay it
+   * to the per-event listeners so every dashboard handles it as before
+   */
+  private dispatchLotTransition = (data: any) => {
+    const socket = this.socket;
+    if (!socket) return;
+    const dispatch = (event: string, payload: any) => {
+      socket.listeners(event).forEach((listener) => listener(payload));
+    };
+    const nextPlayerId = data.next?.player?.id ?? null;
+    dispatch(data.closed.sold ? 'PLAYER_SOLD' : 'PLAYER_UNSOLD', { ...data.closed, nextPlayerId });
+    if (data.teamUpdate) dispatch('TEAM_UPDATED', data.teamUpdate);
+    if (data.next) dispatch('PLAYER_BIDDING_STARTED', data.next);
+    if (data.lot) dispatch('LOT_COUNTDOWN', data.lot);
+  };
+
+  /**
+   * (Re)register the LOT_TRANSITION dispatcher exactly once
+   */
+  private installLotTransition() {
+    if (!this.socket) return;
+    this.socket.off('LOT_TRANSITION', this.dispatchLotTransition);
+    this.socket.on('LOT_TRANSITION', this.dispatchLotTransition);
+  }
+
   /**
    * Disconnect from server
    */
@@ -94,6 +124,8 @@ class SocketService {
 
     console.log(`📡 Joining season ${seasonId} as ${role}`);
 
+    this.installLotTransition();
+
     this.socket.emit('join_season', {
       seasonId,
       userId,
@@ -115,10 +147,56 @@ class SocketService {
 
   /**
    * Listen to auction state updates
+   * Full snapshots arrive on join; after that the server sends versioned
+   * patches. The callback always receives the full merged state, and a
+   * version gap triggers a snapshot request instead of a bad merge.
+   * Returns a function that removes this listener's handlers.
+   */
+  onAuctionStateUpdate(callback: (state: any) => void): () => void {
+    const socket = this.socket;
+    if (!socket) return () => {};
+
+    let state: any = null;
+
+    const onSnapshot = (snapshot: any) => {
+      state = snapshot;
+      callback(snapshot);
+    };
+
+    const onPatch = (patch: any) => {
+      const version = state?.version ?? 0;
+      if (state && patch.version <= version) return; // already applied
+
+      if (!state || state.seasonId !== patch.seasonId || patch.version !== version + 1) {
+        this.requestStateSnapshot(patch.seasonId, version);
+        return;
+      }
+
+      const next = { ...state, ...patch.changes, version: patch.version };
+      for (const [field, items] of Object.entries(patch.appended || {})) {
+        const list = [...(state[field] || []), ...(items as any[])];
+        // Ring fields (e.g. bidHistory) are capped server-side at `<field>Limit`
+        const limit = next[`${field}Limit`];
+        next[field] = limit ? list.slice(-limit) : list;
+      }
+      state = next;
+      callback(next);
+    };
+
+    socket.on('AUCTION_STATE_UPDATE', onSnapshot);
+    socket.on('AUCTION_STATE_PATCH', onPatch);
+    return () => {
+      socket.off('AUCTION_STATE_UPDATE', onSnapshot);
+      socket.off('AUCTION_STATE_PATCH', onPatch);
+    };
+  }
+
+  /**
+   * Ask the server for a full state snapshot (after a patch version gap)
    */
-  onAuctionStateUpdate(callback: (state: any) => void) {
+  requestStateSnapshot(seasonId: string, version: number) {
     if (!this.socket) return;
-    this.socket.on('AUCTION_STATE_UPDATE', callback);
+    this.socket.emit('request_state_snapshot', { seasonId, version });
   }
 
   /**
@@ -153,12 +231,103 @@ class SocketService {
     this.socket.on('AUCTION_ENDED', callback);
   }
 
+  /**
+   * Estimate the offset between this clock and the server's (NTP-style):
+   * a few time_sync probes, keeping the one with the shortest round trip.
+   */
+  async syncClock(samples: number = 5): Promise<number> {
+    const socket = this.socket;
+    if (!socket) return this.clockOffsetMs;
+
+    let best: { rtt: number; offset: number } | null = null;
+    for (let i = 0; i < samples; i++) {
+      const sentAt = Date.now();
+      try {
+        const ack = await socket.timeout(2000).emitWithAck('time_sync', { clientSendMs: sentAt });
+        const receivedAt = Date.now();
+        const rtt = receivedAt - sentAt;
+        if (!best || rtt < best.rtt) {
+          best = { rtt, offset: ack.serverTimeMs - (sentAt + receivedAt) / 2 };
+        }
+      } catch {
+        // Probe timed out; the others still count
+      }
+    }
+
+    if (best) this.clockOffsetMs = best.offset;
+    return this.clockOffsetMs;
+  }
+
+  /**
+   * Current server time in epoch ms, from the synced offset
+   */
+  serverNow(): number {
+    return Date.now() + this.clockOffsetMs;
+  }
+
+  /**
+   * Listen to deadline changes (start, extension, pause, resume, end)
+   */
+  onAuctionDeadline(callback: (data: { seasonId: string; status: string; endsAtMs: number | null; remainingMs: number; serverTimeMs: number }) => void) {
+    if (!this.socket) return;
+    this.socket.on('AUCTION_DEADLINE', callback);
+  }
+
   /**
    * Listen to timer updates (server-controlled)
+   * The server only sends the deadline when it changes; the per-second
+   * countdown is computed here against the synced server clock.
+   * Returns a function that stops the countdown.
+   */
+  onTimerUpdate(callback: (data: { remainingSeconds: number; serverTime: string }) => void): () => void {
+    const socket = this.socket;
+    if (!socket) return () => {};
+
+    let deadline: any = null;
+    let lastSeconds: number | null = null;
+    let ticker: ReturnType<typeof setInterval> | null = null;
+
+    const stopTicker = () => {
+      if (ticker) clearInterval(ticker);
+      ticker = null;
+    };
+
+    const tick = () => {
+      if (!deadline) return;
+      const running = deadline.status === 'LIVE' || deadline.status === 'READY';
+      const remainingMs = running && deadline.endsAtMs
+        ? Math.max(0, deadline.endsAtMs - this.serverNow())
+        : deadline.remainingMs;
+      const remainingSeconds = Math.floor(remainingMs / 1000);
+      if (remainingSeconds !== lastSeconds) {
+        lastSeconds = remainingSeconds;
+        callback({ remainingSeconds, serverTime: new Date(this.serverNow()).toISOString() });
+      }
+      if (!running || remainingMs <= 0) stopTicker();
+    };
+
+    const onDeadline = (data: any) => {
+      deadline = data;
+      lastSeconds = null;
+      stopTicker();
+      ticker = setInterval(tick, 250);
+      tick();
+    };
+
+    socket.on('AUCTION_DEADLINE', onDeadline);
+    return () => {
+      socket.off('AUCTION_DEADLINE', onDeadline);
+      stopTicker();
+    };
+  }
+
+  /**
+   * Listen to the current lot's countdown (lot start, going once, going twice, pause/resume).
+   * Each NEW_BID also carries the reset deadline as lotEndsAtMs.
    */
-  onTimerUpdate(callback: (data: { remainingSeconds: number; serverTime: string }) => void) {
+  onLotCountdown(callback: (data: { seasonId: string; playerId: string; phase: 'OPEN' | 'GOING_ONCE' | 'GOING_TWICE'; status: string; endsAtMs: number | null; remainingMs: number; serverTimeMs: number }) => void) {
     if (!this.socket) return;
-    this.socket.on('AUCTION_TIMER_UPDATE', callback);
+    this.socket.on('LOT_COUNTDOWN', callback);
   }
 
   /**
@@ -355,13 +524,20 @@ class SocketService {
 
   /**
    * Place a bid (Team Rep action)
-   */
-  async placeBid(seasonId: string, teamId: string, amount: number): Promise<{ success: boolean; message?: string }> {
+   * Pass the same idempotencyKey on retries so a bid is never applied twice.
+   */
+  async placeBid(
+    seasonId: string,
+    teamId: string,
+    amount: number,
+    idempotencyKey?: string
+  ): Promise<{ success: boolean; message?: string }> {
     try {
       const response = await fetch('http://localhost:5000/api/auction/bid', {
         method: 'POST',
         headers: {
-          'Content-Type': 'application/json'
+          'Content-Type': 'application/json',
+          ...(idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {})
         },
         body: JSON.stringify({
           seasonId,
@@ -379,11 +555,76 @@ class SocketService {
   }
 
   /**
-   * Remove all listeners (cleanup on unmount)
+   * Close the current lot and open the next queued player in one call (Auctioneer).
+   * Clients receive a single LOT_TRANSITION; nextPlayerId overrides the queue.
+   */
+  async closeAndStartNext(
+    seasonId: string,
+    sold: boolean,
+    nextPlayerId?: string,
+    idempotencyKey?: string
+  ): Promise<{ success: boolean; data?: any; message?: string }> {
+    try {
+      const response = await fetch('http://localhost:5000/api/auction/player/close-and-next', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          ...(idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {})
+        },
+        body: JSON.stringify({ seasonId, sold, ...(nextPlayerId ? { nextPlayerId } : {}) })
+      });
+
+      const result = await response.json();
+      return { success: response.ok, data: result.data, message: result.message || result.error };
+    } catch (error) {
+      console.error('Failed to close and start next lot:', error);
+      return { success: false, message: 'Network error' };
+    }
+  }
+
+  /**
+   * Place a bid over the open socket (same validation as the HTTP route).
+   * Resolves with the server's ack plus the measured round trip. Reuse the
+   * same idempotencyKey when retrying so the bid is applied at most once.
+   */
+  placeBidOverSocket(
+    seasonId: string,
+    teamId: string,
+    amount: number,
+    timeoutMs: number = 5000,
+    idempotencyKey?: string
+  ): Promise<{ success: boolean; seq?: number; message?: string; rttMs: number }> {
+    const socket = this.socket;
+    if (!socket || !this.connected) {
+      return Promise.resolve({ success: false, message: 'Socket not connected', rttMs: 0 });
+    }
+
+    const sentAt = performance.now();
+    return new Promise((resolve) => {
+      socket.timeout(timeoutMs).emit('place_bid', { seasonId, teamId, amount, idempotencyKey }, (err: Error | null, ack: any) => {
+        const rttMs = performance.now() - sentAt;
+        if (err) {
+          resolve({ success: false, message: 'Bid acknowledgement timed out', rttMs });
+          return;
+        }
+        resolve({
+          success: ack.success,
+          seq: ack.data?.seq,
+          message: ack.success ? undefined : ack.error,
+          rttMs
+        });
+      });
+    });
+  }
+
+  /**
+   * Remove all listeners (cleanup on unmount); the LOT_TRANSITION
+   * dispatcher is service-owned and is put back
    */
   removeAllListeners() {
     if (!this.socket) return;
     this.socket.removeAllListeners();
+    this.installLotTransition();
   }
 
   /**
@@ -207,6 +207,25 @@ export async function loadAllSportsFromDB(): Promise<any[]> {
   return [];
 }
 
+// Match cards only: each match carries its counters (playerCount, teamCount, ...)
+// and empty players/teams/history until loadMatchDetails fills them in
+export async function loadSportsSummary(): Promise<any[]> {
+  const apiResponse = await fetchFromApi('/api/sports?shape=summary');
+  if (apiResponse && apiResponse.data && Array.isArray(apiResponse.data)) {
+    return apiResponse.data.map((sport: any) => ({
+      ...sport,
+      matches: sport.matches.map((match: any) => ({ ...match, players: [], teams: [], history: [] }))
+    }));
+  }
+  return [];
+}
+
+// One match's players, teams and bid history (loaded when the match is opened)
+export async function loadMatchDetails(matchId: string): Promise<any | null> {
+  const apiResponse = await fetchFromApi(`/api/matches/${encodeURIComponent(matchId)}/details`);
+  return apiResponse?.data ?? null;
+}
+
 // All Sports Data Management (for compatibility)
 export async function loadSportsData(): Promise<any[] | null> {
   // Try API first (reads/assembles all sports from disk)
@@ -220,6 +220,12 @@ export interface MatchData {
   teams: Team[];
   history: Bid[];
   status: 'SETUP' | 'ONGOING' | 'COMPLETED';
+  // Server-maintained counters (read-only; status is derived from them)
+  playerCount?: number;
+  soldCount?: number;
+  unsoldCount?: number;
+  bidCount?: number;
+  teamCount?: number;
   // Organizer credentials (for authentication)
   organizerEmail?: string;
   organizerPassword?: string;